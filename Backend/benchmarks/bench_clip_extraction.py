@@ -0,0 +1,117 @@
+"""
+Compares live-session clip extraction latency between the 'upload' and
+'sampled_frames' modes (see 'video_scene_extraction' in configs/models.yaml).
+
+Each clip is run through both strategies the given number of times, one call
+at a time, against the configured vision backend. Frame sampling time is also
+measured on its own, so local decode cost can be told apart from model latency.
+
+Run from the Backend directory, after installing the benchmark requirements:
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.bench_clip_extraction --clip path/to/clip.mp4 --runs 5
+"""
+import argparse
+import asyncio
+import json
+import mimetypes
+import statistics
+import time
+from pathlib import Path
+
+from src.application.use_cases.strategies import SampledFramesSceneExtractor, VideoSceneExtractor
+from src.domain.entities import VideoFile
+from src.infrastructure.config import get_settings, load_env_settings
+from src.infrastructure.services.gemini_vision_service import GeminiVisionService
+from src.infrastructure.services.model_scheduler import ModelScheduler
+from src.infrastructure.services.pillow_media_processing_service import PillowMediaProcessingService
+from src.infrastructure.services.prompt_loader_service import PromptLoaderService
+from src.presentation.api.dependencies import get_models_config
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+async def time_call(coro_factory) -> float:
+    start_time = time.perf_counter()
+    await coro_factory()
+    return time.perf_counter() - start_time
+
+
+async def run(args):
+    load_env_settings()
+    settings = get_settings()
+    models_config = get_models_config()
+    model = args.model or models_config["video_scene_extractor"]["models"][0]
+
+    vision_service = GeminiVisionService(
+        timeout=settings.model_timeout_seconds,
+        models_config=models_config,
+        scheduler=ModelScheduler(models_config.get("model_limits", {})),
+        video_poll_initial_seconds=settings.video_poll_initial_seconds,
+        video_poll_max_seconds=settings.video_poll_max_seconds,
+        video_processing_deadline_seconds=settings.video_processing_deadline_seconds
+    )
+    media_service = PillowMediaProcessingService(
+        preprocessing_config=models_config.get("image_preprocessing", {}),
+        frame_sampling_config=models_config.get("video_scene_extraction", {})
+    )
+    prompt_service = PromptLoaderService()
+    prompt = prompt_service.get('scene_extraction.event_description')
+
+    upload_extractor = VideoSceneExtractor(vision_service=vision_service)
+    sampled_extractor = SampledFramesSceneExtractor(
+        vision_service=vision_service,
+        media_service=media_service,
+        frames_preamble=prompt_service.get('scene_extraction.sampled_frames_preamble')
+    )
+
+    report = {"model": model, "clips": []}
+    for clip_path in args.clip:
+        path = Path(clip_path)
+        video = VideoFile(
+            filename=path.name,
+            content_type=mimetypes.guess_type(path.name)[0] or "video/mp4",
+            content=path.read_bytes()
+        )
+        timings = {"upload": [], "sampled_frames": [], "sampling_only": []}
+        for _ in range(args.runs):
+            timings["sampling_only"].append(
+                await time_call(lambda: media_service.sample_video_frames(video))
+            )
+            timings["sampled_frames"].append(
+                await time_call(lambda: sampled_extractor.extract_scene(media=video, prompt=prompt, model=model))
+            )
+            timings["upload"].append(
+                await time_call(lambda: upload_extractor.extract_scene(media=video, prompt=prompt, model=model))
+            )
+        report["clips"].append({
+            "clip": path.name,
+            "size_bytes": len(video.content),
+            "seconds": {mode: summarize(samples) for mode, samples in timings.items()},
+        })
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clip extraction modes.")
+    parser.add_argument("--clip", action="append", required=True, help="Path to a video clip. Repeatable.")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per clip and mode.")
+    parser.add_argument("--model", help="Model to use. Defaults to the configured video_scene_extractor.")
+    parser.add_argument("--output", help="Optional path to write the JSON report to.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
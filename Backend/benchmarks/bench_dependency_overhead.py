@@ -0,0 +1,117 @@
+"""
+Measures the per-request cost of resolving the VQA use case through FastAPI's
+dependency injection, before and after the app-scoped ServiceContainer.
+
+'before' rebuilds the whole service graph for every request, the way deps.py
+used to; 'after' uses the current providers, which look the use case up on the
+container. Both routes return immediately, so the difference is pure overhead.
+No model calls are made and no API key is needed.
+
+Run from the Backend directory, after installing the benchmark requirements
+(the app's plus httpx):
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.bench_dependency_overhead --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from src.application.use_cases.vqa_use_case import VQAUseCase
+from src.infrastructure.config import Settings, get_settings
+from src.infrastructure.services.gemini_vision_service import GeminiVisionService
+from src.infrastructure.services.local_storage_service import LocalStorageService
+from src.infrastructure.services.model_scheduler import ModelScheduler
+from src.infrastructure.services.mongo_dataset_service import MongoDatasetService
+from src.infrastructure.services.pillow_media_processing_service import PillowMediaProcessingService
+from src.infrastructure.services.prompt_loader_service import PromptLoaderService
+from src.presentation.api.container import ServiceContainer
+from src.presentation.api.dependencies import get_models_config
+from src.presentation.api.deps import get_vqa_use_case
+
+_shared_scheduler = None
+
+
+def get_legacy_vqa_use_case(
+    settings: Settings = Depends(get_settings),
+    models_config: dict = Depends(get_models_config),
+) -> VQAUseCase:
+    """The per-request construction that deps.py performed before the container."""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = ModelScheduler(models_config.get("model_limits", {}))
+    return VQAUseCase(
+        vision_service=GeminiVisionService(
+            timeout=settings.model_timeout_seconds,
+            models_config=models_config,
+            scheduler=_shared_scheduler
+        ),
+        storage_service=LocalStorageService(settings.storage_dir),
+        dataset_service=MongoDatasetService(),
+        prompt_service=PromptLoaderService(),
+        media_service=PillowMediaProcessingService(models_config.get("image_preprocessing", {}))
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.state.container = ServiceContainer(settings=get_settings(), models_config=get_models_config())
+
+    @app.get("/before")
+    async def before(use_case: VQAUseCase = Depends(get_legacy_vqa_use_case)):
+        return {}
+
+    @app.get("/after")
+    async def after(use_case: VQAUseCase = Depends(get_vqa_use_case)):
+        return {}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> dict:
+    # Warm up so one-off imports and caches don't skew the first samples.
+    for _ in range(50):
+        await client.get(path)
+
+    samples = []
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        request_start = time.perf_counter()
+        await client.get(path)
+        samples.append((time.perf_counter() - request_start) * 1_000_000)
+    total = time.perf_counter() - start_time
+
+    samples.sort()
+    return {
+        "requests": requests,
+        "requests_per_second": round(requests / total, 1),
+        "mean_us": round(statistics.fmean(samples), 1),
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 1),
+    }
+
+
+async def run(args):
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        report = {
+            "before": await measure(client, "/before", args.requests),
+            "after": await measure(client, "/after", args.requests),
+        }
+    report["mean_overhead_saved_us"] = round(report["before"]["mean_us"] - report["after"]["mean_us"], 1)
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dependency-resolution overhead per request.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per variant.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""
+End-to-end load test for the API routes, at increasing concurrency.
+
+For every route and concurrency level, that many clients send requests back to
+back for --duration seconds. The report has, per route and level:
+- throughput
+- p50/p95/p99 latency
+- status code counts
+- event-loop lag
+- the process memory high-water mark
+
+After the last route, the server's /stats (model scheduler, analysis cache,
+storage writes and fake backend calls) is added to the report.
+
+It is written as JSON (with the git commit) so runs can be compared between commits.
+
+By default the app runs in-process: it is served by uvicorn on a local port in
+this event loop, with the offline fake vision backend (configs/fake_vision.yaml)
+and without MongoDB (dataset logging is a no-op). Loop lag and memory are then
+those of the server, plus this lightweight client. With --url, an already
+running server is tested instead. Loop lag then shows only the client's loop,
+and memory is not reported.
+
+Payloads are synthetic but sized like real uploads: noisy JPEG photos at the
+given resolution and a short H.264 clip (or --video). The photos are distinct
+so frame dedup does not skip them, but they are reused across requests, so the
+in-process app runs with the analysis cache disabled; otherwise after one pass
+over the photos every request would be a cache hit and the report would time
+the cache instead of the scheduler and model path. Pass --analysis-cache to
+measure with the cache on. Against --url, start the server with
+ANALYSIS_CACHE_ENABLED=false for the same reason; server_stats in the report
+shows the cache hits.
+
+Run from the Backend directory, after installing the benchmark requirements
+(the app's plus httpx):
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.load_test --concurrency 1,4,16 --duration 10
+    python -m benchmarks.load_test --url http://localhost:8000 --routes vqa,ocr
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import structlog
+
+# session_start runs last: past the session cap it evicts the oldest sessions.
+ROUTES = ["vqa", "ocr", "process_frame", "process_clip", "query", "session_start"]
+# Routes that send to the prepared sessions
+SESSION_ROUTES = {"process_frame", "process_clip", "query"}
+API_PREFIX = "/api/v1"
+
+
+# --- Payloads ---
+
+def make_jpeg(width: int, height: int, seed: int, quality: int = 88) -> bytes:
+    """A photo-like JPEG: a smooth gradient with noise, so it compresses like a camera image."""
+    from PIL import Image, ImageFilter
+
+    rng = random.Random(seed)
+    small = Image.frombytes("RGB", (64, 36), bytes(rng.randrange(256) for _ in range(64 * 36 * 3)))
+    image = small.resize((width, height), Image.BICUBIC)
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    image = Image.blend(image, noise, 0.25).filter(ImageFilter.SMOOTH)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_clip(seconds: float, fps: int = 15, width: int = 640, height: int = 360) -> bytes:
+    """A short H.264 MP4 with moving content, like a clip from the live session camera."""
+    import av
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    with av.open(buffer, mode="w", format="mp4") as container:
+        stream = container.add_stream("h264", rate=fps)
+        stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+        base = Image.effect_noise((width * 2, height), 48).convert("RGB")
+        for index in range(int(seconds * fps)):
+            offset = int(index * width / (seconds * fps))
+            frame = av.VideoFrame.from_image(base.crop((offset, 0, offset + width, height)))
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+# --- In-process server ---
+
+def build_app(backend: str, analysis_cache: bool = False):
+    from fastapi import FastAPI
+
+    from src.application.services.dataset_service import DatasetService
+    from src.infrastructure.config import get_settings
+    from src.presentation.api import api_router
+    from src.presentation.api.container import ServiceContainer
+    from src.presentation.api.dependencies import get_models_config
+    from src.presentation.logging_middleware import LoggingMiddleware
+
+    class NoOpDatasetService(DatasetService):
+        async def log_request_for_dataset(self, *args, **kwargs):
+            pass
+
+        async def claim_pending_object_extractions(self, limit, lease_seconds):
+            return []
+
+        async def complete_object_extraction(self, log_id, object_list):
+            pass
+
+        async def fail_object_extraction(self, log_id, max_attempts):
+            pass
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        settings = get_settings().model_copy(update={
+            "vision_backend": backend,
+            "analysis_cache_enabled": analysis_cache,
+        })
+        app.state.container = ServiceContainer(settings=settings, models_config=get_models_config())
+        app.state.container.vqa_use_case.dataset_service = NoOpDatasetService()
+        app.state.container.start()
+        yield
+        await app.state.container.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(LoggingMiddleware)
+    app.include_router(api_router, prefix=API_PREFIX)
+    return app
+
+
+@asynccontextmanager
+async def in_process_server(backend: str, analysis_cache: bool = False):
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(build_app(backend, analysis_cache), host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+            raise RuntimeError("The in-process server stopped during startup; see the log above.")
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+# --- Measurement ---
+
+class LoopLagMonitor:
+    """Samples how late a periodic timer fires, as a proxy for event-loop blocking."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval) * 1000)
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return summarize(self.samples, prefix="lag_") | {"lag_max_ms": round(max(self.samples, default=0.0), 2)}
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+
+def summarize(samples: list[float], prefix: str = "") -> dict:
+    ordered = sorted(samples)
+    return {
+        f"{prefix}mean_ms": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+        f"{prefix}p50_ms": round(percentile(ordered, 0.50), 2),
+        f"{prefix}p95_ms": round(percentile(ordered, 0.95), 2),
+        f"{prefix}p99_ms": round(percentile(ordered, 0.99), 2),
+    }
+
+
+def memory_high_water_mb() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+# --- Scenarios ---
+
+class Scenario:
+    """Builds the requests for each route, rotating through the prepared payloads."""
+
+    def __init__(self, args, images: list[bytes], clip: bytes):
+        self.args = args
+        self.images = images
+        self.clip = clip
+        self.sessions: list[str] = []
+        self._counter = 0
+
+    def _next_image(self) -> bytes:
+        self._counter += 1
+        return self.images[self._counter % len(self.images)]
+
+    def _next_session(self) -> str:
+        return self.sessions[self._counter % len(self.sessions)]
+
+    async def prepare_sessions(self, client: httpx.AsyncClient, count: int):
+        """
+        Starts fresh sessions for a session route, ending the previous ones, so
+        sessions evicted by an earlier route (e.g. session_start filling the
+        session cap) do not turn the measurement into a stream of 404s.
+        """
+        for session_id in self.sessions:
+            await client.post(f"{API_PREFIX}/session/{session_id}/end")
+        self.sessions = []
+        for _ in range(count):
+            response = await client.post(f"{API_PREFIX}/session/start")
+            response.raise_for_status()
+            self.sessions.append(response.json()["session_id"])
+
+    async def send(self, client: httpx.AsyncClient, route: str) -> httpx.Response:
+        model = self.args.model
+        if route == "vqa":
+            return await client.post(
+                f"{API_PREFIX}/vqa/",
+                headers={"X-User-ID": "load-test"},
+                files={"image": ("photo.jpg", self._next_image(), "image/jpeg")},
+                data={"question": "What is in front of me?", "model_option": model, "mode": "brief"},
+            )
+        if route == "ocr":
+            return await client.post(
+                f"{API_PREFIX}/ocr/",
+                files={"image": ("document.jpg", self._next_image(), "image/jpeg")},
+                data={"model_option": model},
+            )
+        if route == "session_start":
+            return await client.post(f"{API_PREFIX}/session/start")
+        if route == "process_frame":
+            return await client.post(
+                f"{API_PREFIX}/session/process-frame",
+                files={"image_frame": ("frame.jpg", self._next_image(), "image/jpeg")},
+                data={"session_id": self._next_session()},
+            )
+        if route == "process_clip":
+            self._counter += 1
+            return await client.post(
+                f"{API_PREFIX}/session/process-clip",
+                files={"video_clip": ("clip.mp4", self.clip, "video/mp4")},
+                data={"session_id": self._next_session()},
+            )
+        if route == "query":
+            self._counter += 1
+            return await client.post(
+                f"{API_PREFIX}/session/query",
+                data={
+                    "session_id": self._next_session(),
+                    "question": "What happened so far?",
+                    "model_option": model,
+                    "mode": "brief",
+                },
+            )
+        raise ValueError(f"Unknown route '{route}'.")
+
+
+async def run_level(client: httpx.AsyncClient, scenario: Scenario, route: str, concurrency: int, duration: float,
+                    in_process: bool) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    monitor = LoopLagMonitor()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await scenario.send(client, route)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    monitor.start()
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+    lag = await monitor.stop()
+
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "ok": ok,
+        "statuses": dict(statuses),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "ok_throughput_rps": round(ok / elapsed, 2),
+        **summarize(latencies),
+        **lag,
+        "memory_high_water_mb": memory_high_water_mb() if in_process else None,
+    }
+
+
+async def run(args):
+    print("Preparing payloads...")
+    images = [make_jpeg(args.image_width, args.image_height, seed) for seed in range(args.distinct_images)]
+    clip = Path(args.video).read_bytes() if args.video else make_clip(args.clip_seconds)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    routes = args.routes.split(",")
+
+    report = {
+        "commit": git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "target": args.url or f"in-process ({args.backend} vision backend, analysis cache "
+                              f"{'on' if args.analysis_cache else 'off'})",
+        "duration_seconds": args.duration,
+        "payloads": {
+            "image_bytes_mean": int(statistics.fmean(len(image) for image in images)),
+            "image_resolution": f"{args.image_width}x{args.image_height}",
+            "clip_bytes": len(clip),
+        },
+        "routes": {},
+    }
+
+    async with (in_process_server(args.backend, args.analysis_cache) if not args.url else _external(args.url)) as base_url:
+        timeout = httpx.Timeout(args.timeout)
+        limits = httpx.Limits(max_connections=max(levels) + 8, max_keepalive_connections=max(levels) + 8)
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+            scenario = Scenario(args, images, clip)
+            for route in routes:
+                if route not in ROUTES:
+                    raise SystemExit(f"Unknown route '{route}'. Choose from: {', '.join(ROUTES)}")
+                if route in SESSION_ROUTES:
+                    await scenario.prepare_sessions(client, args.sessions)
+                report["routes"][route] = []
+                for level in levels:
+                    result = await run_level(client, scenario, route, level, args.duration, in_process=not args.url)
+                    report["routes"][route].append(result)
+                    print(
+                        f"{route:>14} c={level:<4} {result['throughput_rps']:>8} req/s  "
+                        f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms p99={result['p99_ms']}ms  "
+                        f"lag_p99={result['lag_p99_ms']}ms  statuses={result['statuses']}"
+                    )
+            report["server_stats"] = await fetch_server_stats(client)
+
+    report["memory_high_water_mb"] = memory_high_water_mb() if not args.url else None
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Report written to {args.output}")
+
+
+async def fetch_server_stats(client: httpx.AsyncClient) -> Optional[dict]:
+    try:
+        response = await client.get(f"{API_PREFIX}/stats/")
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        print(f"Could not fetch server stats: {e}")
+        return None
+
+
+@asynccontextmanager
+async def _external(url: str):
+    yield url.rstrip("/")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API routes at increasing concurrency.")
+    parser.add_argument("--url", help="Base URL of a running server. Default: serve the app in-process.")
+    parser.add_argument("--backend", default="fake", choices=["fake", "gemini"],
+                        help="Vision backend for the in-process app.")
+    parser.add_argument("--routes", default=",".join(ROUTES), help=f"Comma-separated subset of: {', '.join(ROUTES)}.")
+    parser.add_argument("--concurrency", default="1,4,16,32", help="Comma-separated concurrency levels.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per route and level.")
+    parser.add_argument("--timeout", type=float, default=180.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--model", default="gemini-2.5-flash", help="model_option sent to the user-selectable routes.")
+    parser.add_argument("--sessions", type=int, default=8, help="Live sessions shared by the session routes.")
+    parser.add_argument("--distinct-images", type=int, default=32, help="Distinct JPEGs to rotate through.")
+    parser.add_argument("--analysis-cache", action="store_true",
+                        help="Keep the in-process app's analysis cache on (off by default, so model calls are timed).")
+    parser.add_argument("--image-width", type=int, default=1920)
+    parser.add_argument("--image-height", type=int, default=1440)
+    parser.add_argument("--video", help="Clip to upload to process-clip. Default: a synthetic clip.")
+    parser.add_argument("--clip-seconds", type=float, default=5.0, help="Length of the synthetic clip.")
+    parser.add_argument("--output", default="load_test_report.json", help="Where to write the JSON report.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's info logs.")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Per-request info logs would dominate the measurement.
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.presentation.logging_middleware import LoggingMiddleware
 from logging_config import setup_logging
 from fastapi.middleware.cors import CORSMiddleware
-from src.infrastructure.config import load_env_settings
+from src.infrastructure.config import load_env_settings, get_settings
 from src.presentation.api import api_router
 from src.infrastructure.services.database_service import init_db
+from src.presentation.api.container import ServiceContainer
+from src.presentation.api.dependencies import get_models_config
 
 # The call to load_settings() is removed, as configuration is now
 # handled on-demand by the dependency injection system.
@@ -16,6 +19,7 @@ setup_logging()
 # Load environment settings
 load_env_settings()
 
+@asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Handles application startup and shutdown events.
@@ -23,8 +27,12 @@ async def lifespan(app: FastAPI):
     print("Initializing database...")
     await init_db()
     print("Database initialized.")
+
+    # Build the app-scoped services once; request dependencies read them from app.state.
+    app.state.container = ServiceContainer(settings=get_settings(), models_config=get_models_config())
+    app.state.container.start()
     yield
-    # Code to run on shutdown can go here, e.g., closing connections
+    await app.state.container.aclose()
     print("Application shutting down.")
 
 # Create FastAPI app
@@ -38,12 +46,6 @@ app = FastAPI(
 # Add the middleware to the app
 app.add_middleware(LoggingMiddleware)
 
-@app.on_event("startup")
-async def on_startup():
-    print("Initializing database...")
-    await init_db()
-    print("Database initialized.")
-
 # Add CORS middleware to allow all origins
 app.add_middleware(
     CORSMiddleware,
@@ -1,10 +1,10 @@
 # src/application/services/dataset_service.py
 from abc import ABC, abstractmethod
+from typing import Optional
+import uuid
 
 import structlog
 from src.domain.entities.documents import RequestLog
-from src.application.services.vision_service import VisionService
-from src.domain.entities import ImageFile
 from src.domain.entities.documents import AnalysisMode
 
 logger = structlog.get_logger(__name__)
@@ -19,14 +19,40 @@ class DatasetService(ABC):
             self,
             user_id: str,
             file_path: str,
-            image: ImageFile,
-            vision_service: VisionService,
             question: str,
             answer: str,
             model_name: str,
-            mode: AnalysisMode
+            mode: AnalysisMode,
+            object_list: Optional[list[str]] = None
     ):
         """
         This function runs in the background to log a VQA request for the dataset.
+        If object_list is given (e.g. from a combined VQA call) it is stored as-is;
+        otherwise the log is stored as pending and the object list is extracted
+        later by the object extraction worker.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def claim_pending_object_extractions(self, limit: int, lease_seconds: int) -> list[RequestLog]:
+        """
+        Atomically claims up to `limit` logs that still need an object list, so that
+        several workers can share the backlog. Logs claimed by a worker that did not
+        finish within `lease_seconds` become claimable again.
+        """
+        pass
+
+    @abstractmethod
+    async def complete_object_extraction(self, log_id: uuid.UUID, object_list: list[str]):
+        """
+        Stores the extracted object list and marks the log as done.
+        """
+        pass
+
+    @abstractmethod
+    async def fail_object_extraction(self, log_id: uuid.UUID, max_attempts: int):
+        """
+        Records a failed extraction attempt. The log goes back to pending until
+        it has failed `max_attempts` times, after which it is marked as failed.
+        """
+        pass
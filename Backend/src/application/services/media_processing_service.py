@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+
+from src.domain.entities import ImageFile, VideoFile
+
+
+class InvalidMediaError(Exception):
+    """
+    Raised when uploaded media cannot be decoded.
+    """
+
+
+class MediaProcessingService(ABC):
+    """
+    Abstract base class (interface) for preparing uploaded media before it is
+    sent to a vision model.
+    """
+    @abstractmethod
+    async def normalize_image(self, image: ImageFile, feature: str) -> ImageFile:
+        """
+        Normalizes an image for the given feature: applies its EXIF orientation,
+        downscales it to the feature's maximum edge and re-encodes it if needed.
+
+        Args:
+            image: The uploaded ImageFile.
+            feature: The feature the image is for (e.g. 'vqa', 'ocr', 'live_frame').
+
+        Returns:
+            An ImageFile ready for upload. This is the original image, untouched,
+            when it already fits the feature's limits.
+        """
+        pass
+
+    @abstractmethod
+    async def sample_video_frames(self, video: VideoFile) -> list[ImageFile]:
+        """
+        Decodes a video clip locally and returns a small set of keyframes,
+        in chronological order, ready to be sent inline to a model.
+
+        Args:
+            video: The uploaded VideoFile.
+
+        Returns:
+            The sampled frames. Raises an exception if the clip cannot be decoded.
+        """
+        pass
+
+    @abstractmethod
+    async def perceptual_hash(self, image: ImageFile) -> int:
+        """
+        Computes a 64-bit perceptual hash of an image. Visually similar images
+        have hashes with a small Hamming distance.
+
+        Args:
+            image: The ImageFile to hash. Raises InvalidMediaError if it cannot be decoded.
+
+        Returns:
+            The hash as an integer.
+        """
+        pass
@@ -0,0 +1,141 @@
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List, Optional, Set, TypeVar
+
+from pydantic import BaseModel
+
+from src.domain.entities import SessionState, TimelineEvent
+
+T = TypeVar("T")
+
+
+class SessionConflictError(RuntimeError):
+    """
+    Raised when an update keeps losing the compare-and-set race.
+    """
+
+
+class SessionInfo(BaseModel):
+    """
+    What the eviction policy needs to know about a stored session.
+    """
+    session_id: str
+    last_active_at: float # Epoch seconds of the last write or touch
+    size_bytes: int # Serialized state plus scene log
+
+
+class SessionStore(ABC):
+    """
+    Abstract base class (interface) for live-session state storage.
+    Implementations may be shared between processes, so state is only changed
+    through compare-and-set on its revision, and the scene log through an
+    atomic append.
+    """
+
+    @abstractmethod
+    async def create(self, state: SessionState):
+        """
+        Stores a new session.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        """
+        Returns the session's current state, or None if it does not exist.
+        The result must be treated as read-only; use update() to change it.
+        """
+        pass
+
+    @abstractmethod
+    async def compare_and_set(self, state: SessionState, expected_revision: int) -> bool:
+        """
+        Writes the state only if the stored revision still equals
+        `expected_revision`, and bumps the revision. Returns whether it was written.
+        """
+        pass
+
+    @abstractmethod
+    async def append_event(self, session_id: str, event: TimelineEvent) -> int:
+        """
+        Atomically appends a description to the session's scene log and returns
+        the new length of the log. Raises ValueError if the session does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def read_events(self, session_id: str, offset: int = 0) -> List[TimelineEvent]:
+        """
+        Returns the session's scene log from `offset` onwards, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """
+        Removes a session and its scene log. Returns whether it existed.
+        """
+        pass
+
+    @abstractmethod
+    async def touch(self, session_id: str):
+        """
+        Marks the session as active without changing it, e.g. when it is queried.
+        """
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        """
+        Returns the number of stored sessions.
+        """
+        pass
+
+    @abstractmethod
+    async def oldest_sessions(self, limit: int) -> List[SessionInfo]:
+        """
+        Returns up to `limit` sessions, least recently active first. Eviction
+        reads only as many sessions as it may remove, so this must not walk
+        every stored session.
+        """
+        pass
+
+    @abstractmethod
+    async def total_bytes(self) -> int:
+        """
+        Returns the size of all stored sessions, as summed by SessionInfo.size_bytes.
+        """
+        pass
+
+    @abstractmethod
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        """
+        Returns which of the given sessions are still stored.
+        """
+        pass
+
+    async def update(self, session_id: str, mutate: Callable[[SessionState], T], max_attempts: int = 50) -> T:
+        """
+        Applies `mutate` to the latest state and writes it back with
+        compare-and-set, retrying on conflicts. `mutate` may run more than once,
+        each time on a fresh state, so it must only depend on the state it gets.
+        Returns what `mutate` returned. Raises ValueError if the session does not exist.
+        """
+        for attempt in range(max_attempts):
+            state = await self.get(session_id)
+            if state is None:
+                raise ValueError(f"Session with ID '{session_id}' not found.")
+            expected_revision = state.revision
+            result = mutate(state)
+            if await self.compare_and_set(state, expected_revision):
+                return result
+            # Another writer won the race; back off (exponential, with jitter) before re-reading.
+            await asyncio.sleep(random.uniform(0, min(0.05, 0.001 * 2 ** attempt)))
+        raise SessionConflictError(f"Could not update session '{session_id}' after {max_attempts} attempts.")
+
+    async def close(self):
+        """
+        Releases resources held by the store.
+        """
+        pass
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class StorageService(ABC):
@@ -24,3 +25,44 @@ class StorageService(ABC):
             The path to the saved file.
         """
         pass
+
+    @abstractmethod
+    def read_file(self, path: str) -> bytes:
+        """
+        Reads back a file previously saved with save_file.
+
+        Args:
+            path: The path returned by save_file.
+
+        Returns:
+            The binary content of the file.
+        """
+        pass
+
+    async def save_file_async(
+        self,
+        file_bytes: bytes,
+        original_filename: str,
+        prefix: str
+    ) -> str:
+        """
+        Saves a file without blocking the event loop. The default runs save_file
+        on a worker thread; implementations may return the path before the
+        write completes, as long as read_file already returns the content.
+        """
+        return await asyncio.to_thread(self.save_file, file_bytes, original_filename, prefix)
+
+    def start(self):
+        """
+        Starts background work, if any. Called once the event loop is running.
+        """
+        pass
+
+    async def close(self):
+        """
+        Finishes pending writes and releases resources held by the service.
+        """
+        pass
+
+    def stats(self) -> dict:
+        return {}
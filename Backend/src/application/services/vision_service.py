@@ -8,9 +8,11 @@ class VisionService(ABC):
     """
     Abstract base class (interface) for a vision AI service.
     It defines the contract that any vision service must adhere to.
+    All analysis methods are coroutines so that a slow model call never
+    blocks the event loop serving other requests.
     """
     @abstractmethod
-    def analyze_image(
+    async def analyze_image(
         self,
         image: ImageFile,
         prompt: str,
@@ -30,7 +32,49 @@ class VisionService(ABC):
         pass
 
     @abstractmethod
-    def analyze_video(
+    async def analyze_images(
+        self,
+        images: list[ImageFile],
+        prompt: str,
+        model_option: str
+    ) -> AnalysisResult:
+        """
+        Analyzes several images together in a single request, e.g. frames sampled from a clip.
+
+        Args:
+            images: The ImageFile objects to analyze, in the order they should be presented.
+            prompt: The text prompt to guide the analysis.
+            model_option: The specific model identifier to use.
+
+        Returns:
+            An AnalysisResult object containing the raw text and processing time.
+        """
+        pass
+
+    @abstractmethod
+    async def analyze_image_structured(
+        self,
+        image: ImageFile,
+        prompt: str,
+        model_option: str,
+        response_schema: dict
+    ) -> AnalysisResult:
+        """
+        Analyzes an image and has the model reply with JSON that matches a schema.
+
+        Args:
+            image: The ImageFile object to analyze.
+            prompt: The text prompt to guide the analysis.
+            model_option: The specific model identifier to use.
+            response_schema: An OpenAPI-style schema the JSON reply must follow.
+
+        Returns:
+            An AnalysisResult object whose text is the JSON reply.
+        """
+        pass
+
+    @abstractmethod
+    async def analyze_video(
         self,
         video: VideoFile,
         prompt: str,
@@ -50,7 +94,7 @@ class VisionService(ABC):
         pass
 
     @abstractmethod
-    def analyze_text(
+    async def analyze_text(
         self,
         prompt: str,
         model_option: str
@@ -76,6 +120,7 @@ class VisionService(ABC):
             image: The ImageFile object to analyze.
 
         Returns:
-            A list of strings, where each string is an object description.
+            A list of strings, where each string is an object description. An
+            empty list means no objects were found; failures raise instead.
         """
         pass
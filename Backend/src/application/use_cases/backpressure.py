@@ -0,0 +1,103 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.domain.entities import InFlightCapture, SessionState, SessionStatus
+
+
+class BackpressurePolicy(BaseModel):
+    """
+    Bounds how much of a live session's media may be waiting for extraction,
+    and the capture-interval hints sent back to its client.
+    """
+    # The most captures of one session in flight. Above it, the oldest capture
+    # still waiting for a worker is dropped to make room for the new one.
+    max_in_flight: int = Field(6, ge=1)
+    # Recommended capture intervals are clamped to this range.
+    min_capture_interval_seconds: float = Field(0.5, gt=0)
+    max_capture_interval_seconds: float = Field(10.0, gt=0)
+    # Weight of the newest extraction in the moving average of extraction time.
+    extraction_time_smoothing: float = Field(0.3, gt=0, le=1)
+
+
+class SessionOverloadedError(RuntimeError):
+    """
+    Raised when a session is at its in-flight cap and every capture in
+    flight is already being extracted, so there is nothing to drop.
+    """
+
+    def __init__(self, message: str, retry_after_seconds: float):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+def admit_capture(session: SessionState, capture: InFlightCapture, policy: BackpressurePolicy) -> Optional[InFlightCapture]:
+    """
+    Adds the capture to the session's captures in flight. At the cap, the
+    oldest capture that no worker has started is dropped and returned.
+    Raises SessionOverloadedError if every capture in flight has started.
+    """
+    dropped = None
+    if len(session.in_flight) >= policy.max_in_flight:
+        waiting = [item for item in session.in_flight if item.started_at is None]
+        if not waiting:
+            raise SessionOverloadedError(
+                f"Session '{session.session_id}' already has {len(session.in_flight)} captures in extraction.",
+                retry_after_seconds=recommended_capture_interval(session, policy)
+            )
+        dropped = min(waiting, key=lambda item: item.submitted_at)
+        session.in_flight.remove(dropped)
+        session.dropped_frames += 1
+    session.in_flight.append(capture)
+    return dropped
+
+
+def _smooth(previous: Optional[float], value: float, weight: float) -> float:
+    return value if previous is None else weight * value + (1 - weight) * previous
+
+
+def record_extraction(session: SessionState, started_at: float, finished_at: float, policy: BackpressurePolicy):
+    """
+    Updates the moving averages of extraction time and of the time between
+    finished extractions, which the capture-interval hint is based on.
+    """
+    weight = policy.extraction_time_smoothing
+    session.extraction_seconds_avg = _smooth(session.extraction_seconds_avg, finished_at - started_at, weight)
+    if session.last_completed_at is not None:
+        interval = max(0.0, finished_at - session.last_completed_at)
+        session.completion_interval_avg = _smooth(session.completion_interval_avg, interval, weight)
+    session.last_completed_at = finished_at
+
+
+def recommended_capture_interval(session: SessionState, policy: BackpressurePolicy) -> float:
+    """
+    The interval at which the client can send captures without building a
+    backlog. With free workers, that is one extraction time spread over the
+    session's parallel slots. Once captures wait for a worker, the workers are
+    shared with other sessions, so it is no faster than extractions have been
+    finishing. Either is stretched by how many captures are waiting.
+    """
+    if session.extraction_seconds_avg is None:
+        return policy.min_capture_interval_seconds
+    waiting = sum(1 for item in session.in_flight if item.started_at is None)
+    interval = session.extraction_seconds_avg / policy.max_in_flight
+    if waiting and session.completion_interval_avg is not None:
+        interval = max(interval, session.completion_interval_avg)
+    interval *= 1 + waiting / policy.max_in_flight
+    return min(policy.max_capture_interval_seconds, max(policy.min_capture_interval_seconds, interval))
+
+
+def session_status(session: SessionState, now: float, policy: BackpressurePolicy) -> SessionStatus:
+    oldest = min((item.submitted_at for item in session.in_flight), default=now)
+    return SessionStatus(
+        session_id=session.session_id,
+        narrative_version=session.narrative_version,
+        in_flight=len(session.in_flight),
+        queued=sum(1 for item in session.in_flight if item.started_at is None),
+        pending_descriptions=len(session.pending_descriptions),
+        extraction_lag_seconds=round(max(0.0, now - oldest), 3),
+        extraction_seconds_avg=session.extraction_seconds_avg,
+        recommended_capture_interval_seconds=round(recommended_capture_interval(session, policy), 3),
+        deduplicated_frames=session.deduplicated_frames,
+        dropped_frames=session.dropped_frames
+    )
@@ -1,85 +1,52 @@
+import asyncio
+import time
 import uuid
 import structlog
-import threading
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from src.domain.entities import (
+    ImageFile,
+    InFlightCapture,
+    NarrativeSegment,
+    NarrativeSnapshot,
+    VideoFile,
     SessionState,
+    SessionStatus,
     SessionQueryRequest,
     SessionQueryResult,
+    TimelineEvent,
 )
 from src.application.services.vision_service import VisionService
 from src.application.services.storage_service import StorageService
-from .strategies import VideoSceneExtractor, FrameSceneExtractor
+from .strategies import VideoSceneExtractor, FrameSceneExtractor, SampledFramesSceneExtractor
+from .narrative_timeline import (
+    NarrativeBudget,
+    check_order_domain,
+    events_to_compact,
+    latest_summary,
+    merge_segments,
+    release_pending_events,
+    render_relevant_events,
+    render_timeline,
+    segment_from_events,
+    segments_to_merge,
+)
+from .session_scene_indexes import SessionSceneIndexes
+from .narrative_notifier import NarrativeNotifier
+from .session_answer_cache import SessionAnswerCache
+from .backpressure import BackpressurePolicy, admit_capture, record_extraction, session_status
 from src.domain.entities.live_session import SessionAnalysVideoRequest
 from src.application.services.prompt_service import PromptService
+from src.application.services.media_processing_service import MediaProcessingService
+from src.application.services.session_store import SessionStore
+from .session_worker_pool import SessionWorkerPool, WorkerPoolClosedError
 
 # Get a logger instance for this module
 logger = structlog.get_logger(__name__)
 
-# --- In-Memory Session Storage (Global) ---
-SESSION_STORAGE: Dict[str, SessionState] = {}
-SESSION_LOCKS: Dict[str, threading.Lock] = {}
-
-
-def get_session(session_id: str) -> SessionState:
-    """
-    Retrieves the state for a given session ID from global storage.
-    """
-    session = SESSION_STORAGE.get(session_id)
-    if not session:
-        logger.warning("Attempted to access a non-existent session.", session_id=session_id)
-        raise ValueError(f"Session with ID '{session_id}' not found.")
-    return session
-
-
-# --- BACKGROUND TASK WORKER (Moved outside the class) ---
-# This is the new, independent function for the background task.
-def run_aggregation_task_worker(session_id: str, video_scene_aggregator_model: str, vision_service: VisionService, prompt_service: PromptService):
-    """
-    The "consumer" part of the pipeline. It processes all pending descriptions
-    in the queue for a given session. It is now a standalone function.
-    """
-    logger.info("Aggregation task started.", session_id=session_id)
-    lock = SESSION_LOCKS.get(session_id)
-    if not lock:
-        return
-
-    # Process the queue until it's empty
-    while True:
-        with lock:
-            session = get_session(session_id)
-            if not session.pending_descriptions:
-                session.is_aggregator_running = False
-                logger.info("Aggregation task finished as queue is empty.", session_id=session_id)
-                break
-
-            next_desc = session.pending_descriptions.pop(0)
-
-        # --- Perform the AI call outside the lock ---
-        try:
-            aggregator_prompt = prompt_service.get(
-            'live_session.narrative_aggregator',
-            current_narrative=session.current_narrative,
-            next_desc=next_desc
-            )
-            new_narrative = vision_service.analyze_text(
-                prompt=aggregator_prompt,
-                model_option=video_scene_aggregator_model
-            ).text
-
-            # --- Re-acquire the lock to safely update the shared state ---
-            with lock:
-                session = get_session(session_id)
-                session.current_narrative = new_narrative.strip()
-                logger.info("Narrative updated.", session_id=session_id,
-                            new_narrative_length=len(session.current_narrative))
-        except Exception:
-            logger.exception("Error during narrative aggregation.", session_id=session_id)
-            with lock:
-                session = get_session(session_id)
-                session.pending_descriptions.insert(0, next_desc)
-            break
+# Clip extraction modes, selected per deployment in models.yaml
+CLIP_MODE_UPLOAD = "upload"
+CLIP_MODE_SAMPLED_FRAMES = "sampled_frames"
 
 
 class LiveSessionUseCase:
@@ -87,81 +54,456 @@ class LiveSessionUseCase:
     Orchestrates the stateful Live Session.
     """
 
-    def __init__(self, vision_service: VisionService, storage_service: StorageService, prompt_service: PromptService):
+    def __init__(
+            self,
+            vision_service: VisionService,
+            storage_service: StorageService,
+            prompt_service: PromptService,
+            media_service: MediaProcessingService,
+            session_store: SessionStore,
+            worker_pool: SessionWorkerPool,
+            clip_extraction_mode: str = CLIP_MODE_UPLOAD,
+            frame_dedup_max_distance: int = 6,
+            frame_dedup_history: int = 1,
+            narrative_budget: Optional[NarrativeBudget] = None,
+            reorder_max_wait_seconds: float = 5.0,
+            backpressure: Optional[BackpressurePolicy] = None,
+            narrative_notifier: Optional[NarrativeNotifier] = None,
+            version_poll_seconds: float = 0.5,
+            answer_cache: Optional[SessionAnswerCache] = None,
+            scene_indexes: Optional[SessionSceneIndexes] = None
+    ):
         self.vision_service = vision_service
         self.storage_service = storage_service
         self.prompt_service = prompt_service
+        self.media_service = media_service
+        self.session_store = session_store
+        self.worker_pool = worker_pool
+        self.clip_extraction_mode = clip_extraction_mode
+        self.frame_dedup_max_distance = frame_dedup_max_distance
+        self.frame_dedup_history = frame_dedup_history
+        self.narrative_budget = narrative_budget or NarrativeBudget()
+        self.reorder_max_wait_seconds = reorder_max_wait_seconds
+        self.backpressure = backpressure or BackpressurePolicy()
+        self.narrative_notifier = narrative_notifier or NarrativeNotifier()
+        self.version_poll_seconds = version_poll_seconds
+        self.answer_cache = answer_cache or SessionAnswerCache()
+        self.scene_indexes = scene_indexes or SessionSceneIndexes(session_store)
         logger.info("LiveSessionUseCase initialized")
 
-    def create_session(self) -> str:
+    async def create_session(self) -> str:
         session_id = str(uuid.uuid4())
-        SESSION_STORAGE[session_id] = SessionState(session_id=session_id)
-        SESSION_LOCKS[session_id] = threading.Lock()
+        await self.session_store.create(SessionState(session_id=session_id))
         logger.info("New session created.", session_id=session_id)
         return session_id
 
-    def run_extraction_task(self, request: SessionAnalysVideoRequest, background_tasks):
+    async def _frame_hash(self, request: SessionAnalysVideoRequest) -> Optional[int]:
+        if self.frame_dedup_max_distance < 0 or not isinstance(request.media, ImageFile):
+            return None
+        return await self.media_service.perceptual_hash(request.media)
+
+    def _nearest_recent_frame(self, session: SessionState, frame_hash: int) -> Optional[int]:
+        """
+        Returns the distance to a recent frame within the dedup threshold, if any.
+        """
+        for previous_hash in session.recent_frame_hashes:
+            distance = (frame_hash ^ previous_hash).bit_count()
+            if distance <= self.frame_dedup_max_distance:
+                return distance
+        return None
+
+    @staticmethod
+    def _forget_frame_hash(session: SessionState, frame_hash: Optional[int]):
+        # A frame that was never described must not suppress its own retry.
+        if frame_hash is not None and frame_hash in session.recent_frame_hashes:
+            session.recent_frame_hashes.remove(frame_hash)
+
+    async def submit_media(self, request: SessionAnalysVideoRequest) -> "Optional[asyncio.Future[Optional[TimelineEvent]]]":
+        """
+        Registers a frame or clip as in flight, so later descriptions wait for
+        it, and queues its scene extraction on the session worker pool. At the
+        session's in-flight cap, the oldest capture still waiting is dropped.
+        Returns a future that resolves to the description once extraction is
+        done, or to None if it failed or was dropped. Callers that only enqueue
+        may ignore it.
+        Returns None, without queuing anything, for a frame that nearly
+        duplicates one of the session's recent frames. A frame's hash is only
+        remembered once it is admitted, and is forgotten again if the frame is
+        dropped or its extraction fails, so a retry of it is analyzed.
+        Raises ValueError if the session does not exist, InvalidMediaError if a
+        frame cannot be decoded, CaptureOrderError if the capture is ordered
+        differently from the session's earlier ones, SessionOverloadedError
+        if its captures in flight are all being extracted, and
+        WorkerPoolClosedError (with the capture released) during shutdown.
+        """
+        frame_hash = await self._frame_hash(request)
+        capture = InFlightCapture(order_key=request.order_key, submitted_at=request.received_at, frame_hash=frame_hash)
+
+        def admit(session: SessionState) -> Tuple[Optional[int], Optional[InFlightCapture]]:
+            # Nothing changes before admit_capture may raise, so a rejected frame leaves no trace.
+            check_order_domain(session, request.order_domain)
+            if frame_hash is not None:
+                distance = self._nearest_recent_frame(session, frame_hash)
+                if distance is not None:
+                    session.deduplicated_frames += 1
+                    return distance, None
+            dropped = admit_capture(session, capture, self.backpressure)
+            session.order_domain = request.order_domain
+            if dropped is not None:
+                self._forget_frame_hash(session, dropped.frame_hash)
+            if frame_hash is not None:
+                session.recent_frame_hashes.append(frame_hash)
+                del session.recent_frame_hashes[:-self.frame_dedup_history]
+            return None, dropped
+
+        distance, dropped = await self.session_store.update(request.session_id, admit)
+        if distance is not None:
+            logger.info("Skipping near-duplicate frame.", session_id=request.session_id, distance=distance)
+            return None
+        if dropped is not None:
+            logger.info("Dropped the oldest waiting capture.", session_id=request.session_id,
+                        order_key=dropped.order_key, waited_seconds=round(time.time() - dropped.submitted_at, 2))
+            # Descriptions held back for the dropped capture can move on.
+            self._post_compaction(request.session_id, request.aggregation_model_option)
+        done: "asyncio.Future[Optional[TimelineEvent]]" = asyncio.get_running_loop().create_future()
+        saved = False
+
+        async def extract():
+            nonlocal saved
+            if not await self._start_capture(request.session_id, capture):
+                logger.info("Skipping a dropped capture.", session_id=request.session_id, order_key=capture.order_key)
+                if not done.done():
+                    done.set_result(None)
+                return
+            # A retried job must not store the same media twice.
+            if not saved:
+                await self._save_media(request)
+                saved = True
+            event = await self._extract_scene(request, capture)
+            if not done.done():
+                done.set_result(event)
+
+        async def give_up():
+            # Later descriptions must not wait for a scene that will never come.
+            await self._finish_capture(request, capture, event=None)
+            if not done.done():
+                done.set_result(None)
+
+        try:
+            self.worker_pool.submit(request.session_id, "extract_scene", extract, on_failure=give_up)
+        except WorkerPoolClosedError:
+            # The capture was admitted but will never run; do not leave it in flight.
+            await self._release_capture(request.session_id, capture)
+            raise
+        return done
+
+    async def _release_capture(self, session_id: str, capture: InFlightCapture):
+        def release(session: SessionState):
+            session.in_flight = [item for item in session.in_flight if item.capture_id != capture.capture_id]
+            self._forget_frame_hash(session, capture.frame_hash)
+
+        try:
+            await self.session_store.update(session_id, release)
+        except ValueError:
+            pass
+
+    async def _start_capture(self, session_id: str, capture: InFlightCapture) -> bool:
         """
-        The "producer" pipeline. It saves the media and triggers the consumer task.
+        Marks the capture as started, so it can no longer be dropped. Returns
+        False if it was dropped, or its session removed, while it waited.
         """
-        logger.info("Extraction task started.", session_id=request.session_id, media_type=type(request.media).__name__)
+        def start(session: SessionState) -> bool:
+            for item in session.in_flight:
+                if item.capture_id == capture.capture_id:
+                    if item.started_at is None:
+                        item.started_at = time.time()
+                    capture.started_at = item.started_at
+                    return True
+            return False
+
         try:
-            prefix = "session_clip" if "VideoFile" in str(type(request.media)) else "session_frame"
-            self.storage_service.save_file(
-                file_bytes=request.media.content,
-                original_filename=request.media.filename,
-                prefix=prefix
+            return await self.session_store.update(session_id, start)
+        except ValueError:
+            return False
+
+    async def _save_media(self, request: SessionAnalysVideoRequest):
+        prefix = "session_clip" if isinstance(request.media, VideoFile) else "session_frame"
+        await self.storage_service.save_file_async(
+            file_bytes=request.media.content,
+            original_filename=request.media.filename,
+            prefix=prefix
+        )
+
+    async def _extract_scene(
+            self,
+            request: SessionAnalysVideoRequest,
+            capture: InFlightCapture
+    ) -> Optional[TimelineEvent]:
+        """
+        The "producer" step. It describes the media, adds the description to the
+        scene log and hands it on for the timeline. Extractions run in parallel
+        and may finish in any order. Failures propagate, so the worker pool
+        retries the job.
+        """
+        logger.info("Extraction task started.", session_id=request.session_id, media_type=type(request.media).__name__,
+                    order_key=request.order_key)
+        media = request.media
+        if isinstance(media, VideoFile) and self.clip_extraction_mode == CLIP_MODE_SAMPLED_FRAMES:
+            extractor = SampledFramesSceneExtractor(
+                vision_service=self.vision_service,
+                media_service=self.media_service,
+                frames_preamble=self.prompt_service.get('scene_extraction.sampled_frames_preamble')
             )
+        elif isinstance(media, VideoFile):
+            extractor = VideoSceneExtractor(vision_service=self.vision_service)
+        else:
+            extractor = FrameSceneExtractor(vision_service=self.vision_service)
+            media = await self.media_service.normalize_image(media, feature="live_frame")
+
+        scene_prompt = self.prompt_service.get('scene_extraction.event_description')
+        scene_description = await extractor.extract_scene(
+            media=media,
+            prompt=scene_prompt,
+            model=request.analysis_model_option
+        )
+        logger.info("Scene extracted.", session_id=request.session_id, description_length=len(scene_description))
+
+        event = TimelineEvent(text=scene_description, timestamp=request.received_at, order_key=request.order_key)
+        try:
+            await self.session_store.append_event(request.session_id, event)
+        except ValueError:
+            logger.info("Scene dropped as the session no longer exists.", session_id=request.session_id)
+            return None
+        await self._finish_capture(request, capture, event)
+        return event
 
-            if prefix == "session_clip":
-                extractor = VideoSceneExtractor(vision_service=self.vision_service)
+    async def _finish_capture(
+            self,
+            request: SessionAnalysVideoRequest,
+            capture: InFlightCapture,
+            event: Optional[TimelineEvent]
+    ):
+        """
+        Takes the capture out of flight, hands its description (if any) to the
+        reorder buffer and lets the session's actor release what is in order.
+        """
+        finished_at = time.time()
+
+        def complete(session: SessionState) -> int:
+            session.in_flight = [item for item in session.in_flight if item.capture_id != capture.capture_id]
+            if event is not None:
+                session.pending_descriptions.append(event)
+                session.narrative_version += 1
+                if capture.started_at is not None:
+                    record_extraction(session, capture.started_at, finished_at, self.backpressure)
             else:
-                extractor = FrameSceneExtractor(vision_service=self.vision_service)
+                self._forget_frame_hash(session, capture.frame_hash)
+            return session.narrative_version
 
-            scene_prompt = self.prompt_service.get('scene_extraction.event_description')
-            scene_description = extractor.extract_scene(
-                media=request.media,
-                prompt=scene_prompt,
-                model=request.analysis_model_option
-            )
-            logger.info("Scene extracted.", session_id=request.session_id, description_length=len(scene_description))
-
-            lock = SESSION_LOCKS.get(request.session_id)
-            if not lock: return
-            with lock:
-                session = get_session(request.session_id)
-                session.pending_descriptions.append(scene_description)
-                if not getattr(session, 'is_aggregator_running', False):
-                    session.is_aggregator_running = True
-                    logger.info("Aggregator was not running. Starting a new one.", session_id=request.session_id)
-
-                    # --- THIS IS THE KEY CHANGE ---
-                    # We now call the new top-level worker function and pass it the
-                    # vision_service instance it needs to do its job.
-                    background_tasks.add_task(
-                        run_aggregation_task_worker,
-                        request.session_id,
-                        request.aggregation_model_option,
-                        self.vision_service,
-                        self.prompt_service
-                    )
-                else:
-                    logger.info("Aggregator is already running. Not starting a new one.", session_id=request.session_id)
-        except Exception:
-            logger.exception("An error occurred during scene extraction.", session_id=request.session_id)
+        try:
+            version = await self.session_store.update(request.session_id, complete)
+        except ValueError:
+            return
+        if event is not None:
+            self.answer_cache.invalidate(request.session_id, version)
+            self.narrative_notifier.notify(request.session_id)
+        self._post_compaction(request.session_id, request.aggregation_model_option)
+
+    def _post_compaction(self, session_id: str, model: str, delay: float = 0.0):
+        def step():
+            return self._compact_step(session_id, model)
+
+        try:
+            if delay > 0:
+                self.worker_pool.post_after(delay, session_id, "compact", step)
+            else:
+                self.worker_pool.post(session_id, "compact", step)
+        except WorkerPoolClosedError:
+            # Shutting down; the buffered descriptions stay in the session and
+            # are released by the next compaction posted for it.
+            logger.info("Compaction not posted; the worker pool is closing.", session_id=session_id)
+
+    async def _compact_step(self, session_id: str, model: str) -> bool:
+        """
+        The "consumer" step, run by the session's actor. It moves descriptions
+        from the reorder buffer onto the timeline in capture order, then does
+        one compaction: the oldest
+        recent events become a summary segment, or the two oldest segments are
+        merged once there are too many. Returns whether the timeline may still
+        be over budget. Queries read the timeline as it is and never wait for it.
+        """
+        budget = self.narrative_budget
+
+        def plan_next_step(session: SessionState):
+            # Descriptions go on the timeline as soon as they are in order; no model call is needed.
+            nonlocal release_in
+            release_in = release_pending_events(session, time.time(), self.reorder_max_wait_seconds)
+
+            compact_count = events_to_compact(session, budget)
+            if compact_count:
+                events = session.recent_events[:compact_count]
+                return compact_count, None, latest_summary(session), [event.text for event in events], events
+            merge_index = segments_to_merge(session, budget)
+            if merge_index is not None:
+                segments = session.narrative_segments[merge_index:merge_index + 2]
+                return 0, merge_index, None, [segment.text for segment in segments], segments
+            return None
+
+        release_in: Optional[float] = None
+        try:
+            step = await self.session_store.update(session_id, plan_next_step)
+        except ValueError:
+            logger.info("Compaction stopped as the session no longer exists.", session_id=session_id)
+            return False
+        if release_in is not None:
+            # Come back when the wait for the missing capture runs out, even if no new description arrives.
+            self._post_compaction(session_id, model, delay=release_in)
+        if step is None:
+            logger.info("Timeline is within budget.", session_id=session_id)
+            return False
+        compact_count, merge_index, previous_summary, texts, items = step
+
+        # --- Perform the AI call without holding up other writers ---
+        compactor_prompt = self.prompt_service.get(
+            'live_session.narrative_compactor',
+            previous_summary=previous_summary,
+            new_descs=texts
+        )
+        compaction_result = await self.vision_service.analyze_text(prompt=compactor_prompt, model_option=model)
+        summary = compaction_result.text.strip()
+
+        def apply_summary(session: SessionState) -> Optional[int]:
+            # The actor serializes compaction within this process, but another
+            # worker process may have compacted the same items meanwhile.
+            if compact_count:
+                if session.recent_events[:compact_count] != items:
+                    return None
+                del session.recent_events[:compact_count]
+                session.narrative_segments.append(segment_from_events(summary, items))
+            else:
+                if session.narrative_segments[merge_index:merge_index + 2] != items:
+                    return None
+                session.narrative_segments[merge_index:merge_index + 2] = [merge_segments(summary, items)]
+            session.narrative_version += 1
+            return session.narrative_version
+
+        try:
+            version = await self.session_store.update(session_id, apply_summary)
+        except ValueError:
+            return False
+        applied = version is not None
+        if applied:
+            self.answer_cache.invalidate(session_id, version)
+            self.narrative_notifier.notify(session_id)
+        logger.info("Narrative compacted." if applied else "Compaction discarded as the timeline changed.",
+                    session_id=session_id, items=len(texts))
+        return True
+
+    async def get_status(self, session_id: str) -> SessionStatus:
+        """
+        Reports the session's backlog and the capture interval its client
+        should use. Raises ValueError if the session does not exist.
+        """
+        session = await self.session_store.get(session_id)
+        if session is None:
+            raise ValueError(f"Session with ID '{session_id}' not found.")
+        return session_status(session, time.time(), self.backpressure)
+
+    async def wait_for_version(self, session_id: str, min_version: int, timeout: float) -> SessionState:
+        """
+        Returns the session once its narrative_version reaches `min_version`,
+        or as it is when `timeout` seconds have passed. Changes made in this
+        process wake the wait at once; those of other worker processes are
+        picked up by re-reading the store every poll interval.
+        Raises ValueError if the session does not exist.
+        """
+        deadline = time.monotonic() + timeout
+        # Unknown sessions are turned away before anything is subscribed.
+        session = await self.session_store.get(session_id)
+        if session is None:
+            raise ValueError(f"Session with ID '{session_id}' not found.")
+        if session.narrative_version >= min_version:
+            return session
+        while True:
+            change = self.narrative_notifier.subscribe(session_id)
+            try:
+                # Re-read after subscribing, so a change in between is not missed.
+                session = await self.session_store.get(session_id)
+                if session is None:
+                    raise ValueError(f"Session with ID '{session_id}' not found.")
+                remaining = deadline - time.monotonic()
+                if session.narrative_version >= min_version or remaining <= 0:
+                    return session
+                try:
+                    await asyncio.wait_for(change.wait(), timeout=min(remaining, self.version_poll_seconds))
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                # Released however the wait ends, so idle entries do not pile up.
+                self.narrative_notifier.unsubscribe(session_id, change)
+
+    async def get_narrative(self, session_id: str, after_version: int, timeout: float) -> NarrativeSnapshot:
+        """
+        Long-polls the session's narrative: returns as soon as its version is
+        past `after_version`, or the current narrative once `timeout` passes.
+        """
+        session = await self.wait_for_version(session_id, after_version + 1, timeout)
+        return NarrativeSnapshot(
+            session_id=session_id,
+            narrative_version=session.narrative_version,
+            narrative_segments=session.narrative_segments,
+            recent_events=sorted(session.recent_events + session.pending_descriptions, key=lambda event: event.sort_key),
+            in_flight=len(session.in_flight)
+        )
+
+    async def read_updates(self, session_id: str, offset: int) -> Tuple[List[TimelineEvent], Optional[NarrativeSegment]]:
+        """
+        Returns the descriptions added to the scene log since `offset` and the
+        newest summary segment, for clients following a session.
+        Raises ValueError if the session does not exist.
+        """
+        session = await self.session_store.get(session_id)
+        if session is None:
+            raise ValueError(f"Session with ID '{session_id}' not found.")
+        events = await self.session_store.read_events(session_id, offset=offset)
+        return events, session.narrative_segments[-1] if session.narrative_segments else None
 
     async def answer_question(self, request: SessionQueryRequest) -> SessionQueryResult:
         """
-        Answers a user's question based on the most up-to-date narrative.
+        Answers a user's question based on the most up-to-date timeline, rendered
+        within the prompt token budget, plus the earlier descriptions that best
+        match the question.
         """
-        logger.info("Answering question for session.", session_id=request.session_id)
-        lock = SESSION_LOCKS.get(request.session_id)
-        if not lock:
+        logger.info("Answering question for session.", session_id=request.session_id, min_version=request.min_version)
+        if request.min_version is not None:
+            session = await self.wait_for_version(request.session_id, request.min_version, request.wait_seconds)
+        else:
+            session = await self.session_store.get(request.session_id)
+        if session is None:
+            logger.warning("Attempted to access a non-existent session.", session_id=request.session_id)
             raise ValueError(f"Session with ID '{request.session_id}' not found.")
+        # The in-memory store hands out the live session, which captures that
+        # finish during the model call would change. The answer, its cache key
+        # and the version reported must all be of the narrative read here.
+        session = session.model_copy(update={
+            "recent_events": list(session.recent_events),
+            "pending_descriptions": list(session.pending_descriptions),
+            "narrative_segments": list(session.narrative_segments),
+        })
+        version = session.narrative_version
+        stale = request.min_version is not None and version < request.min_version
+        if stale:
+            logger.info("Answering from an older narrative than requested.", session_id=request.session_id,
+                        narrative_version=version, min_version=request.min_version)
 
-        with lock:
-            session = get_session(request.session_id)
-            current_narrative = session.current_narrative
+        # A question keeps the session alive just like a new frame does.
+        await self.session_store.touch(request.session_id)
+
+        async def compute() -> str:
+            timeline = render_timeline(session, self.narrative_budget.prompt_token_budget)
+            index = await self.scene_indexes.sync(request.session_id)
+            hits = index.search(request.question, self.narrative_budget.retrieval_top_k)
+            relevant_events = render_relevant_events(session, hits, self.narrative_budget.retrieval_token_budget)
 
             # 1. Get the prompt for the selected mode.
             mode_prompt = self.prompt_service.get(f'prompt_mode.{request.mode.value}')
@@ -170,11 +512,26 @@ class LiveSessionUseCase:
             qa_prompt = self.prompt_service.get(
                 'live_session.contextual_qa',
                 mode_prompt=mode_prompt,
-                current_narrative=current_narrative,
+                timeline=timeline,
+                relevant_events=relevant_events,
                 question=request.question
             )
 
-        answer = self.vision_service.analyze_text(prompt=qa_prompt, model_option=request.model_option).text
+            qa_result = await self.vision_service.analyze_text(prompt=qa_prompt, model_option=request.model_option)
+            return qa_result.text.strip()
+
+        # The answer depends only on the narrative at this version, so a repeated
+        # question is answered from the cache until the narrative changes.
+        key = (SessionAnswerCache.normalize_question(request.question), request.mode.value, request.model_option)
+        answer, cached = await self.answer_cache.get_or_compute(
+            request.session_id, version, key, compute
+        )
 
-        logger.info("Question answered.", session_id=request.session_id, answer_length=len(answer))
-        return SessionQueryResult(session_id=request.session_id, answer=answer.strip())
\ No newline at end of file
+        logger.info("Question answered.", session_id=request.session_id, answer_length=len(answer), cached=cached)
+        return SessionQueryResult(
+            session_id=request.session_id,
+            answer=answer,
+            narrative_version=version,
+            stale=stale,
+            cached=cached
+        )
\ No newline at end of file
@@ -0,0 +1,62 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class _Change:
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    waiters: int = 0
+
+
+class NarrativeNotifier:
+    """
+    Wakes the coroutines of this process that wait for a session's narrative
+    to change. Each notification wakes every current waiter at once; later
+    waiters subscribe to the next one. Changes made by other worker processes
+    are not seen here, so waiters also re-read the session store periodically.
+
+    An entry is only kept while someone waits on it: notify() drops it, and so
+    does the last waiter to unsubscribe.
+    """
+
+    def __init__(self):
+        self._changes: Dict[str, _Change] = {}
+
+    def subscribe(self, session_id: str) -> asyncio.Event:
+        """
+        Returns an event that is set on the session's next change. Subscribe
+        before reading the session, so a change in between is not missed, and
+        always pair it with unsubscribe().
+        """
+        change = self._changes.get(session_id)
+        if change is None:
+            change = self._changes[session_id] = _Change()
+        change.waiters += 1
+        return change.event
+
+    def unsubscribe(self, session_id: str, event: asyncio.Event):
+        """
+        Called by a waiter that stops waiting, whether it was woken, timed out
+        or was cancelled.
+        """
+        change = self._changes.get(session_id)
+        if change is None or change.event is not event:
+            return  # Already notified and dropped.
+        change.waiters -= 1
+        if change.waiters <= 0:
+            del self._changes[session_id]
+
+    def notify(self, session_id: str):
+        change = self._changes.pop(session_id, None)
+        if change is not None:
+            change.event.set()
+
+    def session_ids(self) -> List[str]:
+        return list(self._changes)
+
+    def forget(self, session_id: str):
+        """
+        Wakes and drops the waiters of a removed session.
+        """
+        self.notify(session_id)
@@ -0,0 +1,214 @@
+import bisect
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+
+from src.domain.entities import SessionState, TimelineEvent, NarrativeSegment
+
+
+class NarrativeBudget(BaseModel):
+    """
+    Token budgets that keep a live session's narrative bounded.
+    """
+    # Recent events are kept verbatim up to this many tokens; older ones get compacted.
+    recent_token_budget: int = 1500
+    # The most event tokens folded into one compaction call.
+    compaction_batch_token_budget: int = 2000
+    # Above this many segments, two neighbouring segments are merged into one.
+    max_segments: int = 6
+    # The most timeline tokens put into a question-answering prompt.
+    prompt_token_budget: int = 3000
+    # Descriptions retrieved from the whole session for a question, on top of the timeline.
+    retrieval_top_k: int = 5
+    retrieval_token_budget: int = 800
+
+
+class CaptureOrderError(Exception):
+    """
+    Raised when a capture is ordered differently from the session's earlier
+    ones: by sequence number in a session ordered by time, or the reverse.
+    """
+
+
+def check_order_domain(session: SessionState, order_domain: str):
+    """
+    Raises CaptureOrderError if the session's captures are ordered by another domain.
+    """
+    if session.order_domain is not None and session.order_domain != order_domain:
+        raise CaptureOrderError(
+            f"Session '{session.session_id}' orders its captures by {session.order_domain}; "
+            + ("send a sequence number with every capture." if session.order_domain == "sequence"
+               else "do not send a sequence number.")
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    A rough token count for budgeting prompts (about 4 characters per token).
+    """
+    return len(text) // 4 + 1
+
+
+def select_batch_size(texts: List[str], token_budget: int) -> int:
+    """
+    Returns how many of the leading texts fit in the token budget. At least one
+    is always selected so the queue keeps moving.
+    """
+    count, used = 0, 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if count and used + cost > token_budget:
+            break
+        count += 1
+        used += cost
+    return count
+
+
+def events_to_compact(session: SessionState, budget: NarrativeBudget) -> int:
+    """
+    Returns how many of the oldest recent events should be compacted into a new
+    segment (0 if the recent events are within budget). The newest event always
+    stays verbatim.
+    """
+    texts = [event.text for event in session.recent_events]
+    if sum(estimate_tokens(text) for text in texts) <= budget.recent_token_budget:
+        return 0
+    return min(select_batch_size(texts, budget.compaction_batch_token_budget), len(texts) - 1)
+
+
+def segments_to_merge(session: SessionState, budget: NarrativeBudget) -> Optional[int]:
+    """
+    Returns the index of the first of two neighbouring segments to merge, or None
+    while the segment count is within budget. The oldest pair of the same level is
+    merged first, so older history is kept at coarser granularity, like a binary
+    counter, instead of being folded into one ever-growing summary.
+    """
+    segments = session.narrative_segments
+    if len(segments) <= budget.max_segments:
+        return None
+    for index in range(len(segments) - 1):
+        if segments[index].level == segments[index + 1].level:
+            return index
+    return 0
+
+
+def release_pending_events(session: SessionState, now: float, max_wait_seconds: float) -> Optional[float]:
+    """
+    Moves extracted descriptions onto the timeline in capture order. A
+    description is held while an earlier capture is still being extracted, but
+    no longer than `max_wait_seconds` after that capture was submitted; if the
+    earlier one finishes later still, it is slotted into place among the recent
+    events. Returns the seconds until a held description may be released, or
+    None if nothing is held.
+    """
+    waiting_for = [capture for capture in session.in_flight if now - capture.submitted_at < max_wait_seconds]
+    barrier = min((capture.order_key for capture in waiting_for), default=float("inf"))
+
+    held: List[TimelineEvent] = []
+    for event in sorted(session.pending_descriptions, key=lambda event: event.sort_key):
+        if event.sort_key <= barrier:
+            bisect.insort(session.recent_events, event, key=lambda event: event.sort_key)
+        else:
+            held.append(event)
+    session.pending_descriptions = held
+
+    if not held:
+        return None
+    return min(capture.submitted_at for capture in waiting_for) + max_wait_seconds - now
+
+
+def segment_from_events(text: str, events: List[TimelineEvent]) -> NarrativeSegment:
+    # Capture order and arrival order can differ slightly, so take the extremes.
+    return NarrativeSegment(
+        text=text,
+        start_time=min(event.timestamp for event in events),
+        end_time=max(event.timestamp for event in events),
+        event_count=len(events),
+        level=0
+    )
+
+
+def merge_segments(text: str, segments: List[NarrativeSegment]) -> NarrativeSegment:
+    return NarrativeSegment(
+        text=text,
+        start_time=segments[0].start_time,
+        end_time=segments[-1].end_time,
+        event_count=sum(segment.event_count for segment in segments),
+        level=max(segment.level for segment in segments) + 1
+    )
+
+
+def _offset(session: SessionState, timestamp: float) -> str:
+    seconds = max(0, int(timestamp - session.started_at))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def render_timeline(session: SessionState, token_budget: int) -> str:
+    """
+    Renders the session timeline for a prompt, within the token budget.
+    The newest events are kept first; older summaries are added while they fit.
+    Times are minutes:seconds since the session started.
+    """
+    used = 0
+    omitted = False
+
+    recent_lines: List[str] = []
+    events = sorted(session.recent_events + session.pending_descriptions, key=lambda event: event.sort_key)
+    for event in reversed(events):
+        line = f"[{_offset(session, event.timestamp)}] {event.text}"
+        cost = estimate_tokens(line)
+        if recent_lines and used + cost > token_budget:
+            omitted = True
+            break
+        recent_lines.insert(0, line)
+        used += cost
+
+    summary_lines: List[str] = []
+    if not omitted:
+        for segment in reversed(session.narrative_segments):
+            line = f"[{_offset(session, segment.start_time)} - {_offset(session, segment.end_time)}] {segment.text}"
+            cost = estimate_tokens(line)
+            if used + cost > token_budget:
+                omitted = True
+                break
+            summary_lines.insert(0, line)
+            used += cost
+
+    if not recent_lines and not summary_lines:
+        return "The scene has just begun. Nothing has been described yet."
+
+    parts: List[str] = []
+    if omitted:
+        parts.append("(Older events are omitted.)")
+    if summary_lines:
+        parts.append("Summary of earlier events:\n" + "\n".join(summary_lines))
+    if recent_lines:
+        parts.append("Most recent events:\n" + "\n".join(recent_lines))
+    return "\n\n".join(parts)
+
+
+def render_relevant_events(
+        session: SessionState,
+        hits: List[Tuple[TimelineEvent, float]],
+        token_budget: int
+) -> str:
+    """
+    Renders retrieved descriptions in time order, within the token budget, best
+    matches first. Events that are already on the timeline verbatim are skipped.
+    """
+    verbatim = {(event.timestamp, event.text) for event in session.recent_events + session.pending_descriptions}
+    selected: List[TimelineEvent] = []
+    used = 0
+    for event, _score in hits:
+        if (event.timestamp, event.text) in verbatim:
+            continue
+        cost = estimate_tokens(event.text) + 3
+        if used + cost > token_budget:
+            break
+        selected.append(event)
+        used += cost
+    selected.sort(key=lambda event: event.timestamp)
+    return "\n".join(f"[{_offset(session, event.timestamp)}] {event.text}" for event in selected)
+
+
+def latest_summary(session: SessionState) -> Optional[str]:
+    return session.narrative_segments[-1].text if session.narrative_segments else None
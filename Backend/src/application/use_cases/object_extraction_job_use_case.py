@@ -0,0 +1,110 @@
+import asyncio
+import mimetypes
+import os
+import time
+import structlog
+
+from src.application.services.dataset_service import DatasetService
+from src.application.services.media_processing_service import MediaProcessingService
+from src.application.services.storage_service import StorageService
+from src.application.services.vision_service import VisionService
+from src.domain.entities import ImageFile, RequestLog
+
+logger = structlog.get_logger(__name__)
+
+
+class ObjectExtractionJobUseCase:
+    """
+    Orchestrates the deferred object extraction for the dataset. Pending request
+    logs are claimed in batches, their images are loaded back from storage and
+    their object lists are extracted concurrently, paced to a throughput target.
+    """
+
+    def __init__(
+            self,
+            vision_service: VisionService,
+            storage_service: StorageService,
+            dataset_service: DatasetService,
+            media_service: MediaProcessingService
+    ):
+        self.vision_service = vision_service
+        self.storage_service = storage_service
+        self.dataset_service = dataset_service
+        self.media_service = media_service
+
+    async def run(
+            self,
+            batch_size: int,
+            concurrency: int,
+            target_per_minute: float,
+            lease_seconds: int,
+            max_attempts: int,
+            follow: bool = False,
+            idle_sleep_seconds: float = 10.0
+    ) -> dict:
+        """
+        Processes pending logs until none are left, or forever when `follow` is set.
+        Returns counters for the run.
+        """
+        stats = {"processed": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(concurrency)
+        # Minimum spacing between two extraction starts, to hold the throughput target.
+        start_interval = 60.0 / target_per_minute if target_per_minute > 0 else 0.0
+        next_start = time.monotonic()
+        started_at = time.monotonic()
+
+        async def process(log: RequestLog):
+            nonlocal next_start
+            async with semaphore:
+                now = time.monotonic()
+                wait = next_start - now
+                next_start = max(now, next_start) + start_interval
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self._extract_one(log, max_attempts, stats)
+
+        logger.info("Object extraction job started.", batch_size=batch_size, concurrency=concurrency)
+        while True:
+            batch = await self.dataset_service.claim_pending_object_extractions(
+                limit=batch_size,
+                lease_seconds=lease_seconds
+            )
+            if not batch:
+                if not follow:
+                    break
+                await asyncio.sleep(idle_sleep_seconds)
+                continue
+
+            await asyncio.gather(*(process(log) for log in batch))
+
+            elapsed = time.monotonic() - started_at
+            logger.info(
+                "Object extraction batch finished.",
+                batch=len(batch),
+                processed=stats["processed"],
+                failed=stats["failed"],
+                per_minute=round(stats["processed"] / elapsed * 60, 1) if elapsed else None
+            )
+
+        stats["elapsed_seconds"] = round(time.monotonic() - started_at, 2)
+        logger.info("Object extraction job finished.", **stats)
+        return stats
+
+    async def _extract_one(self, log: RequestLog, max_attempts: int, stats: dict):
+        try:
+            content = await asyncio.to_thread(self.storage_service.read_file, log.file_path)
+            filename = os.path.basename(log.file_path)
+            image = ImageFile(
+                filename=filename,
+                content_type=mimetypes.guess_type(filename)[0] or "image/jpeg",
+                content=content
+            )
+            image = await self.media_service.normalize_image(image, feature="vqa")
+
+            object_list = await self.vision_service.get_object_list(image)
+            await self.dataset_service.complete_object_extraction(log.id, object_list)
+            stats["processed"] += 1
+        except Exception:
+            logger.exception("Object extraction failed for request log.", log_id=str(log.id), path=log.file_path)
+            await self.dataset_service.fail_object_extraction(log.id, max_attempts=max_attempts)
+            stats["failed"] += 1
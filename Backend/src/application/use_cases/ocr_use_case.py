@@ -4,6 +4,7 @@ from src.domain.entities import OCRRequest, OCRResult
 from src.application.services.vision_service import VisionService
 from src.application.services.storage_service import StorageService
 from src.application.services.prompt_service import PromptService
+from src.application.services.media_processing_service import MediaProcessingService
 
 logger = structlog.get_logger(__name__)
 
@@ -11,17 +12,18 @@ class OCRUseCase:
     """
     Orchestrates the OCR process. FIX: Now saves the image first.
     """
-    def __init__(self, vision_service: VisionService, storage_service: StorageService, prompt_service: PromptService):
+    def __init__(self, vision_service: VisionService, storage_service: StorageService, prompt_service: PromptService, media_service: MediaProcessingService):
         self.vision_service = vision_service
         self.storage_service = storage_service
         self.prompt_service = prompt_service
+        self.media_service = media_service
 
     async def execute(self, request: OCRRequest) -> OCRResult:
         logger.info("OCRUseCase started.")
         start_time = time.time()
 
         try:
-            analyzed_path = self.storage_service.save_file(
+            analyzed_path = await self.storage_service.save_file_async(
                 file_bytes=request.image.content,
                 original_filename=request.image.filename,
                 prefix="ocr"
@@ -30,10 +32,13 @@ class OCRUseCase:
 
             prompt = self.prompt_service.get('ocr.text_extraction')
 
+            # OCR keeps a larger maximum edge than VQA so small print stays legible.
+            model_image = await self.media_service.normalize_image(request.image, feature="ocr")
+
             logger.info("Calling ocr service for OCR analysis.", model_option=request.model_option)
 
-            analysis_result = self.vision_service.analyze_image(
-                image=request.image,
+            analysis_result = await self.vision_service.analyze_image(
+                image=model_image,
                 prompt=prompt,
                 model_option=request.model_option
             )
@@ -0,0 +1,90 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from src.domain.entities import TimelineEvent
+
+# Words that carry no meaning for matching a question to a scene description.
+STOPWORDS = frozenset("""
+a an and are as at be been but by did do does for from had has have he her his i in is it its
+me my of on or she so that the their them then there these they this to was we were what when
+where which who why will with you your
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Rough memory cost of one event and of one posting entry, for the size estimate.
+_EVENT_BYTES = 200
+_POSTING_BYTES = 100
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens without stopwords, with a light plural stemming so
+    that e.g. "keys" matches "key".
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class SceneIndex:
+    """
+    An incremental in-memory BM25 index over one session's scene descriptions.
+    Adding a description only touches the postings of its own terms, so the
+    index stays cheap to maintain for hour-long sessions.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._events: List[TimelineEvent] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        # Estimated memory held by the index, counted towards the session byte cap
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, event: TimelineEvent):
+        doc_id = len(self._events)
+        tokens = tokenize(event.text)
+        self._events.append(event)
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        frequencies = Counter(tokens)
+        for term, frequency in frequencies.items():
+            self._postings[term][doc_id] = frequency
+        self.size_bytes += _EVENT_BYTES + len(event.text) + _POSTING_BYTES * len(frequencies)
+
+    def search(self, query: str, top_k: int) -> List[Tuple[TimelineEvent, float]]:
+        """
+        Returns up to top_k events that match the query, best first.
+        """
+        if not self._events or top_k <= 0:
+            return []
+
+        count = len(self._events)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self._events[doc_id], score) for doc_id, score in best]
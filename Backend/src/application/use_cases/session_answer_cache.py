@@ -0,0 +1,130 @@
+import asyncio
+import re
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+# (normalized question, mode, model)
+AnswerKey = Tuple[str, str, str]
+
+
+class SessionAnswerCache:
+    """
+    Answers to live-session questions, kept per session for the narrative
+    version they were based on. Users repeat the same questions often, and
+    while the narrative is unchanged the same prompt would go to the model.
+
+    Only the newest version's answers are kept: entries are dropped as soon as
+    the narrative moves on, and each session keeps at most
+    `max_entries_per_session` answers (least recently used first out).
+    Concurrent identical questions share one model call.
+    """
+
+    def __init__(self, max_entries_per_session: int = 32):
+        self.max_entries_per_session = max_entries_per_session
+        # session_id -> (narrative version, answers by key)
+        self._sessions: Dict[str, Tuple[int, "OrderedDict[AnswerKey, str]"]] = {}
+        self._in_flight: Dict[Tuple[str, int, AnswerKey], asyncio.Future] = {}
+        self.counters: Counter = Counter()
+        logger.info("SessionAnswerCache initialized.", max_entries_per_session=max_entries_per_session)
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """
+        Folds case, whitespace and trailing punctuation, so "What's in front of me?"
+        and "what's in front of me" share an answer.
+        """
+        return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+    def _answers_for(self, session_id: str, version: int) -> Optional["OrderedDict[AnswerKey, str]"]:
+        current = self._sessions.get(session_id)
+        if current is not None and current[0] > version:
+            # A read that lags behind an answer already cached for a newer version.
+            return None
+        if current is None or current[0] < version:
+            if current is not None and current[1]:
+                self.counters["invalidated"] += len(current[1])
+            current = self._sessions[session_id] = (version, OrderedDict())
+        return current[1]
+
+    async def get_or_compute(
+            self,
+            session_id: str,
+            version: int,
+            key: AnswerKey,
+            compute: Callable[[], Awaitable[str]]
+    ) -> Tuple[str, bool]:
+        """
+        Returns the answer for the key at this narrative version and whether it
+        came from the cache, running `compute` on a miss. Failures are not cached.
+        """
+        answers = self._answers_for(session_id, version)
+        if answers is not None and key in answers:
+            answers.move_to_end(key)
+            self.counters["hits"] += 1
+            return answers[key], True
+
+        flight_key = (session_id, version, key)
+        leader = self._in_flight.get(flight_key)
+        if leader is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(leader), True
+
+        self.counters["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved so unobserved ones don't produce warnings.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[flight_key] = future
+        try:
+            answer = await compute()
+            future.set_result(answer)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._in_flight.pop(flight_key, None)
+
+        # The narrative may have moved on while the model was answering.
+        answers = self._answers_for(session_id, version)
+        if answers is not None:
+            answers[key] = answer
+            while len(answers) > self.max_entries_per_session:
+                answers.popitem(last=False)
+        return answer, False
+
+    def invalidate(self, session_id: str, version: int):
+        """
+        Drops the session's answers based on versions older than `version`.
+        Called when the narrative changes.
+        """
+        current = self._sessions.get(session_id)
+        if current is not None and current[0] < version:
+            self.counters["invalidated"] += len(current[1])
+            del self._sessions[session_id]
+
+    def forget(self, session_id: str):
+        current = self._sessions.pop(session_id, None)
+        if current is not None:
+            self.counters["invalidated"] += len(current[1])
+
+    def session_ids(self) -> List[str]:
+        return list(self._sessions)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["coalesced"] + self.counters["misses"]
+        return {
+            "sessions": len(self._sessions),
+            "entries": sum(len(answers) for _version, answers in self._sessions.values()),
+            "hits": self.counters["hits"],
+            "coalesced": self.counters["coalesced"],
+            "misses": self.counters["misses"],
+            "invalidated": self.counters["invalidated"],
+            "hit_rate": round((self.counters["hits"] + self.counters["coalesced"]) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Optional
+
+import structlog
+from pydantic import BaseModel
+
+from src.application.services.session_store import SessionStore
+from .narrative_notifier import NarrativeNotifier
+from .session_answer_cache import SessionAnswerCache
+from .session_scene_indexes import SessionSceneIndexes
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+# Sessions read from the store per step of a sweep
+SWEEP_BATCH = 64
+
+
+class SessionLimits(BaseModel):
+    """
+    Bounds on how many live sessions are kept, and for how long.
+    """
+    # Sessions without a frame, clip or query for this long are removed.
+    idle_ttl_seconds: float = 30 * 60
+    # Above either cap, the least recently active sessions are removed first.
+    max_sessions: int = 1000
+    max_bytes: int = 256 * 1024 * 1024
+
+
+class SessionLifecycleUseCase:
+    """
+    Ends live sessions explicitly or by eviction, and reports session gauges.
+    """
+
+    def __init__(
+            self,
+            session_store: SessionStore,
+            limits: SessionLimits,
+            narrative_notifier: Optional[NarrativeNotifier] = None,
+            answer_cache: Optional[SessionAnswerCache] = None,
+            scene_indexes: Optional[SessionSceneIndexes] = None
+    ):
+        self.session_store = session_store
+        self.limits = limits
+        self.narrative_notifier = narrative_notifier
+        self.answer_cache = answer_cache
+        self.scene_indexes = scene_indexes
+        self.evictions: Counter = Counter()
+        self._session_bytes: Optional[int] = None
+        self._last_sweep_at: Optional[float] = None
+        logger.info("SessionLifecycleUseCase initialized")
+
+    async def end_session(self, session_id: str) -> bool:
+        """
+        Removes a session the client is done with. Returns whether it existed.
+        """
+        ended = await self._remove(session_id, reason="ended")
+        if ended:
+            logger.info("Session ended.", session_id=session_id)
+        return ended
+
+    async def _remove(self, session_id: str, reason: str) -> bool:
+        removed = await self.session_store.delete(session_id)
+        self._forget_locally(session_id)
+        if removed:
+            self.evictions[reason] += 1
+        return removed
+
+    def _forget_locally(self, session_id: str):
+        # Derived per-process state; other workers drop theirs in _prune_local_state.
+        if self.scene_indexes is not None:
+            self.scene_indexes.forget(session_id)
+        if self.narrative_notifier is not None:
+            self.narrative_notifier.forget(session_id)
+        if self.answer_cache is not None:
+            self.answer_cache.forget(session_id)
+
+    async def enforce_count_limit(self) -> int:
+        """
+        Removes the least recently active sessions above the session cap.
+        Cheap enough to run after every session is created: it only reads the
+        sessions it removes. Returns how many were removed.
+        """
+        excess = await self.session_store.count() - self.limits.max_sessions
+        if excess <= 0:
+            return 0
+        removed = 0
+        for info in await self.session_store.oldest_sessions(excess):
+            if await self._remove(info.session_id, reason="max_sessions"):
+                removed += 1
+        return removed
+
+    async def sweep(self) -> dict:
+        """
+        Removes idle sessions, then the least recently active ones until the
+        count and byte caps hold, reading sessions oldest first and only as
+        far as needed. Returns how many were removed for each reason.
+        """
+        now = time.time()
+        removed: Counter = Counter()
+
+        while True:
+            batch = await self.session_store.oldest_sessions(SWEEP_BATCH)
+            idle = [info for info in batch if now - info.last_active_at > self.limits.idle_ttl_seconds]
+            for info in idle:
+                if await self._remove(info.session_id, reason="idle_ttl"):
+                    removed["idle_ttl"] += 1
+            if len(idle) < SWEEP_BATCH:
+                break
+
+        removed["max_sessions"] += await self.enforce_count_limit()
+
+        # Retrieval indexes live outside the store, so their memory is added here.
+        total_bytes = await self.session_store.total_bytes()
+        if self.scene_indexes is not None:
+            total_bytes += self.scene_indexes.total_bytes()
+        while total_bytes > self.limits.max_bytes:
+            batch = await self.session_store.oldest_sessions(SWEEP_BATCH)
+            if not batch:
+                break
+            for info in batch:
+                if total_bytes <= self.limits.max_bytes:
+                    break
+                total_bytes -= info.size_bytes
+                if self.scene_indexes is not None:
+                    total_bytes -= self.scene_indexes.size_bytes(info.session_id)
+                if await self._remove(info.session_id, reason="max_bytes"):
+                    removed["max_bytes"] += 1
+
+        await self._prune_local_state()
+        self._session_bytes = total_bytes
+        self._last_sweep_at = now
+        removed = +removed
+        if removed:
+            logger.info("Evicted live sessions.", session_bytes=total_bytes, **removed)
+        return dict(removed)
+
+    async def _prune_local_state(self):
+        """
+        Drops this process's indexes, cached answers and waiters of sessions
+        that another worker process ended or evicted.
+        """
+        known = set()
+        if self.scene_indexes is not None:
+            known.update(self.scene_indexes.session_ids())
+        if self.narrative_notifier is not None:
+            known.update(self.narrative_notifier.session_ids())
+        if self.answer_cache is not None:
+            known.update(self.answer_cache.session_ids())
+        if not known:
+            return
+        for session_id in known - await self.session_store.existing(known):
+            self._forget_locally(session_id)
+
+    async def run_reaper(self, interval_seconds: float):
+        """
+        Sweeps periodically until cancelled.
+        """
+        logger.info("Session reaper started.", interval_seconds=interval_seconds)
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Session reaper sweep failed.")
+            await asyncio.sleep(interval_seconds)
+
+    async def stats(self) -> dict:
+        """
+        Gauges for live sessions. The byte gauge, which includes this process's
+        retrieval indexes, is as of the last sweep.
+        """
+        return {
+            "live_sessions": await self.session_store.count(),
+            "session_bytes": self._session_bytes,
+            "last_sweep_at": self._last_sweep_at,
+            "evictions": dict(self.evictions),
+            "limits": self.limits.model_dump(),
+        }
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Dict, List
+
+import structlog
+
+from src.application.services.session_store import SessionStore
+from .scene_index import SceneIndex
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class SessionSceneIndexes:
+    """
+    This process's retrieval indexes over each session's scene log. They are
+    derived data, so every worker process keeps its own and catches up from
+    the session store before searching.
+
+    Syncs of one session are serialised: concurrent queries would otherwise
+    read the same offset and add the same descriptions twice, which skews the
+    BM25 scores and the index size counted against the session byte budget.
+    """
+
+    def __init__(self, session_store: SessionStore):
+        self.session_store = session_store
+        self._indexes: Dict[str, SceneIndex] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        logger.info("SessionSceneIndexes initialized.")
+
+    async def sync(self, session_id: str) -> SceneIndex:
+        """
+        Returns the session's index, after adding the descriptions appended to
+        the scene log since it was last synced.
+        """
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            index = self._indexes.setdefault(session_id, SceneIndex())
+            for event in await self.session_store.read_events(session_id, offset=len(index)):
+                index.add(event)
+            return index
+
+    def size_bytes(self, session_id: str) -> int:
+        index = self._indexes.get(session_id)
+        return index.size_bytes if index is not None else 0
+
+    def total_bytes(self) -> int:
+        return sum(index.size_bytes for index in self._indexes.values())
+
+    def session_ids(self) -> List[str]:
+        return list(self._indexes)
+
+    def forget(self, session_id: str):
+        self._indexes.pop(session_id, None)
+        self._locks.pop(session_id, None)
@@ -0,0 +1,287 @@
+import asyncio
+import random
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+import structlog
+from pydantic import BaseModel, Field
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+# A job returns nothing; an actor message returns whether it has more work to do.
+Job = Callable[[], Awaitable[None]]
+MessageHandler = Callable[[], Awaitable[bool]]
+
+
+class WorkerPoolLimits(BaseModel):
+    """
+    Concurrency and retry settings of the live-session worker pool.
+    """
+    # The most jobs and actor turns running at once, across all sessions.
+    concurrency: int = Field(8, ge=1)
+    # A failing job or message is tried this many times in total.
+    max_attempts: int = Field(3, ge=1)
+    # Retries back off exponentially from the base delay, with jitter, up to the cap.
+    retry_base_seconds: float = Field(0.5, ge=0)
+    retry_max_seconds: float = Field(8.0, ge=0)
+    # On shutdown, queued work gets this long to finish before it is cancelled.
+    drain_timeout_seconds: float = Field(10.0, ge=0)
+
+
+class WorkerPoolClosedError(RuntimeError):
+    """
+    Raised when work is submitted after the pool started shutting down.
+    """
+
+
+@dataclass
+class _JobItem:
+    session_id: str
+    name: str
+    run: Job
+    on_failure: Optional[Job] = None
+    attempt: int = 1
+
+
+@dataclass
+class _SessionActor:
+    session_id: str
+    # Pending messages by name. Posting a message that is already pending is a
+    # no-op, so a burst of notifications collapses into one turn.
+    mailbox: "OrderedDict[str, MessageHandler]" = field(default_factory=OrderedDict)
+    attempts: Counter = field(default_factory=Counter)
+    # True while a turn is queued or running; at most one turn per actor at a time.
+    scheduled: bool = False
+
+
+@dataclass
+class _ActorTurn:
+    actor: _SessionActor
+
+
+class SessionWorkerPool:
+    """
+    Runs the background work of live sessions on a fixed set of asyncio workers.
+
+    Two kinds of work share one queue and one concurrency bound:
+    - jobs (e.g. scene extraction), which run independently of each other;
+    - messages to a session's actor (e.g. compaction), which are handled one
+      at a time per session, in the order they were posted.
+
+    Failures are retried with backoff instead of stranding the session's
+    work, and close() lets queued work drain before cancelling the workers.
+    """
+
+    def __init__(self, limits: Optional[WorkerPoolLimits] = None):
+        self.limits = limits or WorkerPoolLimits()
+        self._queue: "asyncio.Queue[Union[_JobItem, _ActorTurn]]" = asyncio.Queue()
+        self._actors: Dict[str, _SessionActor] = {}
+        self._workers: List[asyncio.Task] = []
+        self._timers: set = set()
+        # Failed jobs waiting out their retry delay, by id
+        self._delayed_jobs: Dict[int, _JobItem] = {}
+        self._running = 0
+        self._closed = False
+        self.counters: Counter = Counter()
+        logger.info("SessionWorkerPool initialized.", **self.limits.model_dump())
+
+    def start(self):
+        """
+        Starts the workers. Called once the event loop is running.
+        """
+        for index in range(self.limits.concurrency):
+            self._workers.append(asyncio.create_task(self._worker(index)))
+
+    # --- Submitting work ---
+
+    def submit(self, session_id: str, name: str, job: Job, on_failure: Optional[Job] = None):
+        """
+        Queues a job for any free worker. `on_failure` runs if the job is
+        given up on, so the caller can release what it reserved for it.
+        """
+        if self._closed:
+            raise WorkerPoolClosedError("The session worker pool is shutting down.")
+        self.counters["jobs_submitted"] += 1
+        self._queue.put_nowait(_JobItem(session_id=session_id, name=name, run=job, on_failure=on_failure))
+
+    def post(self, session_id: str, name: str, handler: MessageHandler):
+        """
+        Posts a message to the session's actor. The handler runs after the
+        actor's earlier messages, never concurrently with another handler of
+        the same session, and is posted again while it returns True.
+        """
+        if self._closed:
+            raise WorkerPoolClosedError("The session worker pool is shutting down.")
+        actor = self._actors.get(session_id)
+        if actor is None:
+            actor = self._actors[session_id] = _SessionActor(session_id=session_id)
+        if name not in actor.mailbox:
+            actor.mailbox[name] = handler
+            self.counters["messages_posted"] += 1
+        self._schedule(actor)
+
+    def post_after(self, delay: float, session_id: str, name: str, handler: MessageHandler):
+        """
+        Posts a message to the session's actor once `delay` seconds have passed.
+        """
+        self._call_later(delay, lambda: self.post(session_id, name, handler))
+
+    def _schedule(self, actor: _SessionActor):
+        if not actor.scheduled and actor.mailbox:
+            actor.scheduled = True
+            self._queue.put_nowait(_ActorTurn(actor=actor))
+
+    def _call_later(self, delay: float, callback: Callable[[], None]):
+        def fire():
+            self._timers.discard(handle)
+            if not self._closed:
+                callback()
+
+        handle = asyncio.get_running_loop().call_later(delay, fire)
+        self._timers.add(handle)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.limits.retry_max_seconds, self.limits.retry_base_seconds * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    # --- Workers ---
+
+    async def _worker(self, index: int):
+        while True:
+            item = await self._queue.get()
+            self._running += 1
+            try:
+                if isinstance(item, _ActorTurn):
+                    await self._run_turn(item.actor)
+                else:
+                    await self._run_job(item)
+            except Exception:
+                # Handlers report their own failures; this only guards the worker itself.
+                logger.exception("Session worker failed unexpectedly.", worker=index)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _run_job(self, item: _JobItem):
+        try:
+            await item.run()
+            self.counters["jobs_completed"] += 1
+        except asyncio.CancelledError:
+            # Only close() cancels workers, once the drain timed out.
+            await self._drop_job(item)
+            raise
+        except Exception:
+            if item.attempt >= self.limits.max_attempts or self._closed:
+                self.counters["jobs_failed"] += 1
+                logger.exception("Session job failed; giving up.", session_id=item.session_id,
+                                 job=item.name, attempts=item.attempt)
+                await self._give_up(item)
+                return
+            delay = self._backoff(item.attempt)
+            self.counters["jobs_retried"] += 1
+            logger.warning("Session job failed; retrying.", session_id=item.session_id, job=item.name,
+                           attempt=item.attempt, retry_in_seconds=round(delay, 2), exc_info=True)
+            item.attempt += 1
+            self._delayed_jobs[id(item)] = item
+
+            def retry():
+                self._delayed_jobs.pop(id(item), None)
+                self._queue.put_nowait(item)
+
+            self._call_later(delay, retry)
+
+    async def _give_up(self, item: _JobItem):
+        if item.on_failure is None:
+            return
+        try:
+            await item.on_failure()
+        except Exception:
+            logger.exception("Session job failure handler failed.", session_id=item.session_id, job=item.name)
+
+    async def _drop_job(self, item: _JobItem):
+        """
+        Gives up on a job that shutdown keeps from running (again).
+        """
+        self.counters["jobs_dropped"] += 1
+        logger.warning("Session job dropped at shutdown.", session_id=item.session_id, job=item.name,
+                       attempt=item.attempt)
+        await self._give_up(item)
+
+    async def _run_turn(self, actor: _SessionActor):
+        name, handler = actor.mailbox.popitem(last=False)
+        try:
+            more = await handler()
+            actor.attempts.pop(name, None)
+            self.counters["messages_handled"] += 1
+            if more and not self._closed:
+                actor.mailbox.setdefault(name, handler)
+        except Exception:
+            actor.attempts[name] += 1
+            attempt = actor.attempts[name]
+            if attempt >= self.limits.max_attempts or self._closed:
+                actor.attempts.pop(name, None)
+                self.counters["messages_failed"] += 1
+                logger.exception("Session actor message failed; giving up.", session_id=actor.session_id,
+                                 message=name, attempts=attempt)
+            else:
+                delay = self._backoff(attempt)
+                self.counters["messages_retried"] += 1
+                logger.warning("Session actor message failed; retrying.", session_id=actor.session_id,
+                               message=name, attempt=attempt, retry_in_seconds=round(delay, 2), exc_info=True)
+                self._call_later(delay, lambda: self.post(actor.session_id, name, handler))
+        finally:
+            actor.scheduled = False
+            if actor.mailbox:
+                self._schedule(actor)
+            elif not actor.attempts and self._actors.get(actor.session_id) is actor:
+                # Idle actors hold nothing worth keeping.
+                del self._actors[actor.session_id]
+
+    # --- Shutdown and stats ---
+
+    async def close(self):
+        """
+        Stops accepting work, waits up to the drain timeout for queued work to
+        finish, then cancels the workers. Pending retries and delayed messages
+        are dropped. Every job that does not get to finish, whether it waited
+        for a retry, was still queued or was cancelled, has its on_failure run,
+        so its caller can release what it reserved.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for handle in self._timers:
+            handle.cancel()
+        self._timers.clear()
+        delayed_jobs = list(self._delayed_jobs.values())
+        self._delayed_jobs.clear()
+        for item in delayed_jobs:
+            await self._drop_job(item)
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.limits.drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Session worker pool did not drain in time; cancelling.",
+                           queued=self._queue.qsize(), running=self._running)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            self._queue.task_done()
+            if isinstance(item, _JobItem):
+                await self._drop_job(item)
+        logger.info("SessionWorkerPool closed.", **self.counters)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "running": self._running,
+            "queued": self._queue.qsize(),
+            "active_actors": len(self._actors),
+            "pending_timers": len(self._timers),
+            "pending_retries": len(self._delayed_jobs),
+            **self.counters,
+        }
@@ -3,6 +3,7 @@ import structlog
 
 from src.domain.entities import MediaType, VideoFile, ImageFile
 from src.application.services.vision_service import VisionService
+from src.application.services.media_processing_service import MediaProcessingService
 
 # Get a logger instance for this module
 logger = structlog.get_logger(__name__)
@@ -15,7 +16,7 @@ class SceneExtractorStrategy(ABC):
     """
 
     @abstractmethod
-    def extract_scene(self, media: MediaType, prompt: str, model: str) -> str:
+    async def extract_scene(self, media: MediaType, prompt: str, model: str) -> str:
         """
         Extracts a scene description from the given media.
 
@@ -39,7 +40,7 @@ class VideoSceneExtractor(SceneExtractorStrategy):
         self.vision_service = vision_service
         logger.info("VideoSceneExtractor strategy initialized.")
 
-    def extract_scene(self, media: VideoFile, prompt: str, model: str) -> str:
+    async def extract_scene(self, media: VideoFile, prompt: str, model: str) -> str:
         """
         Calls the vision service's analyze_video method.
         """
@@ -48,11 +49,54 @@ class VideoSceneExtractor(SceneExtractorStrategy):
         if not isinstance(media, VideoFile):
             raise TypeError("VideoSceneExtractor can only process VideoFile objects.")
 
-        return self.vision_service.analyze_video(
+        result = await self.vision_service.analyze_video(
             video=media,
             prompt=prompt,
             model_option=model
-        ).text
+        )
+        return result.text
+
+
+class SampledFramesSceneExtractor(SceneExtractorStrategy):
+    """
+    A concrete strategy for extracting a scene description from a video file by
+    decoding it locally and sending a few sampled keyframes inline, which skips
+    the file upload, server-side processing and polling round-trip.
+    """
+
+    def __init__(self, vision_service: VisionService, media_service: MediaProcessingService, frames_preamble: str):
+        self.vision_service = vision_service
+        self.media_service = media_service
+        self.frames_preamble = frames_preamble
+        logger.info("SampledFramesSceneExtractor strategy initialized.")
+
+    async def extract_scene(self, media: VideoFile, prompt: str, model: str) -> str:
+        """
+        Samples keyframes and calls the vision service's analyze_images method.
+        Falls back to uploading the whole clip if it cannot be decoded locally.
+        """
+        logger.info("Executing SampledFramesSceneExtractor strategy.", model=model)
+        # Type checking to ensure the correct media type is passed
+        if not isinstance(media, VideoFile):
+            raise TypeError("SampledFramesSceneExtractor can only process VideoFile objects.")
+
+        try:
+            frames = await self.media_service.sample_video_frames(media)
+        except Exception:
+            logger.warning("Could not sample frames from clip. Falling back to upload.", exc_info=True)
+            result = await self.vision_service.analyze_video(
+                video=media,
+                prompt=prompt,
+                model_option=model
+            )
+            return result.text
+
+        result = await self.vision_service.analyze_images(
+            images=frames,
+            prompt=f"{self.frames_preamble}\n{prompt}",
+            model_option=model
+        )
+        return result.text
 
 
 class FrameSceneExtractor(SceneExtractorStrategy):
@@ -64,7 +108,7 @@ class FrameSceneExtractor(SceneExtractorStrategy):
         self.vision_service = vision_service
         logger.info("FrameSceneExtractor strategy initialized.")
 
-    def extract_scene(self, media: ImageFile, prompt: str, model: str) -> str:
+    async def extract_scene(self, media: ImageFile, prompt: str, model: str) -> str:
         """
         Calls the vision service's analyze_image method.
         """
@@ -73,8 +117,9 @@ class FrameSceneExtractor(SceneExtractorStrategy):
         if not isinstance(media, ImageFile):
             raise TypeError("FrameSceneExtractor can only process ImageFile objects.")
 
-        return self.vision_service.analyze_image(
+        result = await self.vision_service.analyze_image(
             image=media,
             prompt=prompt,
             model_option=model
-        ).text
+        )
+        return result.text
@@ -1,30 +1,57 @@
+import json
 import time
 import structlog
+from typing import Optional
 from fastapi import BackgroundTasks
 from src.application.services.dataset_service import DatasetService
 from src.domain.entities import VQARequest, VQAResult
 from src.application.services.vision_service import VisionService
 from src.application.services.storage_service import StorageService
 from src.application.services.prompt_service import PromptService
+from src.application.services.media_processing_service import MediaProcessingService
 
 logger = structlog.get_logger(__name__)
 
+# Object extraction modes, configured under 'objects_extractor' in models.yaml
+OBJECT_EXTRACTION_COMBINED = "combined"
+OBJECT_EXTRACTION_SEPARATE = "separate"
+
+# Response schema for the combined call: the user-facing answer plus the dataset's object list.
+ANSWER_WITH_OBJECTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "answer": {"type": "string"},
+        "objects": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["answer", "objects"],
+}
+
 class VQAUseCase:
     """
     Orchestrates the VQA process.
     """
-    def __init__(self, vision_service: VisionService, storage_service: StorageService, dataset_service: DatasetService, prompt_service: PromptService):
+    def __init__(
+            self,
+            vision_service: VisionService,
+            storage_service: StorageService,
+            dataset_service: DatasetService,
+            prompt_service: PromptService,
+            media_service: MediaProcessingService,
+            object_extraction_mode: str = OBJECT_EXTRACTION_SEPARATE
+    ):
         self.vision_service = vision_service
         self.storage_service = storage_service
         self.dataset_service = dataset_service
         self.prompt_service = prompt_service
+        self.media_service = media_service
+        self.object_extraction_mode = object_extraction_mode
 
     async def execute(self, request: VQARequest, background_tasks: BackgroundTasks) -> VQAResult:
         logger.info("VQAUseCase started.")
         start_time = time.time()
 
         try:
-            analyzed_path = self.storage_service.save_file(
+            analyzed_path = await self.storage_service.save_file_async(
                 file_bytes=request.image.content,
                 original_filename=request.image.filename,
                 prefix="vqa"
@@ -45,19 +72,26 @@ class VQAUseCase:
             )
 
 
+            # The original upload is stored; the model gets a normalized copy.
+            model_image = await self.media_service.normalize_image(request.image, feature="vqa")
+
             logger.info("Calling vision service for VQA analysis.", model_option=request.model_option)
 
-            analysis_result = self.vision_service.analyze_image(
-                image=request.image,
-                prompt=prompt,
-                model_option=request.model_option
-            )
+            if self.object_extraction_mode == OBJECT_EXTRACTION_COMBINED:
+                answer, object_list = await self._answer_with_objects(model_image, prompt, request.model_option)
+            else:
+                analysis_result = await self.vision_service.analyze_image(
+                    image=model_image,
+                    prompt=prompt,
+                    model_option=request.model_option
+                )
+                answer, object_list = analysis_result.text, None
             logger.info("Successfully received analysis from vision service.")
 
             total_processing_time = round(time.time() - start_time, 2)
 
             result = VQAResult(
-                answer=analysis_result.text,
+                answer=answer,
                 processing_time=total_processing_time,
                 analyzed_path=analyzed_path
             )
@@ -69,12 +103,11 @@ class VQAUseCase:
                 self.dataset_service.log_request_for_dataset,
                 user_id=request.user_id,
                 file_path=analyzed_path,
-                image=request.image,
-                vision_service=self.vision_service,
                 question=request.question,
                 answer=result.answer,
                 model_name=request.model_option,
-                mode=request.mode
+                mode=request.mode,
+                object_list=object_list
 
             )
             logger.info("Record saved!")
@@ -83,4 +116,24 @@ class VQAUseCase:
 
         except Exception as e:
             logger.exception("An error occurred during VQAUseCase execution.")
-            raise
\ No newline at end of file
+            raise
+
+    async def _answer_with_objects(self, image, prompt: str, model_option: str) -> tuple[str, Optional[list[str]]]:
+        """
+        Gets the answer and the dataset's object list from a single structured call.
+        If the reply cannot be parsed, the raw text is used as the answer and the
+        object list is left to the deferred object extraction job.
+        """
+        structured_prompt = f"{prompt}\n{self.prompt_service.get('vqa.structured_output_instructions')}"
+        analysis_result = await self.vision_service.analyze_image_structured(
+            image=image,
+            prompt=structured_prompt,
+            model_option=model_option,
+            response_schema=ANSWER_WITH_OBJECTS_SCHEMA
+        )
+        try:
+            payload = json.loads(analysis_result.text)
+            return payload["answer"], [str(item) for item in payload["objects"]]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Could not parse structured VQA response. Leaving object extraction to the worker.")
+            return analysis_result.text, None
@@ -9,7 +9,12 @@ from .live_session import (
     SessionCreationResult,
     SessionQueryResult,
     SessionState,
+    SessionStatus,
     SessionAnalysVideoRequest,
     MediaType,
+    TimelineEvent,
+    InFlightCapture,
+    NarrativeSegment,
+    NarrativeSnapshot,
 )
 from .documents import *
\ No newline at end of file
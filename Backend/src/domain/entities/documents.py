@@ -3,6 +3,7 @@
 from beanie import Document
 from pydantic import Field
 from typing import Optional
+from datetime import datetime, timezone
 import uuid
 import enum  # Import enum
 
@@ -13,6 +14,14 @@ class AnalysisMode(str, enum.Enum):
     THOROUGH = "thorough"
 
 
+# Lifecycle of the deferred object extraction for a logged request
+class ObjectExtractionStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class RequestLog(Document):
     """
     A unified document to log every VQA request for dataset creation.
@@ -24,7 +33,15 @@ class RequestLog(Document):
     file_path: str = Field(..., description="The path to the saved media file.")
     question: Optional[str] = Field(None, description="The question asked by the user (for VQA).")
     answer: str = Field(..., description="The generated answer or extracted text.")
-    list_of_objects: list[str] = Field(..., description="A list of objects detected in the media.")
+    list_of_objects: list[str] = Field(default_factory=list, description="A list of objects detected in the media.")
+    object_extraction_status: ObjectExtractionStatus = Field(
+        ObjectExtractionStatus.PENDING, description="Whether the object list has been extracted yet."
+    )
+    object_extraction_attempts: int = Field(0, description="How many times object extraction has failed.")
+    claimed_at: Optional[datetime] = Field(None, description="When a worker last claimed this log for extraction.")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Settings:
-        name = "request_logs"
\ No newline at end of file
+        name = "request_logs"
+        # The extraction worker scans by status.
+        indexes = ["object_extraction_status"]
\ No newline at end of file
@@ -1,6 +1,8 @@
 # In src/domain/entities/live_session.py
-from pydantic import BaseModel
-from typing import List, Union
+import time
+import uuid
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
 
 from .documents import AnalysisMode
 from .video import VideoFile
@@ -15,6 +17,9 @@ class SessionQueryRequest(BaseModel):
     question: str
     model_option: str
     mode: AnalysisMode
+    # Read-your-writes: wait up to wait_seconds for the narrative to reach this version.
+    min_version: Optional[int] = None
+    wait_seconds: float = 0.0
 
 # OUTPUT for the /start endpoint
 class SessionCreationResult(BaseModel):
@@ -24,13 +29,74 @@ class SessionCreationResult(BaseModel):
 class SessionQueryResult(BaseModel):
     session_id: str
     answer: str
+    narrative_version: int = 0 # The narrative version the answer is based on
+    stale: bool = False # True if min_version was not reached before the deadline
+    cached: bool = False # True if the answer was reused for a repeated question at the same version
+
+# A scene description on the session timeline
+class TimelineEvent(BaseModel):
+    text: str
+    timestamp: float # When the frame or clip was received (epoch seconds)
+    order_key: Optional[float] = None # Capture order: the client's sequence number or capture time
+
+    @property
+    def sort_key(self) -> float:
+        return self.timestamp if self.order_key is None else self.order_key
+
+# A frame or clip whose scene is still being extracted
+class InFlightCapture(BaseModel):
+    capture_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    order_key: float
+    submitted_at: float
+    started_at: Optional[float] = None # None while it waits for a worker
+    frame_hash: Optional[int] = None # Perceptual hash of a frame, remembered for dedup while it is in flight
+
+# Older events of the timeline, compacted into a summary
+class NarrativeSegment(BaseModel):
+    text: str
+    start_time: float
+    end_time: float
+    event_count: int
+    level: int = 0 # 0 summarizes events; higher levels merge older summaries
 
 # Internal model for storing session state
 class SessionState(BaseModel):
     session_id: str
-    pending_descriptions: List[str] = []
-    current_narrative: str = "The scene has just begun. This is the first item to analys."
-    is_aggregator_running: bool = False
+    revision: int = 0 # Bumped on every write; used for compare-and-set in the session store
+    narrative_version: int = 0 # Bumped whenever a description is added or the timeline is compacted
+    started_at: float = Field(default_factory=time.time)
+    in_flight: List[InFlightCapture] = [] # Submitted, not yet described
+    pending_descriptions: List[TimelineEvent] = [] # Extracted, waiting for earlier captures
+    recent_events: List[TimelineEvent] = [] # Kept verbatim, oldest first
+    narrative_segments: List[NarrativeSegment] = [] # Compacted history, oldest first
+    recent_frame_hashes: List[int] = [] # Perceptual hashes of the last analyzed frames
+    deduplicated_frames: int = 0
+    dropped_frames: int = 0 # Waiting captures dropped to make room for newer ones
+    order_domain: Optional[str] = None # 'sequence' or 'time', set by the first capture
+    extraction_seconds_avg: Optional[float] = None # Moving average of one extraction's duration
+    completion_interval_avg: Optional[float] = None # Moving average of the time between finished extractions
+    last_completed_at: Optional[float] = None
+
+# OUTPUT for the /{session_id}/narrative endpoints
+class NarrativeSnapshot(BaseModel):
+    session_id: str
+    narrative_version: int
+    narrative_segments: List[NarrativeSegment]
+    recent_events: List[TimelineEvent] # Including descriptions still waiting for earlier captures
+    in_flight: int # Captures whose descriptions are still to come
+
+# OUTPUT for the /{session_id}/status endpoint, also sent with frame and clip responses
+class SessionStatus(BaseModel):
+    session_id: str
+    narrative_version: int
+    in_flight: int # Captures submitted and not yet described
+    queued: int # Of those, captures still waiting for a worker
+    pending_descriptions: int # Descriptions waiting for earlier captures
+    extraction_lag_seconds: float # Age of the oldest capture in flight
+    extraction_seconds_avg: Optional[float]
+    recommended_capture_interval_seconds: float
+    deduplicated_frames: int
+    dropped_frames: int
 
 # INPUT for the /process-clip, /process-frame endpoints
 class SessionAnalysVideoRequest(BaseModel):
@@ -38,3 +104,20 @@ class SessionAnalysVideoRequest(BaseModel):
     analysis_model_option: str # The analysis model
     aggregation_model_option: str # The aggregator model
     media: MediaType # Might be a frame or a video
+    received_at: float = Field(default_factory=time.time)
+    # Optional capture order from the client. Descriptions reach the timeline in
+    # this order; without either, the order the server received them in is used.
+    # Sequence numbers and times cannot be compared, so a session's first
+    # capture decides which of the two all of its captures are ordered by.
+    sequence: Optional[int] = None
+    captured_at: Optional[float] = None
+
+    @property
+    def order_domain(self) -> str:
+        return "sequence" if self.sequence is not None else "time"
+
+    @property
+    def order_key(self) -> float:
+        if self.sequence is not None:
+            return float(self.sequence)
+        return self.received_at if self.captured_at is None else self.captured_at
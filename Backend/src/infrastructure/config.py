@@ -41,11 +41,115 @@ class Settings(BaseSettings):
     # --- Model Settings ---
     # The timeout in seconds for API calls to the vision model.
     model_timeout_seconds: int = 120
+    # Which VisionService backs the API: 'gemini', or 'fake' for the offline
+    # stand-in configured by fake_vision_config_path (load tests, local runs).
+    vision_backend: str = "gemini"
+    fake_vision_config_path: str = "configs/fake_vision.yaml"
+
+    # --- Video Processing Settings ---
+    # After a video is uploaded, its processing state is polled starting at the
+    # initial interval and doubling up to the maximum interval.
+    video_poll_initial_seconds: float = 0.5
+    video_poll_max_seconds: float = 4.0
+    # The longest time to wait for an uploaded video to finish processing.
+    video_processing_deadline_seconds: float = 120.0
+
+    # --- Live Session Settings ---
+    # A frame whose perceptual hash is within this Hamming distance (out of 64 bits)
+    # of a recently analyzed frame is skipped as a duplicate. Set to -1 to disable.
+    frame_dedup_max_distance: int = 6
+    # How many recently analyzed frames each session compares against.
+    frame_dedup_history: int = 1
+    # The session narrative is a timeline: recent events verbatim, older ones
+    # compacted into summary segments in the background. Budgets are in tokens.
+    # Recent events beyond this budget are compacted.
+    narrative_recent_token_budget: int = 1500
+    # One compaction call folds in up to roughly this many tokens of events.
+    aggregator_batch_token_budget: int = 2000
+    # Above this many summary segments, the two oldest are merged.
+    narrative_max_segments: int = 6
+    # The most timeline tokens sent with a session question.
+    narrative_prompt_token_budget: int = 3000
+    # Session questions also get the best-matching descriptions from the whole
+    # session (BM25 over every description), up to this many and this many tokens.
+    session_retrieval_top_k: int = 5
+    session_retrieval_token_budget: int = 800
+
+    # --- Session Store Settings ---
+    # Where live-session state is kept: 'memory' (this process only) or 'sqlite'
+    # (a WAL-mode database shared by all workers on the host, at session_store_path).
+    # Use 'sqlite' when running uvicorn with more than one worker.
+    session_store_backend: str = "memory"
+    session_store_path: str = "storage/sessions.db"
+    # Sessions without a frame, clip or query for this long are removed.
+    session_idle_ttl_seconds: float = 30 * 60
+    # Above either cap, the least recently active sessions are removed first.
+    session_max_count: int = 1000
+    session_max_bytes: int = 256 * 1024 * 1024
+    # How often the background reaper applies the limits above.
+    session_reaper_interval_seconds: float = 30.0
+    # Scene extraction and compaction run on a pool of this many asyncio workers,
+    # shared by all sessions. Compaction is serialized per session.
+    session_worker_concurrency: int = 8
+    # Failed work is tried this many times in total, backing off exponentially.
+    session_job_max_attempts: int = 3
+    session_job_retry_base_seconds: float = 0.5
+    session_job_retry_max_seconds: float = 8.0
+    # On shutdown, queued session work gets this long to finish.
+    session_worker_drain_seconds: float = 10.0
+    # Scene extraction runs in parallel, but descriptions join the timeline in
+    # capture order. One waits at most this long for an earlier, slower capture.
+    session_reorder_max_wait_seconds: float = 5.0
+    # Backpressure: a session has at most this many frames and clips in flight.
+    # Above it, the oldest one still waiting for a worker is dropped; if all are
+    # being extracted, the new one is rejected with 429.
+    session_max_in_flight: int = 6
+    # Clients are told to capture no faster or slower than these intervals.
+    session_min_capture_interval_seconds: float = 0.5
+    session_max_capture_interval_seconds: float = 10.0
+    # Narrative long-polls, SSE streams and queries with min_version wait at most
+    # this long. Changes made by other worker processes are noticed by re-reading
+    # the session store at the poll interval.
+    session_wait_max_seconds: float = 30.0
+    session_version_poll_seconds: float = 0.5
+    # Answers to repeated questions are reused while the session's narrative is
+    # unchanged; each session keeps at most this many.
+    session_answer_cache_entries: int = 32
+    # WebSocket frame streams: each connection keeps at most this many frames in
+    # extraction and buffers this many more; when the buffer is full, the oldest
+    # waiting frame is dropped. New descriptions are pushed at this interval.
+    session_stream_max_in_flight: int = 4
+    session_stream_buffer_frames: int = 2
+    session_stream_update_interval_seconds: float = 1.0
 
     # --- Storage Settings ---
     # The base directory where all media files will be stored.
     storage_dir: str = "storage"
+    # 'flat' stores each upload under '{storage_dir}/{prefix}/' with a timestamped
+    # name. 'content_addressed' names files by content hash, shards them under
+    # '{storage_dir}/blobs/' (one directory level per two hex digits, up to the
+    # shard depth) and stores identical uploads once. Each save gets its own key
+    # (e.g. 'vqa/vqa_{time}_{id}.jpg'), mapped to its blob in
+    # '{storage_dir}/index.sqlite3'; read_file takes that key.
+    storage_layout: str = "flat"
+    storage_shard_depth: int = 2
+    # Uploaded media is written behind the request: the path is returned at once
+    # and a few writer tasks persist it. At most this many files wait in memory;
+    # on shutdown, they get the drain time to reach the disk.
+    storage_write_behind_enabled: bool = True
+    storage_write_buffer_files: int = 64
+    storage_writers: int = 2
+    storage_write_drain_seconds: float = 10.0
 
+    # --- Analysis Cache Settings ---
+    # Identical image analyses (same image bytes, prompt and model) are served from this cache.
+    analysis_cache_enabled: bool = True
+    # The memory budget for cached results, in bytes.
+    analysis_cache_max_bytes: int = 32 * 1024 * 1024
+    # When enabled, results are also persisted under '{storage_dir}/analysis_cache'.
+    analysis_cache_disk_enabled: bool = False
+    # Cached results older than this are treated as misses.
+    analysis_cache_ttl_seconds: int = 24 * 60 * 60
 
     # --- NEW: MongoDB Settings ---
     mongodb_uri: str = "mongodb://localhost:27017"
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from src.domain.entities import AnalysisResult
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class AnalysisCache:
+    """
+    A content-addressed cache for model analysis results.
+
+    Results live in an in-memory LRU bounded by a byte budget, with an optional
+    on-disk tier for results that should survive restarts. Concurrent requests
+    for the same key are coalesced so that only one upstream call is made.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: int, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        # key -> (result, size in bytes, stored_at)
+        self._entries: "OrderedDict[str, Tuple[AnalysisResult, int, float]]" = OrderedDict()
+        self._current_bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Counters reported through stats()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        logger.info(
+            "AnalysisCache initialized.",
+            max_bytes=self.max_bytes,
+            disk_dir=str(self.disk_dir) if self.disk_dir else None
+        )
+
+    @staticmethod
+    def make_key(content: bytes, prompt: str, model_option: str) -> str:
+        """
+        Builds the cache key from the sha256 of the media, the rendered prompt and the model.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        return hashlib.sha256(f"{content_hash}\0{model_option}\0{prompt}".encode("utf-8")).hexdigest()
+
+    # --- Memory tier ---
+
+    def _get_memory(self, key: str) -> Optional[AnalysisResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, size, stored_at = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            self._remove_memory(key)
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _put_memory(self, key: str, result: AnalysisResult, stored_at: float):
+        size = len(key) + len(result.text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._remove_memory(key)
+        self._entries[key] = (result, size, stored_at)
+        self._current_bytes += size
+        while self._current_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._current_bytes -= evicted_size
+
+    def _remove_memory(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._current_bytes -= entry[1]
+
+    # --- Disk tier ---
+
+    def _disk_path(self, key: str) -> Path:
+        # Shard by the first two hex characters to keep directories small.
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[AnalysisResult, float]]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Discarding unreadable analysis cache file.", path=str(path))
+            return None
+        stored_at = payload.get("stored_at", 0)
+        if time.time() - stored_at > self.ttl_seconds:
+            return None
+        return AnalysisResult(**payload["result"]), stored_at
+
+    def _write_disk(self, key: str, result: AnalysisResult, stored_at: float):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "result": result.model_dump()}, f)
+            # Atomic rename so readers never see a partially written file.
+            os.replace(temp_path, path)
+        except OSError:
+            logger.exception("Failed to write analysis cache file.", path=str(path))
+
+    # --- Public API ---
+
+    async def get_or_compute(
+            self,
+            key: str,
+            compute: Callable[[], Awaitable[AnalysisResult]]
+    ) -> AnalysisResult:
+        """
+        Returns the cached result for the key, or runs `compute` to produce it.
+        If another request is already computing the same key, waits for its result
+        instead of making a second upstream call. Failures are never cached.
+        """
+        cached = self._get_memory(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        while key in self._in_flight:
+            leader = self._in_flight[key]
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise
+                # The leading request went away before finishing; try again.
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved so unobserved ones don't produce warnings.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            result = None
+            if self.disk_dir:
+                from_disk = await asyncio.to_thread(self._read_disk, key)
+                if from_disk is not None:
+                    self.disk_hits += 1
+                    result, stored_at = from_disk
+                    self._put_memory(key, result, stored_at)
+
+            if result is None:
+                self.misses += 1
+                result = await compute()
+                stored_at = time.time()
+                self._put_memory(key, result, stored_at)
+                if self.disk_dir:
+                    await asyncio.to_thread(self._write_disk, key, result, stored_at)
+
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+        }
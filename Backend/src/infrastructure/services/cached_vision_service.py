@@ -0,0 +1,83 @@
+import json
+import structlog
+
+from src.application.services.vision_service import VisionService
+from src.domain.entities import AnalysisResult, ImageFile, VideoFile
+from src.infrastructure.services.analysis_cache import AnalysisCache
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class CachedVisionService(VisionService):
+    """
+    A VisionService decorator that serves repeated image analyses from an
+    AnalysisCache and delegates everything else to the wrapped service.
+    """
+
+    def __init__(self, inner: VisionService, cache: AnalysisCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def analyze_image(
+            self,
+            image: ImageFile,
+            prompt: str,
+            model_option: str
+    ) -> AnalysisResult:
+        """
+        Returns the cached analysis for this exact image, prompt and model if there is one.
+        """
+        key = AnalysisCache.make_key(image.content, prompt, model_option)
+        return await self.cache.get_or_compute(
+            key,
+            lambda: self.inner.analyze_image(image=image, prompt=prompt, model_option=model_option)
+        )
+
+    async def analyze_image_structured(
+            self,
+            image: ImageFile,
+            prompt: str,
+            model_option: str,
+            response_schema: dict
+    ) -> AnalysisResult:
+        """
+        Same as analyze_image, with the response schema made part of the key.
+        """
+        schema_key = json.dumps(response_schema, sort_keys=True)
+        key = AnalysisCache.make_key(image.content, f"{prompt}\0{schema_key}", model_option)
+        return await self.cache.get_or_compute(
+            key,
+            lambda: self.inner.analyze_image_structured(
+                image=image,
+                prompt=prompt,
+                model_option=model_option,
+                response_schema=response_schema
+            )
+        )
+
+    async def analyze_images(
+            self,
+            images: list[ImageFile],
+            prompt: str,
+            model_option: str
+    ) -> AnalysisResult:
+        return await self.inner.analyze_images(images=images, prompt=prompt, model_option=model_option)
+
+    async def analyze_video(
+            self,
+            video: VideoFile,
+            prompt: str,
+            model_option: str
+    ) -> AnalysisResult:
+        return await self.inner.analyze_video(video=video, prompt=prompt, model_option=model_option)
+
+    async def analyze_text(
+            self,
+            prompt: str,
+            model_option: str
+    ) -> AnalysisResult:
+        return await self.inner.analyze_text(prompt=prompt, model_option=model_option)
+
+    async def get_object_list(self, image: ImageFile) -> list[str]:
+        return await self.inner.get_object_list(image)
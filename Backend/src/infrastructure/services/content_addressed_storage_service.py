@@ -0,0 +1,150 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from src.infrastructure.services.local_storage_service import LocalStorageService
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stored_files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prefix TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    deduplicated INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stored_files_blob ON stored_files (blob);
+"""
+
+# Added after the first version of the index; existing indexes are migrated on open.
+_SAVE_KEY_COLUMN = "save_key"
+
+
+class ContentAddressedStorageService(LocalStorageService):
+    """
+    A LocalStorageService that names files by the sha256 of their content and
+    shards them into nested directories, e.g. '{base}/blobs/3f/a2/3fa2...e1.jpg'.
+
+    Directories stay small at any number of files, and an upload identical to
+    a stored one is not written again. Each save still gets its own key, e.g.
+    'vqa/vqa_20250101_120000_1a2b3c4d.jpg', which is what callers store (such
+    as the request log's file path) and pass to read_file. A small SQLite
+    index under the base directory maps every key to its blob, along with the
+    prefix, original filename and whether the save was a duplicate.
+    """
+
+    def __init__(self, base_storage_dir: str, shard_depth: int = 2, busy_timeout_ms: int = 5000):
+        super().__init__(base_storage_dir)
+        self.blob_dir = self.base_storage_dir / "blobs"
+        self.shard_depth = shard_depth
+        self.index_path = self.base_storage_dir / "index.sqlite3"
+        self.base_storage_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.index_path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(stored_files)")}
+        if _SAVE_KEY_COLUMN not in columns:
+            self._connection.execute(f"ALTER TABLE stored_files ADD COLUMN {_SAVE_KEY_COLUMN} TEXT")
+        self._connection.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS stored_files_save_key ON stored_files ({_SAVE_KEY_COLUMN})"
+        )
+        # One connection per process, shared by the writer threads.
+        self._lock = threading.Lock()
+        self.counters: Counter = Counter()
+        logger.info("ContentAddressedStorageService initialized.", blob_dir=str(self.blob_dir),
+                    shard_depth=shard_depth, index=str(self.index_path))
+
+    def new_path(self, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        """
+        The key of a new save: the prefix and a unique, flat-layout style file
+        name. No hashing happens here, so naming stays off the request path.
+        """
+        return f"{prefix}/{self._new_filename(original_filename, prefix)}"
+
+    def blob_path_for(self, file_bytes: bytes, original_filename: str) -> Path:
+        """
+        The blob path for the content: one directory level per two hex digits
+        of the hash, up to the shard depth. The original extension is kept so
+        the media type can still be told from the name.
+        """
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        file_ext = os.path.splitext(Path(original_filename).name)[1].lower()
+        shards = [digest[2 * level:2 * level + 2] for level in range(self.shard_depth)]
+        return self.blob_dir.joinpath(*shards, f"{digest}{file_ext}")
+
+    def write_file(self, path: str, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        """
+        Writes the blob unless it is already stored, then records the save
+        under its key and returns the key. The blob is written to a temporary
+        name and renamed into place, so concurrent saves of the same content
+        each replace it with identical bytes and never expose a partial file.
+        """
+        target = self.blob_path_for(file_bytes, original_filename)
+        deduplicated = target.exists()
+        if not deduplicated:
+            self._ensure_dir(target.parent)
+            temporary = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                with open(temporary, "wb") as buffer:
+                    buffer.write(file_bytes)
+                os.replace(temporary, target)
+            except OSError:
+                temporary.unlink(missing_ok=True)
+                raise
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO stored_files ({_SAVE_KEY_COLUMN}, prefix, original_filename, blob, size_bytes,"
+                " deduplicated, stored_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, prefix, Path(original_filename).name, target.relative_to(self.blob_dir).as_posix(),
+                 len(file_bytes), int(deduplicated), time.time())
+            )
+            if deduplicated:
+                self.counters["deduplicated"] += 1
+                self.counters["bytes_deduplicated"] += len(file_bytes)
+            else:
+                self.counters["blobs_written"] += 1
+        return path
+
+    def blob_path(self, path: str) -> Optional[str]:
+        """
+        The blob a save key refers to, or None if no such save was recorded.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT blob FROM stored_files WHERE {_SAVE_KEY_COLUMN} = ?", (path,)
+            ).fetchone()
+        return str(self.blob_dir / row[0]) if row is not None else None
+
+    def read_file(self, path: str) -> bytes:
+        """
+        Reads a save by its key. Blob paths, which earlier saves returned, are
+        read directly.
+        """
+        blob = self.blob_path(path)
+        if blob is None:
+            if not Path(path).is_relative_to(self.blob_dir):
+                raise FileNotFoundError(f"No stored file for '{path}'.")
+            blob = path
+        return super().read_file(blob)
+
+    async def close(self):
+        with self._lock:
+            self._connection.close()
+        logger.info("ContentAddressedStorageService closed.", **self.counters)
+
+    def stats(self) -> dict:
+        return {"layout": "content_addressed", **self.counters}
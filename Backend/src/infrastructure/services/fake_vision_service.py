@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from typing import Optional
+
+import structlog
+import yaml
+from fastapi import HTTPException
+
+from src.application.services.vision_service import VisionService
+from src.domain.entities import AnalysisResult, ImageFile, VideoFile
+from src.infrastructure.services.model_scheduler import ModelScheduler
+
+logger = structlog.get_logger(__name__)
+
+
+class FakeVisionService(VisionService):
+    """
+    An offline implementation of the VisionService for load tests and local runs.
+
+    Answers are canned and deterministic, latencies are drawn from per-model
+    distributions and errors (timeouts, 429s, 5xx) are injected at configured
+    rates. Calls still pass through the model scheduler, so concurrency and RPM
+    limits behave as they would against Gemini. See configs/fake_vision.yaml.
+    """
+
+    def __init__(self, config: dict, scheduler: ModelScheduler, models_config: Optional[dict] = None):
+        self.config = config or {}
+        self.scheduler = scheduler
+        self.models_config = models_config or {}
+        self._random = random.Random(self.config.get("seed"))
+        self._latency = self.config.get("latency", {})
+        self._errors = self.config.get("errors", {})
+        self._responses = self.config.get("responses", {})
+        # Counters keyed by "method:model" and by "kind:model".
+        self.call_counts: Counter = Counter()
+        self.error_counts: Counter = Counter()
+        logger.info("FakeVisionService initialized.", seed=self.config.get("seed"))
+
+    @classmethod
+    def from_file(cls, path: str, scheduler: ModelScheduler, models_config: Optional[dict] = None) -> "FakeVisionService":
+        with open(path, "r") as f:
+            return cls(config=yaml.safe_load(f), scheduler=scheduler, models_config=models_config)
+
+    # --- VisionService ---
+
+    async def analyze_image(self, image: ImageFile, prompt: str, model_option: str) -> AnalysisResult:
+        return await self._analyze_images("analyze_image", [image], prompt, model_option)
+
+    async def analyze_images(self, images: list[ImageFile], prompt: str, model_option: str) -> AnalysisResult:
+        return await self._analyze_images("analyze_images", images, prompt, model_option)
+
+    async def analyze_image_structured(
+            self,
+            image: ImageFile,
+            prompt: str,
+            model_option: str,
+            response_schema: dict
+    ) -> AnalysisResult:
+        seed = self._content_seed(prompt, image.content)
+        text = json.dumps(self._value_for_schema(response_schema, seed))
+        return await self._call("analyze_image_structured", model_option, text)
+
+    async def analyze_video(self, video: VideoFile, prompt: str, model_option: str) -> AnalysisResult:
+        seed = self._content_seed(prompt, video.content)
+        return await self._call(
+            "analyze_video",
+            model_option,
+            self._render("video", seed),
+            extra_ms=self._latency.get("video_overhead_ms", 0)
+        )
+
+    async def analyze_text(self, prompt: str, model_option: str) -> AnalysisResult:
+        seed = self._content_seed(prompt)
+        return await self._call("analyze_text", model_option, self._render("text", seed))
+
+    async def get_object_list(self, image: ImageFile) -> list[str]:
+        models = self.models_config.get("objects_extractor", {}).get("models") or ["fake-objects-extractor"]
+        result = await self._call("get_object_list", models[0], json.dumps(self._objects()))
+        return json.loads(result.text)
+
+    # --- Stats ---
+
+    def stats(self) -> dict:
+        return {
+            "calls": dict(self.call_counts),
+            "errors": dict(self.error_counts),
+        }
+
+    # --- Simulation ---
+
+    async def _analyze_images(self, method: str, images: list[ImageFile], prompt: str, model: str) -> AnalysisResult:
+        # Shared by both image methods; each counts its calls under its own name.
+        seed = self._content_seed(prompt, *(image.content for image in images))
+        return await self._call(method, model, self._render("image", seed))
+
+    async def _call(self, method: str, model: str, text: str, extra_ms: float = 0) -> AnalysisResult:
+        self.call_counts[f"{method}:{model}"] += 1
+        async with self.scheduler.slot(model):
+            start_time = time.time()
+            failure = self._draw_failure()
+
+            if failure == "rate_limit":
+                self.error_counts[f"rate_limit:{model}"] += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="The AI model's rate limit was exceeded. Please try again.",
+                    headers={"Retry-After": "1"}
+                )
+            if failure == "timeout":
+                await asyncio.sleep(self._errors.get("timeout_after_ms", 10000) / 1000)
+                self.error_counts[f"timeout:{model}"] += 1
+                raise HTTPException(status_code=504, detail="The request to the AI model timed out. Please try again.")
+
+            await asyncio.sleep((self._sample_latency_ms(model) + extra_ms) / 1000)
+
+            if failure == "server_error":
+                self.error_counts[f"server_error:{model}"] += 1
+                raise HTTPException(status_code=503, detail="The AI model is temporarily unavailable.")
+
+        return AnalysisResult(text=text, processing_time=round(time.time() - start_time, 2))
+
+    def _draw_failure(self) -> Optional[str]:
+        roll = self._random.random()
+        for kind, key in (("timeout", "timeout_rate"), ("rate_limit", "rate_limit_rate"), ("server_error", "server_error_rate")):
+            rate = self._errors.get(key, 0.0)
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def _sample_latency_ms(self, model: str) -> float:
+        spec = self._latency.get("models", {}).get(model) or self._latency.get("default", {})
+        distribution = spec.get("distribution", "fixed")
+
+        if distribution == "uniform":
+            sample = self._random.uniform(spec.get("min_ms", 0), spec.get("max_ms", 0))
+        elif distribution == "lognormal":
+            sample = self._random.lognormvariate(math.log(spec.get("median_ms", 1000)), spec.get("sigma", 0.5))
+            if self._random.random() < spec.get("tail_probability", 0.0):
+                sample *= spec.get("tail_multiplier", 1.0)
+        else:
+            sample = spec.get("ms", 0)
+
+        if "max_ms" in spec:
+            sample = min(sample, spec["max_ms"])
+        return max(0.0, sample)
+
+    # --- Canned responses ---
+
+    @staticmethod
+    def _content_seed(*parts) -> int:
+        digest = hashlib.blake2b(digest_size=4)
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        return int.from_bytes(digest.digest(), "big") % 1000
+
+    def _render(self, kind: str, seed: int) -> str:
+        return self._responses.get(kind, "Fake {kind} response #{n}.").format(kind=kind, n=seed)
+
+    def _objects(self) -> list[str]:
+        return list(self._responses.get("objects", []))
+
+    def _value_for_schema(self, schema: dict, seed: int):
+        """
+        Builds a value that satisfies an OpenAPI-style schema, using the canned
+        responses for strings and the canned objects for string arrays.
+        """
+        schema_type = schema.get("type")
+        if schema_type == "object":
+            return {
+                name: self._value_for_schema(sub_schema, seed)
+                for name, sub_schema in schema.get("properties", {}).items()
+            }
+        if schema_type == "array":
+            if schema.get("items", {}).get("type") == "string":
+                return self._objects()
+            return [self._value_for_schema(schema.get("items", {}), seed)]
+        if schema_type in ("integer", "number"):
+            return seed
+        if schema_type == "boolean":
+            return True
+        return self._render("image", seed)
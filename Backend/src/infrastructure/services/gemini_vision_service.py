@@ -3,9 +3,7 @@ import time
 import asyncio
 import structlog
 import io
-import os
-import tempfile
-from PIL import Image
+from typing import Optional
 from fastapi import HTTPException
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
@@ -13,26 +11,55 @@ from src.application.services.vision_service import VisionService
 from src.domain.entities import AnalysisResult
 from src.domain.entities import VideoFile, ImageFile
 from src.infrastructure.prompt_loader import prompt_loader
+from src.infrastructure.services.model_scheduler import ModelScheduler
 
 logger = structlog.get_logger(__name__)
 
+# Remote-file cleanup tasks that are still running.
+_cleanup_tasks: set = set()
+
+# Response schema for object extraction: a plain list of object descriptions.
+OBJECT_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
 class GeminiVisionService(VisionService):
     """
     A concrete implementation of the VisionService that uses the Google Gemini API.
     """
 
-    def __init__(self, timeout: int, models_config: dict):
+    def __init__(
+            self,
+            timeout: int,
+            models_config: dict,
+            scheduler: ModelScheduler,
+            video_poll_initial_seconds: float = 0.5,
+            video_poll_max_seconds: float = 4.0,
+            video_processing_deadline_seconds: float = 120.0
+    ):
         """
         Initializes the Gemini Vision Service.
         Configures the genai library with an API key if provided.
+        Every model call waits for a slot from the shared scheduler first.
         """
         #if api_key:
         #    genai.configure(api_key=api_key)
         self.timeout = timeout
         self.models_config = models_config
+        self.scheduler = scheduler
+        self.video_poll_initial_seconds = video_poll_initial_seconds
+        self.video_poll_max_seconds = video_poll_max_seconds
+        self.video_processing_deadline_seconds = video_processing_deadline_seconds
+        # GenerativeModel handles are reused across calls instead of rebuilt per request.
+        self._models: dict[str, genai.GenerativeModel] = {}
         logger.info("GeminiVisionService initialized.", timeout=self.timeout)
 
-    def analyze_image(
+    def _get_model(self, model_name: str) -> genai.GenerativeModel:
+        model = self._models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._models[model_name] = model
+        return model
+
+    async def analyze_image(
             self,
             image: ImageFile,
             prompt: str,
@@ -41,26 +68,72 @@ class GeminiVisionService(VisionService):
         """
         Analyzes an image using the specified Gemini model with an increased timeout.
         """
+        return await self.analyze_images(images=[image], prompt=prompt, model_option=model_option)
+
+    async def analyze_images(
+            self,
+            images: list[ImageFile],
+            prompt: str,
+            model_option: str
+    ) -> AnalysisResult:
+        """
+        Analyzes one or more images in a single Gemini request.
+        """
+        return await self._analyze_images(images=images, prompt=prompt, model_option=model_option)
+
+    async def analyze_image_structured(
+            self,
+            image: ImageFile,
+            prompt: str,
+            model_option: str,
+            response_schema: dict
+    ) -> AnalysisResult:
+        """
+        Analyzes an image using Gemini's JSON mode, constrained to the given response schema.
+        """
+        generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": response_schema,
+        }
+        return await self._analyze_images(
+            images=[image],
+            prompt=prompt,
+            model_option=model_option,
+            generation_config=generation_config
+        )
+
+    async def _analyze_images(
+            self,
+            images: list[ImageFile],
+            prompt: str,
+            model_option: str,
+            generation_config: Optional[dict] = None
+    ) -> AnalysisResult:
         logger.info(
             "Attempting to analyze image with Gemini.",
-            model_option=model_option
+            model_option=model_option,
+            image_count=len(images)
         )
 
         try:
-            img = Image.open(io.BytesIO(image.content))
+            # Send the (already normalized) bytes as-is so the SDK doesn't re-encode them.
+            image_parts = [self._image_part(image) for image in images]
 
             start_time = time.time()
             logger.debug("Sending request to Gemini API.")
 
-            model = genai.GenerativeModel(model_option)
+            model = self._get_model(model_option)
 
             request_options = {"timeout": 120}
 
-            # Pass the request_options to the generate_content call
-            response = model.generate_content(
-                [prompt, img],
-                request_options=request_options
-            )
+            # Use the SDK's async path so the event loop keeps serving
+            # other requests while this call is in flight.
+            async with self.scheduler.slot(model_option):
+                response = await model.generate_content_async(
+                    [prompt, *image_parts],
+                    generation_config=generation_config,
+                    request_options=request_options
+                )
 
             processing_time = round(time.time() - start_time, 2)
 
@@ -75,6 +148,9 @@ class GeminiVisionService(VisionService):
                 processing_time=processing_time
             )
 
+        except HTTPException:
+            # Already carries the right status (e.g. a 429/503 from the scheduler).
+            raise
         # Add specific handling for the timeout error
         except google_exceptions.DeadlineExceeded:
             logger.error("Gemini API call timed out after 120 seconds.")
@@ -89,7 +165,7 @@ class GeminiVisionService(VisionService):
                 detail=f"An error occurred with the vision model: {str(e)}"
             )
 
-    def analyze_video(
+    async def analyze_video(
             self,
             video: VideoFile,
             prompt: str,
@@ -104,34 +180,24 @@ class GeminiVisionService(VisionService):
             filename=video.filename
         )
 
-        # The SDK's upload_file method requires a file path.
-        # We write the in-memory bytes to a temporary file first.
-        temp_file = None
         uploaded_file = None
         try:
-            with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=os.path.splitext(video.filename)[1]
-            ) as temp_file:
-                temp_file.write(video.content)
-                temp_file_path = temp_file.name
-
             start_time = time.time()
-            logger.debug("Uploading video file to Gemini API.", path=temp_file_path)
+            logger.debug("Uploading video file to Gemini API.", size_bytes=len(video.content))
 
-            # 1. Upload the file to the Gemini API
-            uploaded_file = genai.upload_file(
-                path=temp_file_path,
+            # 1. Upload the file to the Gemini API straight from memory.
+            # The SDK only offers a blocking upload, so it runs in a worker thread.
+            uploaded_file = await asyncio.to_thread(
+                genai.upload_file,
+                path=io.BytesIO(video.content),
                 display_name=video.filename,
                 mime_type=video.content_type,
             )
             logger.info("Video file uploaded.", file_name=uploaded_file.name)
 
-            # 2. Poll for the video's state to become 'ACTIVE'
+            # 2. Wait for the video's state to become 'ACTIVE'
             # The model cannot use the file until it has been processed.
-            logger.debug("Polling for video processing status.")
-            while uploaded_file.state.name == "PROCESSING":
-                time.sleep(5)  # Wait 5 seconds between checks
-                uploaded_file = genai.get_file(name=uploaded_file.name)
+            uploaded_file = await self._wait_for_processing(uploaded_file)
 
             if uploaded_file.state.name == "FAILED":
                 logger.error("Video processing failed on Google's server.")
@@ -140,14 +206,15 @@ class GeminiVisionService(VisionService):
             logger.info("Video is active and ready for analysis.")
 
             # 3. Generate content using the uploaded file
-            model = genai.GenerativeModel(model_option)
+            model = self._get_model(model_option)
             # Consider a longer timeout for video analysis
             request_options = {"timeout": 300}
 
-            response = model.generate_content(
-                [prompt, uploaded_file],
-                request_options=request_options
-            )
+            async with self.scheduler.slot(model_option):
+                response = await model.generate_content_async(
+                    [prompt, uploaded_file],
+                    request_options=request_options
+                )
 
             processing_time = round(time.time() - start_time, 2)
             logger.info(
@@ -161,6 +228,8 @@ class GeminiVisionService(VisionService):
                 processing_time=processing_time
             )
 
+        except HTTPException:
+            raise
         except google_exceptions.DeadlineExceeded:
             logger.error("Gemini API call timed out after 300 seconds.")
             raise HTTPException(
@@ -174,15 +243,67 @@ class GeminiVisionService(VisionService):
                 detail=f"An error occurred with the video model: {str(e)}"
             )
         finally:
-            # 4. Clean up by deleting the temporary local file and the uploaded remote file
-            if temp_file:
-                os.remove(temp_file_path)
-                logger.debug("Deleted temporary local file.", path=temp_file_path)
+            # 4. Delete the uploaded remote file without holding up the response.
             if uploaded_file:
-                genai.delete_file(name=uploaded_file.name)
-                logger.debug("Deleted file from Gemini.", file_name=uploaded_file.name)
+                self._delete_remote_file_in_background(uploaded_file.name)
+
+    async def _wait_for_processing(self, uploaded_file):
+        """
+        Polls the uploaded file until it leaves the PROCESSING state.
+        Polling starts quickly and backs off exponentially up to a cap, so short
+        clips are picked up as soon as they are ready. Raises an HTTPException
+        if processing takes longer than the configured deadline.
+        """
+        logger.debug("Polling for video processing status.")
+        deadline = time.monotonic() + self.video_processing_deadline_seconds
+        delay = self.video_poll_initial_seconds
+        polls = 0
+        while uploaded_file.state.name == "PROCESSING":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(
+                    "Video processing did not finish before the deadline.",
+                    file_name=uploaded_file.name,
+                    deadline=self.video_processing_deadline_seconds
+                )
+                raise HTTPException(
+                    status_code=504,
+                    detail="The video took too long to process. Please try again."
+                )
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.video_poll_max_seconds)
+            uploaded_file = await asyncio.to_thread(genai.get_file, name=uploaded_file.name)
+            polls += 1
+        logger.debug("Video processing finished.", file_name=uploaded_file.name, polls=polls)
+        return uploaded_file
 
-    def analyze_text(
+    def _delete_remote_file_in_background(self, file_name: str):
+        """
+        Schedules deletion of an uploaded file on the event loop. Errors are logged, not raised.
+        """
+        task = asyncio.create_task(asyncio.to_thread(genai.delete_file, name=file_name))
+        # Keep a reference so the task isn't garbage collected before it finishes.
+        _cleanup_tasks.add(task)
+        task.add_done_callback(lambda t: self._on_remote_file_deleted(t, file_name))
+
+    @staticmethod
+    def _on_remote_file_deleted(task: asyncio.Task, file_name: str):
+        _cleanup_tasks.discard(task)
+        if task.cancelled():
+            return
+        if task.exception():
+            logger.warning("Failed to delete file from Gemini.", file_name=file_name, error=str(task.exception()))
+        else:
+            logger.debug("Deleted file from Gemini.", file_name=file_name)
+
+    @staticmethod
+    def _image_part(image: ImageFile) -> dict:
+        """
+        Builds an inline image part for generate_content from the raw bytes.
+        """
+        return {"mime_type": image.content_type, "data": image.content}
+
+    async def analyze_text(
             self,
             prompt: str,
             model_option: str
@@ -193,12 +314,15 @@ class GeminiVisionService(VisionService):
         logger.info("Attempting to analyze text with Gemini.", model_option=model_option)
         try:
             start_time = time.time()
-            model = genai.GenerativeModel(model_option)
+            model = self._get_model(model_option)
             request_options = {"timeout": self.timeout}
-            response = model.generate_content(prompt, request_options=request_options)
+            async with self.scheduler.slot(model_option):
+                response = await model.generate_content_async(prompt, request_options=request_options)
             processing_time = round(time.time() - start_time, 2)
             logger.info("Text analysis successful.", processing_time=processing_time)
             return AnalysisResult(text=response.text, processing_time=processing_time)
+        except HTTPException:
+            raise
         except google_exceptions.DeadlineExceeded:
             logger.error("Gemini API call for text analysis timed out.", timeout=self.timeout)
             raise HTTPException(status_code=504, detail="The request to the AI model for text analysis timed out.")
@@ -209,30 +333,37 @@ class GeminiVisionService(VisionService):
     async def get_object_list(self, image: ImageFile) -> list[str]:
         """
         Analyzes an image and returns a list of objects, tailored for the blind.
+        Raises if the model is not configured or its response is not a list of
+        strings, so the extraction job retries instead of storing an empty list;
+        an empty list means the model found no objects.
         """
         prompt = prompt_loader.get('gemini_vision.json_object_detection')
+        response = None
+        object_extractor_model_config = self.models_config.get("objects_extractor", {}).get("models")
+        if not object_extractor_model_config or not object_extractor_model_config[0]:
+            logger.error("Server config error: 'objects_extractor' model is not defined.")
+            raise HTTPException(status_code=500, detail="Server configuration error: objects extractor model is missing.")
         try:
-
-            object_extractor_model_config = self.models_config.get("objects_extractor", {}).get("models")
-            if not object_extractor_model_config or not object_extractor_model_config[0]:
-                logger.error("Server config error: 'objects_extractor' model is not defined.")
-                # Return empty list as this is an internal service call, not a direct endpoint
-                return []
-
-            img = Image.open(io.BytesIO(image.content))
+            image_part = self._image_part(image)
             logger.debug("Sending request to Gemini API to analyze objects.")
 
-            model = genai.GenerativeModel(object_extractor_model_config[0])
+            model = self._get_model(object_extractor_model_config[0])
 
-            # Pass the request_options to the generate_content call
-            response = model.generate_content(
-                [prompt, img],
-            )
-            # Basic parsing to find the JSON list in the response text
-            json_str = response.text[response.text.find('['):response.text.rfind(']') + 1]
-            return json.loads(json_str)
+            # JSON mode with a schema makes the model return exactly a list of strings.
+            async with self.scheduler.slot(object_extractor_model_config[0]):
+                response = await model.generate_content_async(
+                    [prompt, image_part],
+                    generation_config={
+                        "response_mime_type": "application/json",
+                        "response_schema": OBJECT_LIST_SCHEMA,
+                    }
+                )
+            object_list = json.loads(response.text)
+            if not isinstance(object_list, list) or not all(isinstance(item, str) for item in object_list):
+                raise ValueError("The response is not a list of strings.")
+            return object_list
         except (json.JSONDecodeError, ValueError, IndexError) as e:
             # Handle cases where the model doesn't return a perfect list
             logger.error(f"Could not parse object list from Gemini: {e}")
-            logger.error(f"Gemini raw response for object list: {response.text}")
-            return []  # Return an empty list on failure
\ No newline at end of file
+            logger.error(f"Gemini raw response for object list: {response.text if response else None}")
+            raise HTTPException(status_code=502, detail="The model returned an unreadable object list.")
\ No newline at end of file
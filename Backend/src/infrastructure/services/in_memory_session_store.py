@@ -0,0 +1,135 @@
+import itertools
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+import structlog
+
+from src.application.services.session_store import SessionInfo, SessionStore
+from src.domain.entities import SessionState, TimelineEvent
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_state_bytes(state: SessionState) -> int:
+    """
+    Approximates the serialized size of a session's state from its texts and
+    item counts, without serializing it.
+    """
+    events = state.recent_events + state.pending_descriptions
+    return (
+        256
+        + sum(len(event.text) + 64 for event in events)
+        + sum(len(segment.text) + 96 for segment in state.narrative_segments)
+        + 128 * len(state.in_flight)
+        + 24 * len(state.recent_frame_hashes)
+    )
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Keeps sessions in this process's memory. Fast, but sessions are lost on
+    restart and are not visible to other uvicorn workers.
+    Every method runs on the event loop and finishes its change without
+    awaiting, so changes are atomic without a lock.
+
+    Activity order and sizes are kept up to date on every write, so eviction
+    finds the least recently active sessions and the total size without
+    walking all sessions.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionState] = {}
+        self._events: Dict[str, List[TimelineEvent]] = {}
+        # Least recently active first
+        self._last_active: "OrderedDict[str, float]" = OrderedDict()
+        self._state_bytes: Dict[str, int] = {}
+        self._event_bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        logger.info("InMemorySessionStore initialized.")
+
+    def _mark_active(self, session_id: str):
+        self._last_active[session_id] = time.time()
+        self._last_active.move_to_end(session_id)
+
+    def _resize(self, state: SessionState):
+        size = estimate_state_bytes(state)
+        self._total_bytes += size - self._state_bytes.get(state.session_id, 0)
+        self._state_bytes[state.session_id] = size
+
+    async def create(self, state: SessionState):
+        self._sessions[state.session_id] = state
+        self._events[state.session_id] = []
+        self._event_bytes[state.session_id] = 0
+        self._resize(state)
+        self._mark_active(state.session_id)
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        return self._sessions.get(session_id)
+
+    async def compare_and_set(self, state: SessionState, expected_revision: int) -> bool:
+        current = self._sessions.get(state.session_id)
+        if current is None or current.revision != expected_revision:
+            return False
+        state.revision = expected_revision + 1
+        self._sessions[state.session_id] = state
+        self._resize(state)
+        self._mark_active(state.session_id)
+        return True
+
+    async def update(self, session_id: str, mutate: Callable[[SessionState], T], max_attempts: int = 50) -> T:
+        # The state lives in this process, so it is mutated in place instead of
+        # being copied for a compare-and-set.
+        state = self._sessions.get(session_id)
+        if state is None:
+            raise ValueError(f"Session with ID '{session_id}' not found.")
+        result = mutate(state)
+        state.revision += 1
+        self._resize(state)
+        self._mark_active(session_id)
+        return result
+
+    async def append_event(self, session_id: str, event: TimelineEvent) -> int:
+        events = self._events.get(session_id)
+        if events is None:
+            raise ValueError(f"Session with ID '{session_id}' not found.")
+        events.append(event)
+        size = len(event.text) + 32
+        self._event_bytes[session_id] += size
+        self._total_bytes += size
+        self._mark_active(session_id)
+        return len(events)
+
+    async def read_events(self, session_id: str, offset: int = 0) -> List[TimelineEvent]:
+        return self._events.get(session_id, [])[offset:]
+
+    async def delete(self, session_id: str) -> bool:
+        self._events.pop(session_id, None)
+        self._last_active.pop(session_id, None)
+        self._total_bytes -= self._state_bytes.pop(session_id, 0) + self._event_bytes.pop(session_id, 0)
+        return self._sessions.pop(session_id, None) is not None
+
+    async def touch(self, session_id: str):
+        if session_id in self._sessions:
+            self._mark_active(session_id)
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+    async def oldest_sessions(self, limit: int) -> List[SessionInfo]:
+        return [
+            SessionInfo(
+                session_id=session_id,
+                last_active_at=last_active_at,
+                size_bytes=self._state_bytes[session_id] + self._event_bytes[session_id]
+            )
+            for session_id, last_active_at in itertools.islice(self._last_active.items(), max(0, limit))
+        ]
+
+    async def total_bytes(self) -> int:
+        return self._total_bytes
+
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        return {session_id for session_id in session_ids if session_id in self._sessions}
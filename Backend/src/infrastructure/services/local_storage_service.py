@@ -3,6 +3,7 @@ import uuid
 import structlog
 from datetime import datetime
 from pathlib import Path
+from typing import Set
 from fastapi import HTTPException
 from src.infrastructure.config import Settings
 
@@ -23,8 +24,50 @@ class LocalStorageService(StorageService):
         Initializes the service with a base directory for all stored files.
         """
         self.base_storage_dir = Path(base_storage_dir)
+        self._known_dirs: Set[Path] = set()
         logger.info("LocalStorageService initialized.", base_dir=str(self.base_storage_dir))
 
+    def new_path(self, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        """
+        Names a new file in the subdirectory for the prefix, without touching the disk.
+        For example, a prefix of 'vqa' gives a path in '{base_storage_dir}/vqa/'.
+        """
+        # --- 1. Determine the target subdirectory from the prefix ---
+        # This is where the organization happens. e.g., 'storage/vqa'
+        target_dir = self.base_storage_dir / prefix
+
+        # --- 2. Create a unique and safe filename ---
+        return str(target_dir / self._new_filename(original_filename, prefix))
+
+    @staticmethod
+    def _new_filename(original_filename: str, prefix: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Add a short UUID to guarantee uniqueness even if two files are
+        # processed in the same second.
+        unique_id = uuid.uuid4().hex[:8]
+        safe_original_filename = Path(original_filename).name
+        file_ext = os.path.splitext(safe_original_filename)[1]
+
+        return f"{prefix}_{timestamp}_{unique_id}{file_ext}"
+
+    def write_file(self, path: str, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        """
+        Writes the content to a path from new_path and returns the path that
+        read_file takes for it. Raises OSError on failure.
+        """
+        self._ensure_dir(Path(path).parent)
+        with open(path, "wb") as buffer:
+            buffer.write(file_bytes)
+        return path
+
+    def _ensure_dir(self, target_dir: Path):
+        # The `parents=True` flag will create the base 'storage' directory
+        # as well, if it doesn't already exist. Each directory is only
+        # created once per process.
+        if target_dir not in self._known_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(target_dir)
+
     def save_file(
             self,
             file_bytes: bytes,
@@ -33,7 +76,6 @@ class LocalStorageService(StorageService):
     ) -> str:
         """
         Saves a file's binary content to a specific subdirectory named after the prefix.
-        For example, a prefix of 'vqa' will save the file in '{base_storage_dir}/vqa/'.
         """
         logger.info(
             "Attempting to save file to local storage.",
@@ -42,34 +84,22 @@ class LocalStorageService(StorageService):
             size_bytes=len(file_bytes)
         )
         try:
-            # --- 1. Determine the target subdirectory from the prefix ---
-            # This is where the organization happens. e.g., 'storage/vqa'
-            target_dir = self.base_storage_dir / prefix
-
-            # --- 2. Ensure the subdirectory exists ---
-            # The `parents=True` flag will create the base 'storage' directory
-            # as well, if it doesn't already exist.
-            target_dir.mkdir(parents=True, exist_ok=True)
-
-            # --- 3. Create a unique and safe filename ---
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # Add a short UUID to guarantee uniqueness even if two files are
-            # processed in the same second.
-            unique_id = uuid.uuid4().hex[:8]
-            safe_original_filename = Path(original_filename).name
-            file_ext = os.path.splitext(safe_original_filename)[1]
-
-            save_filename = f"{prefix}_{timestamp}_{unique_id}{file_ext}"
-            save_path = target_dir / save_filename
-
-            # --- 4. Write the file to the determined path ---
-            with open(save_path, "wb") as buffer:
-                buffer.write(file_bytes)
-
-            logger.info("File saved successfully.", path=str(save_path))
-            # Return the path as a string, as required by the interface
-            return str(save_path)
+            save_path = self.write_file(
+                self.new_path(file_bytes, original_filename, prefix), file_bytes, original_filename, prefix
+            )
+            logger.info("File saved successfully.", path=save_path)
+            return save_path
 
         except Exception as e:
             logger.exception("Error saving file to local storage.")
             raise HTTPException(status_code=500, detail="Failed to save file.")
+
+    def read_file(self, path: str) -> bytes:
+        """
+        Reads a stored file's binary content from disk.
+        """
+        with open(path, "rb") as f:
+            return f.read()
+
+    def stats(self) -> dict:
+        return {"layout": "flat"}
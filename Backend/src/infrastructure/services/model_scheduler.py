@@ -0,0 +1,227 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+import structlog
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class ModelLimits(BaseModel):
+    """
+    The scheduling limits for a single model, as configured under
+    'model_limits' in models.yaml.
+    """
+    max_in_flight: int = Field(8, ge=1)
+    requests_per_minute: int = Field(60, ge=0)  # 0 disables the rate limit
+    max_queue: int = Field(32, ge=0)
+    queue_timeout_seconds: float = Field(30, gt=0)
+
+
+class ModelLimiter:
+    """
+    Admits calls to one model in FIFO order while enforcing a maximum number of
+    in-flight calls and a requests-per-minute budget. Callers that cannot start
+    immediately wait in a bounded queue; when the queue is full they are rejected
+    straight away with a Retry-After hint instead of piling up until they time out.
+    """
+
+    # Seed for the moving average of call latency, used for Retry-After estimates.
+    _INITIAL_LATENCY_SECONDS = 5.0
+
+    def __init__(self, model_name: str, limits: ModelLimits):
+        self.model_name = model_name
+        self.limits = limits
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._recent_starts: Deque[float] = deque()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+        self._avg_latency = self._INITIAL_LATENCY_SECONDS
+
+        # Counters reported through stats()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    # --- Admission bookkeeping ---
+
+    def _rate_delay(self, now: float) -> float:
+        """
+        Returns how many seconds until the rate limit allows another call to start.
+        """
+        if not self.limits.requests_per_minute:
+            return 0.0
+        while self._recent_starts and now - self._recent_starts[0] >= 60:
+            self._recent_starts.popleft()
+        if len(self._recent_starts) < self.limits.requests_per_minute:
+            return 0.0
+        return 60 - (now - self._recent_starts[0])
+
+    def _start(self, now: float):
+        self.in_flight += 1
+        self.admitted += 1
+        if self.limits.requests_per_minute:
+            self._recent_starts.append(now)
+
+    def _dispatch(self):
+        """
+        Hands free slots to queued callers in arrival order.
+        """
+        self._wakeup_handle = None
+        now = time.monotonic()
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done():
+                # The caller gave up (timeout or disconnect) while queued.
+                self._waiters.popleft()
+                continue
+            if self.in_flight >= self.limits.max_in_flight:
+                return
+            delay = self._rate_delay(now)
+            if delay > 0:
+                self._schedule_wakeup(delay)
+                return
+            self._waiters.popleft()
+            self._start(now)
+            waiter.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        if self._wakeup_handle is None:
+            loop = asyncio.get_running_loop()
+            self._wakeup_handle = loop.call_later(delay, self._dispatch)
+
+    def retry_after(self) -> int:
+        """
+        Estimates, in whole seconds, when a rejected caller should try again.
+        """
+        backlog = len(self._waiters) + 1
+        by_concurrency = backlog / self.limits.max_in_flight * self._avg_latency
+        by_rate = 0.0
+        if self.limits.requests_per_minute:
+            by_rate = self._rate_delay(time.monotonic()) + backlog / self.limits.requests_per_minute * 60
+        return max(1, math.ceil(max(by_concurrency, by_rate)))
+
+    # --- Public API ---
+
+    async def acquire(self):
+        """
+        Waits for a slot. Raises an HTTPException (429 or 503, with Retry-After)
+        when the wait queue is full or the queued wait exceeds its timeout.
+        """
+        now = time.monotonic()
+        if not self._waiters and self.in_flight < self.limits.max_in_flight and self._rate_delay(now) == 0:
+            self._start(now)
+            return
+
+        if len(self._waiters) >= self.limits.max_queue:
+            self.rejected += 1
+            rate_limited = self._rate_delay(now) > 0
+            logger.warning(
+                "Model queue is full. Rejecting request.",
+                model=self.model_name,
+                queued=len(self._waiters),
+                in_flight=self.in_flight,
+                rate_limited=rate_limited
+            )
+            raise HTTPException(
+                status_code=429 if rate_limited else 503,
+                detail="The AI model is busy. Please try again shortly.",
+                headers={"Retry-After": str(self.retry_after())}
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.limits.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.warning(
+                "Timed out waiting for a model slot.",
+                model=self.model_name,
+                timeout=self.limits.queue_timeout_seconds
+            )
+            raise HTTPException(
+                status_code=503,
+                detail="The AI model is busy. Please try again shortly.",
+                headers={"Retry-After": str(self.retry_after())}
+            )
+        except asyncio.CancelledError:
+            # If the slot was granted just before the caller went away, give it back.
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            raise
+
+    def release(self, duration: float):
+        """
+        Frees the caller's slot and records how long the call took.
+        """
+        self.in_flight -= 1
+        if duration > 0:
+            self._avg_latency = 0.8 * self._avg_latency + 0.2 * duration
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start_time)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": sum(1 for w in self._waiters if not w.done()),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_latency_seconds": round(self._avg_latency, 2),
+        }
+
+
+class ModelScheduler:
+    """
+    Holds one ModelLimiter per model name. A single instance must be shared by
+    every request in the process for the limits to mean anything.
+    """
+
+    def __init__(self, limits_config: Optional[dict] = None):
+        limits_config = limits_config or {}
+        default_config = limits_config.get("default") or {}
+        self._default_limits = ModelLimits(**default_config)
+        self._model_limits: Dict[str, ModelLimits] = {
+            model_name: ModelLimits(**{**default_config, **(config or {})})
+            for model_name, config in limits_config.items()
+            if model_name != "default"
+        }
+        self._limiters: Dict[str, ModelLimiter] = {}
+        logger.info("ModelScheduler initialized.", configured_models=list(self._model_limits))
+
+    def _get_limiter(self, model_name: str) -> ModelLimiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limits = self._model_limits.get(model_name, self._default_limits)
+            limiter = ModelLimiter(model_name, limits)
+            self._limiters[model_name] = limiter
+        return limiter
+
+    def slot(self, model_name: str):
+        """
+        Returns an async context manager that holds a slot for the given model.
+
+        Usage:
+            async with scheduler.slot("gemini-2.5-flash"):
+                response = await model.generate_content_async(...)
+        """
+        return self._get_limiter(model_name).slot()
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
@@ -1,8 +1,10 @@
+import uuid
 import structlog
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from beanie import UpdateResponse
 from src.application.services.dataset_service import DatasetService
-from src.application.services.vision_service import VisionService
-from src.domain.entities.documents import RequestLog, AnalysisMode
-from src.domain.entities.image import ImageFile
+from src.domain.entities.documents import RequestLog, AnalysisMode, ObjectExtractionStatus
 
 logger = structlog.get_logger(__name__)
 
@@ -19,20 +21,17 @@ class MongoDatasetService(DatasetService):
             self,
             user_id: str,
             file_path: str,
-            image: ImageFile,
-            vision_service: VisionService,
             question: str,
             answer: str,
             model_name: str,
-            mode: AnalysisMode
+            mode: AnalysisMode,
+            object_list: Optional[list[str]] = None
     ):
         try:
             logger.info("Background dataset task started.", user_id=user_id)
 
-            # 1. Get the list of objects using the injected vision service
-            object_list = await vision_service.get_object_list(image)
-
-            # 2. Create the log entry
+            # 1. Create the log entry. Without an object list it is left pending
+            # for the object extraction worker.
             log_entry = RequestLog(
                 user_id=user_id,
                 model_name=model_name,
@@ -40,12 +39,64 @@ class MongoDatasetService(DatasetService):
                 file_path=file_path,
                 question=question,
                 answer=answer,
-                list_of_objects=object_list
+                list_of_objects=object_list or [],
+                object_extraction_status=(
+                    ObjectExtractionStatus.DONE if object_list is not None else ObjectExtractionStatus.PENDING
+                )
             )
 
-            # 3. Save it to MongoDB
+            # 2. Save it to MongoDB
             await log_entry.insert()
             logger.info("Background task finished. Request log saved.", user_id=user_id)
 
         except Exception as e:
-            logger.error("Error in background dataset logging task.", error=e, exc_info=True)
\ No newline at end of file
+            logger.error("Error in background dataset logging task.", error=e, exc_info=True)
+
+    async def claim_pending_object_extractions(self, limit: int, lease_seconds: int) -> list[RequestLog]:
+        now = datetime.now(timezone.utc)
+        claimable = {
+            "$or": [
+                {"object_extraction_status": ObjectExtractionStatus.PENDING.value},
+                {
+                    "object_extraction_status": ObjectExtractionStatus.PROCESSING.value,
+                    "claimed_at": {"$lt": now - timedelta(seconds=lease_seconds)},
+                },
+            ]
+        }
+        claimed = []
+        for _ in range(limit):
+            # find_one_and_update, so two workers can never claim the same log.
+            log = await RequestLog.find_one(claimable).update(
+                {"$set": {
+                    "object_extraction_status": ObjectExtractionStatus.PROCESSING.value,
+                    "claimed_at": now,
+                }},
+                response_type=UpdateResponse.NEW_DOCUMENT
+            )
+            if log is None:
+                break
+            claimed.append(log)
+        return claimed
+
+    async def complete_object_extraction(self, log_id: uuid.UUID, object_list: list[str]):
+        await RequestLog.find_one(RequestLog.id == log_id).update(
+            {"$set": {
+                "list_of_objects": object_list,
+                "object_extraction_status": ObjectExtractionStatus.DONE.value,
+            }}
+        )
+
+    async def fail_object_extraction(self, log_id: uuid.UUID, max_attempts: int):
+        log = await RequestLog.find_one(RequestLog.id == log_id).update(
+            {"$inc": {"object_extraction_attempts": 1}},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if log is None:
+            return
+        status = (
+            ObjectExtractionStatus.FAILED if log.object_extraction_attempts >= max_attempts
+            else ObjectExtractionStatus.PENDING
+        )
+        await RequestLog.find_one(RequestLog.id == log_id).update(
+            {"$set": {"object_extraction_status": status.value}}
+        )
@@ -0,0 +1,242 @@
+import asyncio
+import io
+import os
+import structlog
+import av
+from PIL import Image, ImageChops, ImageOps, ImageStat
+
+from src.application.services.media_processing_service import InvalidMediaError, MediaProcessingService
+from src.domain.entities import ImageFile, VideoFile
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+# Image formats the model accepts as-is, mapped to their MIME types.
+PASSTHROUGH_FORMATS = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+# EXIF tag holding the camera orientation.
+EXIF_ORIENTATION_TAG = 0x0112
+
+DEFAULT_MAX_EDGE = 1536
+DEFAULT_JPEG_QUALITY = 85
+
+# The image_preprocessing entry used for frames sampled from video clips.
+VIDEO_FRAME_FEATURE = "live_frame"
+
+# Side length of the grayscale thumbnails compared for scene-change detection.
+SCENE_THUMBNAIL_SIZE = (32, 32)
+
+# dHash compares horizontally adjacent pixels of a (width + 1) x height grayscale thumbnail.
+DHASH_SIZE = (9, 8)
+
+# At most this many candidate frames per output frame are kept for selection.
+CANDIDATES_PER_FRAME = 4
+
+
+class PillowMediaProcessingService(MediaProcessingService):
+    """
+    A concrete implementation of the MediaProcessingService that uses Pillow.
+    Per-feature limits are read from the 'image_preprocessing' section of models.yaml,
+    and clip frame sampling from the 'video_scene_extraction' section. Video decoding uses PyAV.
+    """
+
+    def __init__(self, preprocessing_config: dict, frame_sampling_config: dict = None):
+        self.preprocessing_config = preprocessing_config or {}
+        self.frame_sampling_config = frame_sampling_config or {}
+
+    async def normalize_image(self, image: ImageFile, feature: str) -> ImageFile:
+        """
+        Decoding and resizing are CPU-bound, so they run in a worker thread.
+        """
+        feature_config = self.preprocessing_config.get(feature, {})
+        max_edge = feature_config.get("max_edge", DEFAULT_MAX_EDGE)
+        jpeg_quality = feature_config.get("jpeg_quality", DEFAULT_JPEG_QUALITY)
+        return await asyncio.to_thread(self._normalize, image, max_edge, jpeg_quality)
+
+    def _normalize(self, image: ImageFile, max_edge: int, jpeg_quality: int) -> ImageFile:
+        try:
+            img = Image.open(io.BytesIO(image.content))
+            orientation = img.getexif().get(EXIF_ORIENTATION_TAG, 1)
+
+            # --- 1. Pass the original bytes through when nothing needs to change ---
+            if img.format in PASSTHROUGH_FORMATS and orientation == 1 and max(img.size) <= max_edge:
+                content_type = PASSTHROUGH_FORMATS[img.format]
+                if content_type == image.content_type:
+                    return image
+                # Same bytes, but with the MIME type the data really has.
+                return image.model_copy(update={"content_type": content_type})
+
+            original_size = img.size
+
+            # --- 2. Let the JPEG decoder downscale while decoding (much cheaper than a full decode) ---
+            if img.format == "JPEG":
+                img.draft("RGB", (max_edge, max_edge))
+
+            # --- 3. Apply the EXIF orientation and fit within the maximum edge ---
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+            # --- 4. Re-encode as JPEG ---
+            if img.mode in ("RGBA", "LA", "P"):
+                # JPEG has no alpha channel; flatten onto white.
+                img = img.convert("RGBA")
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
+            elif img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+            content = buffer.getvalue()
+
+            logger.debug(
+                "Image normalized.",
+                original_size=original_size,
+                new_size=img.size,
+                original_bytes=len(image.content),
+                new_bytes=len(content)
+            )
+            stem = os.path.splitext(image.filename)[0] or "image"
+            return ImageFile(filename=f"{stem}.jpg", content_type="image/jpeg", content=content)
+
+        except Exception:
+            # Let the model try the original rather than failing the request here.
+            logger.warning("Could not normalize image. Using the original upload.", filename=image.filename, exc_info=True)
+            return image
+
+    async def sample_video_frames(self, video: VideoFile) -> list[ImageFile]:
+        """
+        Decoding runs in a worker thread.
+        """
+        return await asyncio.to_thread(self._sample_video_frames, video)
+
+    def _sample_video_frames(self, video: VideoFile) -> list[ImageFile]:
+        sampling = self.frame_sampling_config.get("sampling", "fixed_rate")
+        fps = float(self.frame_sampling_config.get("fps", 1.0))
+        max_frames = int(self.frame_sampling_config.get("max_frames", 8))
+        threshold = float(self.frame_sampling_config.get("scene_change_threshold", 0.25))
+
+        feature_config = self.preprocessing_config.get(VIDEO_FRAME_FEATURE, {})
+        max_edge = feature_config.get("max_edge", DEFAULT_MAX_EDGE)
+        jpeg_quality = feature_config.get("jpeg_quality", DEFAULT_JPEG_QUALITY)
+        max_candidates = max_frames * CANDIDATES_PER_FRAME
+
+        # --- 1. Decode candidate frames at the sampling rate, already downscaled ---
+        candidates = []
+        with av.open(io.BytesIO(video.content)) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+
+            interval = 1.0 / fps
+            if stream.duration is not None and stream.time_base is not None:
+                # Long clips: widen the interval so the candidate count stays bounded.
+                duration = float(stream.duration * stream.time_base)
+                interval = max(interval, duration / (max_frames * CANDIDATES_PER_FRAME))
+
+            next_time = 0.0
+            for frame in container.decode(stream):
+                frame_time = frame.time if frame.time is not None else next_time
+                if frame_time + 1e-6 < next_time:
+                    continue
+                next_time = frame_time + interval
+                # Let ffmpeg scale the frame so full-resolution images are never held.
+                scale = min(1.0, max_edge / max(frame.width, frame.height))
+                img = frame.reformat(
+                    width=max(1, round(frame.width * scale)),
+                    height=max(1, round(frame.height * scale)),
+                    format="rgb24"
+                ).to_image()
+                candidates.append((frame_time, img))
+                if len(candidates) >= max_candidates:
+                    break
+
+        if not candidates:
+            raise ValueError("No frames could be decoded from the video clip.")
+
+        # --- 2. Choose which candidates to keep ---
+        if sampling == "scene_change":
+            selected = self._select_scene_changes(candidates, max_frames, threshold)
+        else:
+            selected = self._select_evenly(candidates, max_frames)
+
+        # --- 3. Encode the kept frames ---
+        stem = os.path.splitext(video.filename)[0] or "clip"
+
+        frames = []
+        for index, (frame_time, img) in enumerate(selected):
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=jpeg_quality)
+            frames.append(ImageFile(
+                filename=f"{stem}_frame{index:02d}.jpg",
+                content_type="image/jpeg",
+                content=buffer.getvalue()
+            ))
+
+        logger.debug(
+            "Sampled frames from video clip.",
+            sampling=sampling,
+            candidates=len(candidates),
+            frames=len(frames),
+            times=[round(t, 2) for t, _ in selected]
+        )
+        return frames
+
+    @staticmethod
+    def _select_evenly(candidates: list, max_frames: int) -> list:
+        """
+        Keeps up to max_frames candidates spread evenly across the clip.
+        """
+        if len(candidates) <= max_frames:
+            return candidates
+        step = (len(candidates) - 1) / (max_frames - 1) if max_frames > 1 else 0
+        return [candidates[round(i * step)] for i in range(max_frames)]
+
+    @staticmethod
+    def _select_scene_changes(candidates: list, max_frames: int, threshold: float) -> list:
+        """
+        Keeps the first frame plus the frames that differ most from the frame
+        before them, ignoring changes below the threshold (0-1 mean pixel change).
+        """
+        thumbnails = [img.convert("L").resize(SCENE_THUMBNAIL_SIZE) for _, img in candidates]
+        changes = []
+        for index in range(1, len(candidates)):
+            difference = ImageChops.difference(thumbnails[index], thumbnails[index - 1])
+            score = ImageStat.Stat(difference).mean[0] / 255
+            if score >= threshold:
+                changes.append((score, index))
+
+        # The largest changes win; the output stays in chronological order.
+        changes.sort(reverse=True)
+        kept = sorted([0] + [index for _, index in changes[:max(max_frames - 1, 0)]])
+        return [candidates[index] for index in kept]
+
+    async def perceptual_hash(self, image: ImageFile) -> int:
+        try:
+            return await asyncio.to_thread(self._dhash, image.content)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise InvalidMediaError(f"The image '{image.filename}' could not be decoded.") from e
+
+    @staticmethod
+    def _dhash(content: bytes) -> int:
+        """
+        Difference hash: one bit per pixel pair, set when the left pixel is brighter.
+        """
+        img = Image.open(io.BytesIO(content))
+        if img.format == "JPEG":
+            # Only a tiny thumbnail is needed, so decode at the smallest scale.
+            img.draft("L", (DHASH_SIZE[0] * 8, DHASH_SIZE[1] * 8))
+        pixels = list(img.convert("L").resize(DHASH_SIZE, Image.Resampling.BILINEAR).getdata())
+
+        width, height = DHASH_SIZE
+        value = 0
+        for row in range(height):
+            for col in range(width - 1):
+                left = pixels[row * width + col]
+                right = pixels[row * width + col + 1]
+                value = (value << 1) | (left > right)
+        return value
@@ -0,0 +1,204 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Callable, Iterable, List, Optional, Set, TypeVar
+
+import structlog
+
+from src.application.services.session_store import SessionInfo, SessionStore
+from src.domain.entities import SessionState, TimelineEvent
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_events (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Keeps sessions in a SQLite database in WAL mode, so every uvicorn worker on
+    the host sees the same sessions. Readers never block the writer, and every
+    write is a short transaction. Blocking database calls run in a
+    worker thread so the event loop keeps serving requests.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._connection.executescript(_SCHEMA)
+        # One connection per process, shared by the worker threads.
+        self._lock = threading.Lock()
+        # Updates to one session from this process are serialized locally, so
+        # compare-and-set only has to resolve races with other processes.
+        self._update_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        logger.info("SqliteSessionStore initialized.", path=path)
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def _write(self, sql: str, parameters: tuple = ()) -> int:
+        with self._lock:
+            return self._connection.execute(sql, parameters).rowcount
+
+    async def create(self, state: SessionState):
+        await asyncio.to_thread(
+            self._write,
+            "INSERT INTO sessions (session_id, revision, state, updated_at) VALUES (?, ?, ?, ?)",
+            (state.session_id, state.revision, state.model_dump_json(), time.time())
+        )
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        rows = await asyncio.to_thread(self._query, "SELECT state FROM sessions WHERE session_id = ?", (session_id,))
+        return SessionState.model_validate_json(rows[0][0]) if rows else None
+
+    async def compare_and_set(self, state: SessionState, expected_revision: int) -> bool:
+        state.revision = expected_revision + 1
+        written = await asyncio.to_thread(
+            self._write,
+            "UPDATE sessions SET state = ?, revision = ?, updated_at = ? WHERE session_id = ? AND revision = ?",
+            (state.model_dump_json(), state.revision, time.time(), state.session_id, expected_revision)
+        )
+        if written != 1:
+            state.revision = expected_revision
+            return False
+        return True
+
+    async def update(self, session_id: str, mutate: Callable[[SessionState], T], max_attempts: int = 50) -> T:
+        lock = self._update_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._update_locks[session_id] = lock
+        async with lock:
+            return await super().update(session_id, mutate, max_attempts)
+
+    async def append_event(self, session_id: str, event: TimelineEvent) -> int:
+        return await asyncio.to_thread(self._append_event, session_id, event.model_dump_json())
+
+    def _append_event(self, session_id: str, event_json: str) -> int:
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so the next seq is read
+            # and used without another process appending in between.
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                if not self._connection.execute(
+                        "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone():
+                    raise ValueError(f"Session with ID '{session_id}' not found.")
+                seq = self._connection.execute(
+                    "SELECT COALESCE(MAX(seq), -1) + 1 FROM session_events WHERE session_id = ?", (session_id,)
+                ).fetchone()[0]
+                self._connection.execute(
+                    "INSERT INTO session_events (session_id, seq, event) VALUES (?, ?, ?)",
+                    (session_id, seq, event_json)
+                )
+                self._connection.execute(
+                    "UPDATE sessions SET updated_at = ? WHERE session_id = ?", (time.time(), session_id)
+                )
+                self._connection.execute("COMMIT")
+                return seq + 1
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    async def read_events(self, session_id: str, offset: int = 0) -> List[TimelineEvent]:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT event FROM session_events WHERE session_id = ? AND seq >= ? ORDER BY seq",
+            (session_id, offset)
+        )
+        return [TimelineEvent.model_validate_json(row[0]) for row in rows]
+
+    async def delete(self, session_id: str) -> bool:
+        return await asyncio.to_thread(self._delete, session_id)
+
+    def _delete(self, session_id: str) -> bool:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM session_events WHERE session_id = ?", (session_id,))
+                deleted = self._connection.execute(
+                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+                ).rowcount
+                self._connection.execute("COMMIT")
+                return deleted == 1
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    async def touch(self, session_id: str):
+        await asyncio.to_thread(
+            self._write, "UPDATE sessions SET updated_at = ? WHERE session_id = ?", (time.time(), session_id)
+        )
+
+    async def count(self) -> int:
+        rows = await asyncio.to_thread(self._query, "SELECT COUNT(*) FROM sessions")
+        return rows[0][0]
+
+    async def oldest_sessions(self, limit: int) -> List[SessionInfo]:
+        # Walks the updated_at index; the scene log is only summed for the rows returned.
+        rows = await asyncio.to_thread(
+            self._query,
+            """
+            SELECT s.session_id, s.updated_at,
+                   length(s.state) + COALESCE((SELECT SUM(length(e.event)) FROM session_events e
+                                               WHERE e.session_id = s.session_id), 0)
+            FROM sessions s
+            ORDER BY s.updated_at
+            LIMIT ?
+            """,
+            (max(0, limit),)
+        )
+        return [SessionInfo(session_id=row[0], last_active_at=row[1], size_bytes=row[2]) for row in rows]
+
+    async def total_bytes(self) -> int:
+        # Scans both tables in a worker thread; only the periodic reaper asks for it.
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT (SELECT COALESCE(SUM(length(state)), 0) FROM sessions)"
+            " + (SELECT COALESCE(SUM(length(event)), 0) FROM session_events)"
+        )
+        return rows[0][0]
+
+    async def existing(self, session_ids: Iterable[str]) -> Set[str]:
+        session_ids = list(session_ids)
+        found: Set[str] = set()
+        # Stay well below SQLite's limit on bound parameters.
+        for start in range(0, len(session_ids), 500):
+            chunk = session_ids[start:start + 500]
+            rows = await asyncio.to_thread(
+                self._query,
+                f"SELECT session_id FROM sessions WHERE session_id IN ({', '.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    async def close(self):
+        with self._lock:
+            self._connection.close()
+        logger.info("SqliteSessionStore closed.", path=self.path)
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+
+from src.application.services.storage_service import StorageService
+from src.infrastructure.services.local_storage_service import LocalStorageService
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class WriteBehindStorageService(StorageService):
+    """
+    A StorageService decorator that takes media writes off the request path.
+
+    save_file_async names the file, queues the write and returns the path at
+    once, so the model call does not wait for the disk. A few writer tasks
+    persist the queue on worker threads. The queue is bounded: when it is full,
+    callers wait for a free slot rather than buffering without limit.
+
+    Until a write lands, read_file serves the queued content. Failed writes
+    are logged and counted in stats() instead of failing the request that
+    stored the file.
+    """
+
+    def __init__(
+            self,
+            inner: LocalStorageService,
+            max_buffered_files: int = 64,
+            writers: int = 2,
+            drain_timeout_seconds: float = 10.0
+    ):
+        self.inner = inner
+        self.writers = writers
+        self.drain_timeout_seconds = drain_timeout_seconds
+        self._queue: "asyncio.Queue[Tuple[str, bytes, str, str, float]]" = asyncio.Queue(maxsize=max_buffered_files)
+        # Content not yet on disk, by path
+        self._pending: Dict[str, bytes] = {}
+        self._workers: List[asyncio.Task] = []
+        self._closed = False
+        self._write_seconds_avg: Optional[float] = None
+        self.counters: Counter = Counter()
+        logger.info("WriteBehindStorageService initialized.", max_buffered_files=max_buffered_files, writers=writers)
+
+    def start(self):
+        for index in range(self.writers):
+            self._workers.append(asyncio.create_task(self._writer(index)))
+
+    # --- StorageService ---
+
+    def save_file(self, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        """
+        Saves synchronously, for callers that need the file on disk when it returns.
+        """
+        return self.inner.save_file(file_bytes, original_filename, prefix)
+
+    async def save_file_async(self, file_bytes: bytes, original_filename: str, prefix: str) -> str:
+        path = self.inner.new_path(file_bytes, original_filename, prefix)
+        if self._closed or not self._workers:
+            # Nothing would drain the queue; write through instead.
+            await self._write(path, file_bytes, original_filename, prefix, time.time())
+            return path
+        if self._queue.full():
+            self.counters["buffer_full_waits"] += 1
+        await self._queue.put((path, file_bytes, original_filename, prefix, time.time()))
+        # Only once queued: a request cancelled while waiting for a slot leaves
+        # nothing behind. No writer can take the item before this line runs.
+        self._pending[path] = file_bytes
+        self.counters["queued"] += 1
+        return path
+
+    def read_file(self, path: str) -> bytes:
+        pending = self._pending.get(path)
+        if pending is not None:
+            self.counters["pending_reads"] += 1
+            return pending
+        return self.inner.read_file(path)
+
+    # --- Writers ---
+
+    async def _writer(self, index: int):
+        while True:
+            path, file_bytes, original_filename, prefix, queued_at = await self._queue.get()
+            try:
+                await self._write(path, file_bytes, original_filename, prefix, queued_at)
+            finally:
+                self._pending.pop(path, None)
+                self._queue.task_done()
+
+    async def _write(self, path: str, file_bytes: bytes, original_filename: str, prefix: str, queued_at: float):
+        try:
+            await asyncio.to_thread(self.inner.write_file, path, file_bytes, original_filename, prefix)
+        except Exception:
+            self.counters["failed"] += 1
+            logger.exception("Error writing file behind the request.", path=path, size_bytes=len(file_bytes))
+            return
+        # Seconds from the request handing the file over to it being on disk
+        seconds = time.time() - queued_at
+        self._write_seconds_avg = seconds if self._write_seconds_avg is None \
+            else 0.2 * seconds + 0.8 * self._write_seconds_avg
+        self.counters["written"] += 1
+        self.counters["bytes_written"] += len(file_bytes)
+
+    # --- Shutdown and stats ---
+
+    async def close(self):
+        """
+        Stops queueing, waits up to the drain timeout for queued writes to
+        land, then cancels the writers. Writes still queued after that are lost.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Storage writes did not drain in time; cancelling.", queued=self._queue.qsize())
+            self.counters["lost"] += self._queue.qsize()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        await self.inner.close()
+        logger.info("WriteBehindStorageService closed.", **self.counters)
+
+    def stats(self) -> dict:
+        return {
+            "writers": len(self._workers),
+            "buffered": len(self._pending),
+            "buffer_capacity": self._queue.maxsize,
+            "write_seconds_avg": round(self._write_seconds_avg, 4) if self._write_seconds_avg is not None else None,
+            **self.counters,
+            "backend": self.inner.stats(),
+        }
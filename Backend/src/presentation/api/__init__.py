@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import vqa, ocr, live_session, user, models
+from .endpoints import vqa, ocr, live_session, user, models, stats
 
 api_router = APIRouter()
 
@@ -7,4 +7,5 @@ api_router.include_router(user.router, prefix="/users", tags=["Users"])
 api_router.include_router(vqa.router, prefix="/vqa", tags=["VQA"])
 api_router.include_router(ocr.router, prefix="/ocr", tags=["OCR"])
 api_router.include_router(live_session.router, prefix="/session", tags=["Live Session"])
-api_router.include_router(models.router,prefix="/models",tags=["Models"])
\ No newline at end of file
+api_router.include_router(models.router,prefix="/models",tags=["Models"])
+api_router.include_router(stats.router, prefix="/stats", tags=["Stats"])
@@ -0,0 +1,234 @@
+import asyncio
+import os
+import structlog
+
+from src.application.services.dataset_service import DatasetService
+from src.application.services.media_processing_service import MediaProcessingService
+from src.application.services.prompt_service import PromptService
+from src.application.services.session_store import SessionStore
+from src.application.services.storage_service import StorageService
+from src.application.services.vision_service import VisionService
+from src.application.use_cases.backpressure import BackpressurePolicy
+from src.application.use_cases.live_session_use_case import LiveSessionUseCase
+from src.application.use_cases.narrative_notifier import NarrativeNotifier
+from src.application.use_cases.session_answer_cache import SessionAnswerCache
+from src.application.use_cases.session_scene_indexes import SessionSceneIndexes
+from src.application.use_cases.narrative_timeline import NarrativeBudget
+from src.application.use_cases.session_lifecycle_use_case import SessionLifecycleUseCase, SessionLimits
+from src.application.use_cases.session_worker_pool import SessionWorkerPool, WorkerPoolLimits
+from src.application.use_cases.object_extraction_job_use_case import ObjectExtractionJobUseCase
+from src.application.use_cases.ocr_use_case import OCRUseCase
+from src.application.use_cases.vqa_use_case import VQAUseCase
+from src.infrastructure.config import Settings
+from src.infrastructure.services.analysis_cache import AnalysisCache
+from src.infrastructure.services.cached_vision_service import CachedVisionService
+from src.infrastructure.services.content_addressed_storage_service import ContentAddressedStorageService
+from src.infrastructure.services.fake_vision_service import FakeVisionService
+from src.infrastructure.services.gemini_vision_service import GeminiVisionService
+from src.infrastructure.services.in_memory_session_store import InMemorySessionStore
+from src.infrastructure.services.local_storage_service import LocalStorageService
+from src.infrastructure.services.model_scheduler import ModelScheduler
+from src.infrastructure.services.mongo_dataset_service import MongoDatasetService
+from src.infrastructure.services.pillow_media_processing_service import PillowMediaProcessingService
+from src.infrastructure.services.prompt_loader_service import PromptLoaderService
+from src.infrastructure.services.sqlite_session_store import SqliteSessionStore
+from src.infrastructure.services.write_behind_storage_service import WriteBehindStorageService
+
+# Get a logger instance for this module
+logger = structlog.get_logger(__name__)
+
+
+class ServiceContainer:
+    """
+    Owns the long-lived services and use cases of the application.
+    It is built once in the app's lifespan and shared by every request, so
+    per-request work is limited to looking up attributes on this object.
+    """
+
+    def __init__(self, settings: Settings, models_config: dict):
+        self.settings = settings
+        self.models_config = models_config
+
+        # --- Shared infrastructure ---
+        self.model_scheduler = ModelScheduler(models_config.get("model_limits", {}))
+        self.analysis_cache = AnalysisCache(
+            max_bytes=settings.analysis_cache_max_bytes,
+            ttl_seconds=settings.analysis_cache_ttl_seconds,
+            disk_dir=os.path.join(settings.storage_dir, "analysis_cache") if settings.analysis_cache_disk_enabled else None
+        )
+
+        # --- Services ---
+        self.vision_service: VisionService = self._build_vision_service()
+        self.storage_service: StorageService = self._build_storage_service()
+        self.dataset_service: DatasetService = MongoDatasetService()
+        self.prompt_service: PromptService = PromptLoaderService()
+        self.media_service: MediaProcessingService = PillowMediaProcessingService(
+            preprocessing_config=models_config.get("image_preprocessing", {}),
+            frame_sampling_config=models_config.get("video_scene_extraction", {})
+        )
+        self.session_store: SessionStore = self._build_session_store()
+        self.session_worker_pool = SessionWorkerPool(WorkerPoolLimits(
+            concurrency=settings.session_worker_concurrency,
+            max_attempts=settings.session_job_max_attempts,
+            retry_base_seconds=settings.session_job_retry_base_seconds,
+            retry_max_seconds=settings.session_job_retry_max_seconds,
+            drain_timeout_seconds=settings.session_worker_drain_seconds
+        ))
+
+        self.narrative_notifier = NarrativeNotifier()
+        self.session_answer_cache = SessionAnswerCache(settings.session_answer_cache_entries)
+        self.session_scene_indexes = SessionSceneIndexes(self.session_store)
+
+        # --- Use cases ---
+        self.vqa_use_case = VQAUseCase(
+            vision_service=self.vision_service,
+            storage_service=self.storage_service,
+            dataset_service=self.dataset_service,
+            prompt_service=self.prompt_service,
+            media_service=self.media_service,
+            object_extraction_mode=models_config.get("objects_extractor", {}).get("extraction", "separate")
+        )
+        self.ocr_use_case = OCRUseCase(
+            vision_service=self.vision_service,
+            storage_service=self.storage_service,
+            prompt_service=self.prompt_service,
+            media_service=self.media_service
+        )
+        self.live_session_use_case = LiveSessionUseCase(
+            vision_service=self.vision_service,
+            storage_service=self.storage_service,
+            prompt_service=self.prompt_service,
+            media_service=self.media_service,
+            session_store=self.session_store,
+            worker_pool=self.session_worker_pool,
+            clip_extraction_mode=models_config.get("video_scene_extraction", {}).get("mode", "upload"),
+            frame_dedup_max_distance=settings.frame_dedup_max_distance,
+            frame_dedup_history=settings.frame_dedup_history,
+            narrative_budget=NarrativeBudget(
+                recent_token_budget=settings.narrative_recent_token_budget,
+                compaction_batch_token_budget=settings.aggregator_batch_token_budget,
+                max_segments=settings.narrative_max_segments,
+                prompt_token_budget=settings.narrative_prompt_token_budget,
+                retrieval_top_k=settings.session_retrieval_top_k,
+                retrieval_token_budget=settings.session_retrieval_token_budget
+            ),
+            reorder_max_wait_seconds=settings.session_reorder_max_wait_seconds,
+            backpressure=BackpressurePolicy(
+                max_in_flight=settings.session_max_in_flight,
+                min_capture_interval_seconds=settings.session_min_capture_interval_seconds,
+                max_capture_interval_seconds=settings.session_max_capture_interval_seconds
+            ),
+            narrative_notifier=self.narrative_notifier,
+            version_poll_seconds=settings.session_version_poll_seconds,
+            answer_cache=self.session_answer_cache,
+            scene_indexes=self.session_scene_indexes
+        )
+        self.session_lifecycle_use_case = SessionLifecycleUseCase(
+            session_store=self.session_store,
+            limits=SessionLimits(
+                idle_ttl_seconds=settings.session_idle_ttl_seconds,
+                max_sessions=settings.session_max_count,
+                max_bytes=settings.session_max_bytes
+            ),
+            narrative_notifier=self.narrative_notifier,
+            answer_cache=self.session_answer_cache,
+            scene_indexes=self.session_scene_indexes
+        )
+        self.object_extraction_job_use_case = ObjectExtractionJobUseCase(
+            vision_service=self.vision_service,
+            storage_service=self.storage_service,
+            dataset_service=self.dataset_service,
+            media_service=self.media_service
+        )
+        self._background_tasks: list[asyncio.Task] = []
+        logger.info("ServiceContainer initialized.")
+
+    def start(self):
+        """
+        Starts the app-scoped background tasks. Called once the event loop is running.
+        """
+        self.storage_service.start()
+        self.session_worker_pool.start()
+        self._background_tasks.append(asyncio.create_task(
+            self.session_lifecycle_use_case.run_reaper(self.settings.session_reaper_interval_seconds)
+        ))
+
+    def _build_vision_service(self) -> VisionService:
+        if self.settings.vision_backend == "fake":
+            logger.warning("Using the offline FakeVisionService.", config_path=self.settings.fake_vision_config_path)
+            vision_service = FakeVisionService.from_file(
+                self.settings.fake_vision_config_path,
+                scheduler=self.model_scheduler,
+                models_config=self.models_config
+            )
+        elif self.settings.vision_backend == "gemini":
+            vision_service = GeminiVisionService(
+                timeout=self.settings.model_timeout_seconds,
+                models_config=self.models_config,
+                scheduler=self.model_scheduler,
+                video_poll_initial_seconds=self.settings.video_poll_initial_seconds,
+                video_poll_max_seconds=self.settings.video_poll_max_seconds,
+                video_processing_deadline_seconds=self.settings.video_processing_deadline_seconds
+            )
+        else:
+            raise RuntimeError(f"FATAL: Unknown vision backend '{self.settings.vision_backend}'.")
+        # The backend itself, for its stats; requests go through the cache when it is enabled.
+        self.vision_backend = vision_service
+        if self.settings.analysis_cache_enabled:
+            return CachedVisionService(inner=vision_service, cache=self.analysis_cache)
+        return vision_service
+
+    def _build_storage_service(self) -> StorageService:
+        if self.settings.storage_layout == "content_addressed":
+            storage_service = ContentAddressedStorageService(
+                self.settings.storage_dir,
+                shard_depth=self.settings.storage_shard_depth
+            )
+        elif self.settings.storage_layout == "flat":
+            storage_service = LocalStorageService(self.settings.storage_dir)
+        else:
+            raise RuntimeError(f"FATAL: Unknown storage layout '{self.settings.storage_layout}'.")
+        if self.settings.storage_write_behind_enabled:
+            return WriteBehindStorageService(
+                inner=storage_service,
+                max_buffered_files=self.settings.storage_write_buffer_files,
+                writers=self.settings.storage_writers,
+                drain_timeout_seconds=self.settings.storage_write_drain_seconds
+            )
+        return storage_service
+
+    def _build_session_store(self) -> SessionStore:
+        if self.settings.session_store_backend == "sqlite":
+            return SqliteSessionStore(self.settings.session_store_path)
+        if self.settings.session_store_backend == "memory":
+            return InMemorySessionStore()
+        raise RuntimeError(f"FATAL: Unknown session store backend '{self.settings.session_store_backend}'.")
+
+    def stats(self) -> dict:
+        """
+        Gauges of the services shared by every route: the per-model slots of
+        the scheduler, the analysis cache, the media storage writes and, for
+        the offline backend, its simulated model calls.
+        """
+        stats = {
+            "model_scheduler": self.model_scheduler.stats(),
+            "analysis_cache": self.analysis_cache.stats() if self.settings.analysis_cache_enabled else None,
+            "storage": self.storage_service.stats(),
+        }
+        if isinstance(self.vision_backend, FakeVisionService):
+            stats["fake_vision"] = self.vision_backend.stats()
+        return stats
+
+    async def aclose(self):
+        """
+        Releases resources held by the container on application shutdown.
+        """
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        # Let queued session work finish while the store is still open.
+        await self.session_worker_pool.close()
+        await self.session_store.close()
+        # Session work may still have stored media, so writes drain last.
+        await self.storage_service.close()
+        logger.info("ServiceContainer shut down.")
@@ -1,70 +1,61 @@
 from fastapi import Depends
+from starlette.requests import HTTPConnection
 from src.application.services.dataset_service import DatasetService
 from src.application.services.storage_service import StorageService
 from src.application.services.vision_service import VisionService
 from src.application.services.prompt_service import PromptService
+from src.application.services.media_processing_service import MediaProcessingService
 from src.application.use_cases.vqa_use_case import VQAUseCase
 from src.application.use_cases.ocr_use_case import OCRUseCase
 from src.application.use_cases.live_session_use_case import LiveSessionUseCase
-from src.infrastructure.config import get_settings, Settings
-from src.infrastructure.services.gemini_vision_service import GeminiVisionService
-from src.infrastructure.services.local_storage_service import LocalStorageService
-from src.infrastructure.services.mongo_dataset_service import MongoDatasetService
-from src.infrastructure.services.prompt_loader_service import PromptLoaderService
-from src.presentation.api.dependencies import get_models_config
+from src.application.use_cases.session_lifecycle_use_case import SessionLifecycleUseCase
+from src.infrastructure.config import Settings
+from src.presentation.api.container import ServiceContainer
+
+# All services and use cases are app-scoped singletons owned by the
+# ServiceContainer built in main.py's lifespan. These providers only look them up.
+
+def get_container(connection: HTTPConnection) -> ServiceContainer:
+    """Provides the ServiceContainer created at application startup, to HTTP and WebSocket routes alike."""
+    return connection.app.state.container
+
+def get_app_settings(container: ServiceContainer = Depends(get_container)) -> Settings:
+    return container.settings
 
 # --- Service Providers ---
 
-def get_vision_service(settings: Settings = Depends(get_settings), models_config: dict = Depends(get_models_config)) -> VisionService:
-    return GeminiVisionService(timeout=settings.model_timeout_seconds, models_config=models_config)
+def get_vision_service(container: ServiceContainer = Depends(get_container)) -> VisionService:
+    return container.vision_service
 
-def get_storage_service(settings: Settings = Depends(get_settings)) -> StorageService:
-    return LocalStorageService(settings.storage_dir)
+def get_storage_service(container: ServiceContainer = Depends(get_container)) -> StorageService:
+    return container.storage_service
 
-def get_dataset_service() -> DatasetService:
-    """Provides an instance of the MongoDatasetService."""
-    return MongoDatasetService()
+def get_dataset_service(container: ServiceContainer = Depends(get_container)) -> DatasetService:
+    """Provides the shared MongoDatasetService."""
+    return container.dataset_service
 
-def get_prompt_service() -> PromptService:
-    """Provides an instance of the PromptLoaderService."""
-    return PromptLoaderService()
+def get_prompt_service(container: ServiceContainer = Depends(get_container)) -> PromptService:
+    """Provides the shared PromptLoaderService."""
+    return container.prompt_service
+
+def get_media_service(container: ServiceContainer = Depends(get_container)) -> MediaProcessingService:
+    """Provides the shared PillowMediaProcessingService."""
+    return container.media_service
 
 # --- Use Case Providers ---
 
-def get_vqa_use_case(
-    vision_service: VisionService = Depends(get_vision_service),
-    storage_service: StorageService = Depends(get_storage_service),
-    dataset_service: DatasetService = Depends(get_dataset_service),
-    prompt_service: PromptService = Depends(get_prompt_service),
-) -> VQAUseCase:
-    """Constructs the VQAUseCase with all its required dependencies."""
-    return VQAUseCase(
-        vision_service=vision_service,
-        storage_service=storage_service,
-        dataset_service=dataset_service,
-        prompt_service=prompt_service
-    )
+def get_vqa_use_case(container: ServiceContainer = Depends(get_container)) -> VQAUseCase:
+    """Provides the VQAUseCase wired with all its required dependencies."""
+    return container.vqa_use_case
+
+def get_ocr_use_case(container: ServiceContainer = Depends(get_container)) -> OCRUseCase:
+    """Provides the OCRUseCase wired with its required dependencies."""
+    return container.ocr_use_case
 
-def get_ocr_use_case(
-    vision_service: VisionService = Depends(get_vision_service),
-    storage_service: StorageService = Depends(get_storage_service),
-    prompt_service: PromptService = Depends(get_prompt_service),
-) -> OCRUseCase:
-    """Constructs the OCRUseCase with its required dependencies."""
-    return OCRUseCase(
-        vision_service=vision_service,
-        storage_service=storage_service,
-        prompt_service=prompt_service
-    )
+def get_live_session_use_case(container: ServiceContainer = Depends(get_container)) -> LiveSessionUseCase:
+    """Provides the LiveSessionUseCase wired with its required dependencies."""
+    return container.live_session_use_case
 
-def get_live_session_use_case(
-    vision_service: VisionService = Depends(get_vision_service),
-    storage_service: StorageService = Depends(get_storage_service),
-    prompt_service: PromptService = Depends(get_prompt_service),
-) -> LiveSessionUseCase:
-    """Constructs the LiveSessionUseCase with its required dependencies."""
-    return LiveSessionUseCase(
-        vision_service=vision_service,
-        storage_service=storage_service,
-        prompt_service=prompt_service
-    )
\ No newline at end of file
+def get_session_lifecycle_use_case(container: ServiceContainer = Depends(get_container)) -> SessionLifecycleUseCase:
+    """Provides the SessionLifecycleUseCase that ends and evicts live sessions."""
+    return container.session_lifecycle_use_case
@@ -1,3 +1,10 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Optional, Set, Tuple
+
 import structlog
 from fastapi import (
     APIRouter,
@@ -6,9 +13,14 @@ from fastapi import (
     File,
     Form,
     HTTPException,
-    BackgroundTasks,
+    Header,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
     status,
 )
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from src.presentation.api.dependencies import get_models_config
 from src.application.use_cases.live_session_use_case import LiveSessionUseCase
@@ -18,9 +30,17 @@ from src.domain.entities import (
     SessionCreationResult,
     SessionQueryResult,
     SessionQueryRequest,
+    SessionStatus,
+    NarrativeSnapshot,
     AnalysisMode
 )
-from src.presentation.api.deps import get_live_session_use_case
+from src.application.use_cases.session_lifecycle_use_case import SessionLifecycleUseCase
+from src.application.use_cases.session_worker_pool import WorkerPoolClosedError
+from src.application.use_cases.backpressure import SessionOverloadedError
+from src.application.use_cases.narrative_timeline import CaptureOrderError
+from src.application.services.media_processing_service import InvalidMediaError
+from src.infrastructure.config import Settings
+from src.presentation.api.deps import get_app_settings, get_live_session_use_case, get_session_lifecycle_use_case
 from src.domain.entities.live_session import SessionAnalysVideoRequest
 
 # Get a logger instance for this module
@@ -30,14 +50,16 @@ router = APIRouter()
 
 
 @router.post("/start", response_model=SessionCreationResult, status_code=status.HTTP_201_CREATED)
-def start_session_endpoint(
+async def start_session_endpoint(
         use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+        lifecycle: SessionLifecycleUseCase = Depends(get_session_lifecycle_use_case),
 ):
     """
     Starts a new live session and returns a unique session ID for the client to use.
     """
     try:
-        session_id = use_case.create_session()
+        session_id = await use_case.create_session()
+        await lifecycle.enforce_count_limit()
         logger.info("API: New session started successfully.", session_id=session_id)
         return SessionCreationResult(session_id=session_id)
     except Exception as e:
@@ -45,21 +67,135 @@ def start_session_endpoint(
         raise HTTPException(status_code=500, detail=f"Failed to create session: {e}")
 
 
+@router.post("/{session_id}/end")
+async def end_session_endpoint(
+        session_id: str,
+        lifecycle: SessionLifecycleUseCase = Depends(get_session_lifecycle_use_case),
+):
+    """
+    Ends a live session and frees everything held for it.
+    """
+    if not await lifecycle.end_session(session_id):
+        raise HTTPException(status_code=404, detail=f"Session with ID '{session_id}' not found.")
+    return {"status": "session_ended", "session_id": session_id}
+
+
+@router.get("/stats")
+async def session_stats_endpoint(
+        use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+        lifecycle: SessionLifecycleUseCase = Depends(get_session_lifecycle_use_case),
+):
+    """
+    Reports gauges for live sessions: how many there are, the bytes they hold
+    and how many were evicted, plus the state of the session worker pool, the
+    answer cache and the media storage writes they share with VQA and OCR.
+    """
+    return {
+        **await lifecycle.stats(),
+        "worker_pool": use_case.worker_pool.stats(),
+        "answer_cache": use_case.answer_cache.stats(),
+        "storage": use_case.storage_service.stats()
+    }
+
+
+@router.get("/{session_id}/status", response_model=SessionStatus)
+async def session_status_endpoint(
+        session_id: str,
+        use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+):
+    """
+    Reports the session's backlog (captures in flight, extraction lag) and the
+    capture interval the client should use to keep up.
+    """
+    try:
+        return await use_case.get_status(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{session_id}/narrative", response_model=NarrativeSnapshot)
+async def narrative_long_poll_endpoint(
+        session_id: str,
+        after: int = Query(-1, description="Return once the narrative version is greater than this."),
+        timeout: float = Query(25.0, ge=0),
+        use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+        settings: Settings = Depends(get_app_settings),
+):
+    """
+    Long-polls the session narrative. Responds as soon as its version passes
+    `after`, or with the unchanged narrative once `timeout` seconds pass.
+    """
+    try:
+        return await use_case.get_narrative(session_id, after, min(timeout, settings.session_wait_max_seconds))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{session_id}/narrative/stream")
+async def narrative_event_stream_endpoint(
+        session_id: str,
+        last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+        use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+        settings: Settings = Depends(get_app_settings),
+):
+    """
+    Streams the session narrative as server-sent events. Each change is sent
+    as a 'narrative' event whose id is the narrative version, so a client
+    that reconnects with Last-Event-ID only gets newer versions.
+    """
+    try:
+        await use_case.get_status(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    after = int(last_event_id) if last_event_id and last_event_id.lstrip("-").isdigit() else -1
+
+    async def events():
+        version = after
+        while True:
+            try:
+                snapshot = await use_case.get_narrative(session_id, version, settings.session_wait_max_seconds)
+            except ValueError:
+                yield "event: end\ndata: {}\n\n"
+                return
+            if snapshot.narrative_version > version:
+                version = snapshot.narrative_version
+                yield f"event: narrative\nid: {version}\ndata: {snapshot.model_dump_json()}\n\n"
+            else:
+                # A comment line keeps proxies from closing an idle connection.
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _overloaded(session_id: str, error: SessionOverloadedError) -> HTTPException:
+    logger.warning("API: Session is at its in-flight cap.", session_id=session_id)
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after_seconds)))}
+    )
+
+
 @router.post("/process-clip", status_code=status.HTTP_202_ACCEPTED)
 async def process_clip_endpoint(
         # --- Dependencies ---
-        background_tasks: BackgroundTasks,
         use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
         models_config: dict = Depends(get_models_config),
 
         # --- User Inputs ---
         session_id: str = Form(...),
         video_clip: UploadFile = File(...),
+        sequence: Optional[int] = Form(None),
+        captured_at: Optional[float] = Form(None),
 ):
     """
     Accepts a video clip for asynchronous processing.
-    It saves the clip, adds the analysis to a background task queue,
-    and returns immediately.
+    It queues the clip on the session worker pool, which saves and
+    analyzes it, and returns immediately. Clients may send a capture
+    `sequence` number or `captured_at` time (epoch seconds) so that
+    descriptions reach the timeline in capture order. A session's first
+    capture decides whether it is ordered by sequence number or by time;
+    a later capture that does not follow suit is rejected with 400.
     """
     logger.info("API: Received request to process video clip.", session_id=session_id, filename=video_clip.filename)
     # Basic validation for video content type
@@ -95,12 +231,25 @@ async def process_clip_endpoint(
             session_id= session_id,
             analysis_model_option= extractor_model,  # The analysis model
             aggregation_model_option= aggregator_model,  # The aggregator model
-            media= video_file
+            media= video_file,
+            sequence=sequence,
+            captured_at=captured_at
         )
-        # Add the heavy processing to a background task
-        background_tasks.add_task(use_case.run_extraction_task,session_analysis_video_request, background_tasks)
+        # Hand the heavy processing to the session worker pool
+        await use_case.submit_media(session_analysis_video_request)
 
-        return {"status": "clip_processing_started", "session_id": session_id}
+        status_report = await use_case.get_status(session_id)
+        return {"status": "clip_processing_started", "session_id": session_id, "backpressure": status_report}
+    except SessionOverloadedError as e:
+        raise _overloaded(session_id, e)
+    except CaptureOrderError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolClosedError:
+        raise HTTPException(status_code=503, detail="The server is shutting down.")
+    except ValueError as e:
+        # This catches the error if the session ID is not found
+        logger.warning("API: Clip sent for non-existent session.", session_id=session_id)
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.exception("API: Error handling process-clip request.", session_id=session_id)
         raise HTTPException(status_code=500, detail=f"Error processing clip: {e}")
@@ -109,18 +258,20 @@ async def process_clip_endpoint(
 @router.post("/process-frame", status_code=status.HTTP_202_ACCEPTED)
 async def process_frame_endpoint(
         # --- Dependencies ---
-        background_tasks: BackgroundTasks,
         use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
         models_config: dict = Depends(get_models_config),  # <-- Inject config
 
         # --- User Inputs ---
         session_id: str = Form(...),
         image_frame: UploadFile = File(...),
+        sequence: Optional[int] = Form(None),
+        captured_at: Optional[float] = Form(None),
 ):
     """
     Accepts a single image frame for asynchronous processing.
-    It saves the frame, adds the analysis to a background task queue,
-    and returns immediately.
+    It queues the frame on the session worker pool, which saves and
+    analyzes it, and returns immediately. See process-clip for
+    `sequence` and `captured_at`.
     """
     logger.info("API: Received request to process image frame.", session_id=session_id, filename=image_frame.filename)
     # Basic validation for image content type
@@ -155,12 +306,30 @@ async def process_frame_endpoint(
             session_id=session_id,
             analysis_model_option=extractor_model,  # The analysis model
             aggregation_model_option=aggregator_model,  # The aggregator model
-            media=image_file
+            media=image_file,
+            sequence=sequence,
+            captured_at=captured_at
         )
-        # Add the heavy processing to a background task
-        background_tasks.add_task(use_case.run_extraction_task, session_analysis_video_request, background_tasks)
+        # Hand the heavy processing to the session worker pool. A near-identical
+        # frame adds nothing to the narrative, so it is not queued.
+        if await use_case.submit_media(session_analysis_video_request) is None:
+            status_report = await use_case.get_status(session_id)
+            return {"status": "frame_deduplicated", "session_id": session_id, "deduplicated": True,
+                    "backpressure": status_report}
 
-        return {"status": "frame_processing_started", "session_id": session_id}
+        status_report = await use_case.get_status(session_id)
+        return {"status": "frame_processing_started", "session_id": session_id, "deduplicated": False,
+                "backpressure": status_report}
+    except SessionOverloadedError as e:
+        raise _overloaded(session_id, e)
+    except (CaptureOrderError, InvalidMediaError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolClosedError:
+        raise HTTPException(status_code=503, detail="The server is shutting down.")
+    except ValueError as e:
+        # This catches the error if the session ID is not found
+        logger.warning("API: Frame sent for non-existent session.", session_id=session_id)
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.exception("API: Error handling process-frame request.", session_id=session_id)
         raise HTTPException(status_code=500, detail=f"Error processing frame: {e}")
@@ -177,9 +346,16 @@ async def query_session_endpoint(
         question: str = Form(...),
         model_option: str = Form(...),
         mode: str = Form(...),
+        min_version: Optional[int] = Form(None),
+        wait_seconds: float = Form(10.0),
+        settings: Settings = Depends(get_app_settings),
 ):
     """
     Accepts a question about a session and returns an answer.
+    With `min_version`, the answer waits up to `wait_seconds` for the narrative
+    to reach that version, e.g. the version a client last saw on the narrative
+    endpoints plus one. If it is not reached in time, the answer is based on
+    the current narrative and marked as stale.
     """
     logger.info("API: Received request to query session.", session_id=session_id)
 
@@ -208,6 +384,8 @@ async def query_session_endpoint(
             question=question,
             model_option=model_option,  # <-- Use validated user input
             mode=analysis_mode,  # <-- Use validated user input
+            min_version=min_version,
+            wait_seconds=min(max(0.0, wait_seconds), settings.session_wait_max_seconds),
         )
         result = await use_case.answer_question(request)
         return result
@@ -215,6 +393,206 @@ async def query_session_endpoint(
         # This catches the error if the session ID is not found
         logger.warning("API: Query for non-existent session.", session_id=session_id)
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        # Keep the original status, e.g. a 429/503 when the model queue is full.
+        raise
     except Exception as e:
         logger.exception("API: Error handling query request.", session_id=session_id)
         raise HTTPException(status_code=500, detail=f"Error answering question: {e}")
+
+
+def _session_models(models_config: dict) -> Optional[Tuple[str, str]]:
+    """
+    Returns the forced extractor and aggregator models for live sessions, or
+    None if either is missing from the configuration.
+    """
+    extractor_config = models_config.get("video_scene_extractor", {}).get("models")
+    aggregator_config = models_config.get("video_scene_aggregator", {}).get("models")
+    if not isinstance(extractor_config, list) or not extractor_config or not extractor_config[0]:
+        return None
+    if not isinstance(aggregator_config, list) or not aggregator_config or not aggregator_config[0]:
+        return None
+    return extractor_config[0], aggregator_config[0]
+
+
+# WebSocket close codes; 4000-4999 are free for applications.
+WS_CLOSE_SESSION_NOT_FOUND = 4404
+
+
+@router.websocket("/{session_id}/stream")
+async def stream_session_endpoint(
+        websocket: WebSocket,
+        session_id: str,
+        use_case: LiveSessionUseCase = Depends(get_live_session_use_case),
+        models_config: dict = Depends(get_models_config),
+        settings: Settings = Depends(get_app_settings),
+):
+    """
+    Streams frames into a live session over one connection, instead of one
+    multipart POST per frame.
+
+    The client sends each frame as a binary message, optionally preceded by a
+    JSON text message with its metadata, e.g.
+    {"sequence": 12, "captured_at": 1718000000.5, "content_type": "image/jpeg"}.
+    The server sends JSON messages back:
+    - {"type": "ack", "frame": n, "sequence": 12, "status": "queued" | "deduplicated" | "dropped" | "rejected"}
+      for every frame, where `frame` counts binary messages on this connection;
+    - {"type": "description", ...} for each new scene description of the session,
+      as soon as it is available;
+    - {"type": "summary", ...} when older events have been compacted;
+    - {"type": "status", ...} when the session's backlog changes, with the
+      recommended capture interval (see GET /{session_id}/status);
+    - {"type": "error", "detail": ...} for messages that could not be used.
+    When extraction falls behind, the oldest frames still waiting on this
+    connection are dropped in favour of newer ones.
+    """
+    await websocket.accept()
+    models = _session_models(models_config)
+    if models is None:
+        logger.error("Server config error: live session models are not defined.")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Server configuration error.")
+        return
+    extractor_model, aggregator_model = models
+    try:
+        await use_case.read_updates(session_id, offset=0)
+    except ValueError as e:
+        await websocket.close(code=WS_CLOSE_SESSION_NOT_FOUND, reason=str(e))
+        return
+    logger.info("API: Frame stream opened.", session_id=session_id)
+
+    send_lock = asyncio.Lock()
+    # Frames waiting for an extraction slot: (frame number, metadata, content, received at)
+    waiting: Deque[Tuple[int, dict, bytes, float]] = deque()
+    frame_arrived = asyncio.Event()
+
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def ack(frame: int, metadata: dict, frame_status: str, **extra):
+        await send({"type": "ack", "frame": frame, "sequence": metadata.get("sequence"), "status": frame_status, **extra})
+
+    async def receive_frames():
+        metadata: dict = {}
+        frame = 0
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("text") is not None:
+                try:
+                    metadata = json.loads(message["text"])
+                    if not isinstance(metadata, dict):
+                        raise ValueError("Frame metadata must be a JSON object.")
+                except ValueError as e:
+                    metadata = {}
+                    await send({"type": "error", "detail": f"Invalid frame metadata: {e}"})
+                continue
+            if message.get("bytes") is None:
+                continue
+            if len(waiting) >= settings.session_stream_buffer_frames:
+                # Extraction is behind; a newer frame is worth more than a stale one.
+                stale_frame, stale_metadata, _content, _received_at = waiting.popleft()
+                await ack(stale_frame, stale_metadata, "dropped")
+            waiting.append((frame, metadata, message["bytes"], time.time()))
+            frame_arrived.set()
+            metadata = {}
+            frame += 1
+
+    async def submit_frames():
+        in_extraction: Set[asyncio.Future] = set()
+        while True:
+            if not waiting:
+                frame_arrived.clear()
+                await frame_arrived.wait()
+                continue
+            if len(in_extraction) >= settings.session_stream_max_in_flight:
+                # Newer frames may push the waiting ones out meanwhile.
+                _done, pending = await asyncio.wait(in_extraction, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+                in_extraction = set(pending)
+                continue
+            frame, metadata, content, received_at = waiting.popleft()
+            try:
+                image_file = ImageFile(
+                    filename=metadata.get("filename") or f"stream_frame_{frame}.jpg",
+                    content_type=metadata.get("content_type") or "image/jpeg",
+                    content=content,
+                )
+                request = SessionAnalysVideoRequest(
+                    session_id=session_id,
+                    analysis_model_option=extractor_model,
+                    aggregation_model_option=aggregator_model,
+                    media=image_file,
+                    received_at=received_at,
+                    sequence=metadata.get("sequence"),
+                    captured_at=metadata.get("captured_at")
+                )
+            except ValidationError as e:
+                await ack(frame, metadata, "rejected", detail=str(e))
+                continue
+            try:
+                extraction = await use_case.submit_media(request)
+            except SessionOverloadedError as e:
+                await ack(frame, metadata, "dropped", retry_after_seconds=e.retry_after_seconds)
+                continue
+            except (CaptureOrderError, InvalidMediaError) as e:
+                # Only this frame is bad; the stream goes on.
+                await ack(frame, metadata, "rejected", detail=str(e))
+                continue
+            if extraction is None:
+                await ack(frame, metadata, "deduplicated")
+                continue
+            in_extraction.add(extraction)
+            await ack(frame, metadata, "queued")
+
+    async def push_updates():
+        offset = 0
+        last_summary = None
+        last_status = None
+        seen_version = -1
+        while True:
+            # Push as soon as the narrative changes, and refresh the status at least every interval.
+            session = await use_case.wait_for_version(
+                session_id, seen_version + 1, settings.session_stream_update_interval_seconds
+            )
+            seen_version = session.narrative_version
+            status_report = await use_case.get_status(session_id)
+            if status_report.model_dump(exclude={"extraction_lag_seconds"}) != last_status:
+                await send({"type": "status", **status_report.model_dump()})
+                last_status = status_report.model_dump(exclude={"extraction_lag_seconds"})
+            events, summary = await use_case.read_updates(session_id, offset)
+            for event in events:
+                await send({"type": "description", **event.model_dump()})
+            offset += len(events)
+            if summary is not None and summary != last_summary:
+                await send({"type": "summary", **summary.model_dump()})
+                last_summary = summary
+
+    tasks = [asyncio.create_task(receive_frames()), asyncio.create_task(submit_frames()),
+             asyncio.create_task(push_updates())]
+    try:
+        done, _pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Also runs if the endpoint itself is cancelled, so no task outlives the connection.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    close_code, reason = None, ""
+    for task in done:
+        error = task.exception()
+        if error is None or isinstance(error, WebSocketDisconnect):
+            continue
+        if isinstance(error, ValueError):
+            close_code, reason = WS_CLOSE_SESSION_NOT_FOUND, str(error)
+        elif isinstance(error, WorkerPoolClosedError):
+            close_code, reason = status.WS_1012_SERVICE_RESTART, "The server is shutting down."
+        else:
+            logger.error("API: Frame stream failed.", session_id=session_id, exc_info=error)
+            close_code, reason = status.WS_1011_INTERNAL_ERROR, "Internal error."
+    if close_code is not None:
+        try:
+            await websocket.close(code=close_code, reason=reason)
+        except RuntimeError:
+            pass  # The client is already gone.
+    logger.info("API: Frame stream closed.", session_id=session_id, close_code=close_code)
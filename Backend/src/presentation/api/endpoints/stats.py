@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from src.presentation.api.container import ServiceContainer
+from src.presentation.api.deps import get_container
+
+router = APIRouter()
+
+
+@router.get("/")
+async def service_stats_endpoint(container: ServiceContainer = Depends(get_container)):
+    """
+    Reports gauges of the services shared by every route: model scheduling,
+    the analysis cache, media storage writes and, with the offline backend,
+    its simulated model calls. Live-session gauges are on /session/stats.
+    """
+    return container.stats()
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.domain.entities import AnalysisResult
+from src.infrastructure.services.analysis_cache import AnalysisCache
+
+
+def make_cache() -> AnalysisCache:
+    return AnalysisCache(max_bytes=1024 * 1024, ttl_seconds=60)
+
+
+def test_concurrent_requests_for_one_key_share_one_call():
+    calls = 0
+
+    async def compute() -> AnalysisResult:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return AnalysisResult(text="a cup", processing_time=0.01)
+
+    async def scenario():
+        cache = make_cache()
+        results = await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(5)))
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+    assert calls == 1
+    assert {result.text for result in results} == {"a cup"}
+    assert cache.misses == 1
+    assert cache.coalesced == 4
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached():
+    calls = 0
+
+    async def failing() -> AnalysisResult:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model down")
+
+    async def scenario():
+        cache = make_cache()
+        results = await asyncio.gather(*(cache.get_or_compute("key", failing) for _ in range(3)),
+                                       return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("key", failing)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # One call for the coalesced burst, one for the retry afterwards.
+    assert calls == 2
+
+
+def test_waiters_take_over_when_the_leader_is_cancelled():
+    calls = 0
+
+    async def compute() -> AnalysisResult:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return AnalysisResult(text="a door", processing_time=0.05)
+
+    async def scenario():
+        cache = make_cache()
+        leader = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()).text == "a door"
+    assert calls == 2
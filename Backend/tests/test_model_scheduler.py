@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.services.model_scheduler import ModelLimiter, ModelLimits
+
+
+def test_full_queue_without_rate_limit_is_rejected_with_503():
+    async def scenario():
+        limiter = ModelLimiter("m", ModelLimits(max_in_flight=1, requests_per_minute=0, max_queue=0))
+        await limiter.acquire()
+        with pytest.raises(HTTPException) as rejected:
+            await limiter.acquire()
+        return limiter, rejected.value
+
+    limiter, error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
+    assert limiter.rejected == 1
+    assert limiter.in_flight == 1
+
+
+def test_full_queue_while_rate_limited_is_rejected_with_429():
+    async def scenario():
+        limiter = ModelLimiter("m", ModelLimits(max_in_flight=4, requests_per_minute=1, max_queue=0))
+        await limiter.acquire()
+        limiter.release(0.1)
+        with pytest.raises(HTTPException) as rejected:
+            await limiter.acquire()
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    # The budget frees up one minute after the first call started.
+    assert 55 <= int(error.headers["Retry-After"]) <= 125
+
+
+def test_queued_caller_times_out_with_503():
+    async def scenario():
+        limiter = ModelLimiter("m", ModelLimits(max_in_flight=1, requests_per_minute=0, max_queue=1,
+                                                queue_timeout_seconds=0.05))
+        await limiter.acquire()
+        with pytest.raises(HTTPException) as rejected:
+            await limiter.acquire()
+        return limiter, rejected.value
+
+    limiter, error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert "Retry-After" in error.headers
+    assert limiter.timed_out == 1
+    assert limiter.stats()["queued"] == 0
+
+
+def test_released_slots_go_to_waiters_in_arrival_order():
+    async def scenario():
+        limiter = ModelLimiter("m", ModelLimits(max_in_flight=1, requests_per_minute=0, max_queue=4))
+        await limiter.acquire()
+        started = []
+
+        async def caller(name: str):
+            await limiter.acquire()
+            started.append(name)
+
+        waiters = [asyncio.create_task(caller(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        for _ in waiters:
+            limiter.release(0.1)
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        return started
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
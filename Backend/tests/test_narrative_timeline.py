@@ -0,0 +1,60 @@
+from src.application.use_cases.narrative_timeline import release_pending_events
+from src.domain.entities.live_session import InFlightCapture, SessionState, TimelineEvent
+
+NOW = 1000.0
+
+
+def capture(order_key: float, submitted_at: float = NOW) -> InFlightCapture:
+    return InFlightCapture(order_key=order_key, submitted_at=submitted_at)
+
+
+def describe(session: SessionState, item: InFlightCapture):
+    # What finishing an extraction does: out of flight, into the reorder buffer.
+    session.in_flight = [other for other in session.in_flight if other.capture_id != item.capture_id]
+    session.pending_descriptions.append(
+        TimelineEvent(text=f"scene {int(item.order_key)}", timestamp=NOW, order_key=item.order_key)
+    )
+
+
+def timeline(session: SessionState) -> list:
+    return [event.text for event in session.recent_events]
+
+
+def test_descriptions_finishing_out_of_order_reach_the_timeline_in_capture_order():
+    first, second, third = capture(1), capture(2), capture(3)
+    session = SessionState(session_id="s", in_flight=[first, second, third])
+
+    describe(session, third)
+    assert release_pending_events(session, NOW, max_wait_seconds=5) is not None
+    assert timeline(session) == []
+
+    describe(session, first)
+    release_pending_events(session, NOW, max_wait_seconds=5)
+    assert timeline(session) == ["scene 1"]
+
+    describe(session, second)
+    assert release_pending_events(session, NOW, max_wait_seconds=5) is None
+    assert timeline(session) == ["scene 1", "scene 2", "scene 3"]
+    assert session.pending_descriptions == []
+
+
+def test_held_description_is_released_after_the_wait_and_the_late_one_slotted_in():
+    late, early = capture(1, submitted_at=NOW - 10), capture(2)
+    session = SessionState(session_id="s", in_flight=[late, early])
+
+    describe(session, early)
+    # The earlier capture has been in flight longer than the wait allows.
+    assert release_pending_events(session, NOW, max_wait_seconds=5) is None
+    assert timeline(session) == ["scene 2"]
+
+    describe(session, late)
+    release_pending_events(session, NOW, max_wait_seconds=5)
+    assert timeline(session) == ["scene 1", "scene 2"]
+
+
+def test_wait_hint_counts_down_from_the_oldest_blocking_capture():
+    blocking, finished = capture(1, submitted_at=NOW - 2), capture(2)
+    session = SessionState(session_id="s", in_flight=[blocking, finished])
+
+    describe(session, finished)
+    assert release_pending_events(session, NOW, max_wait_seconds=5) == 3
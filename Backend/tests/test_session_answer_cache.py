@@ -0,0 +1,66 @@
+import asyncio
+
+from src.application.use_cases.session_answer_cache import SessionAnswerCache
+
+KEY = (SessionAnswerCache.normalize_question("What is in front of me?"), "brief", "m")
+
+
+def test_answers_are_reused_until_the_narrative_version_changes():
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        return f"answer {calls}"
+
+    async def scenario():
+        cache = SessionAnswerCache()
+        first = await cache.get_or_compute("s", 1, KEY, compute)
+        repeated = await cache.get_or_compute("s", 1, KEY, compute)
+        cache.invalidate("s", 2)
+        after_change = await cache.get_or_compute("s", 2, KEY, compute)
+        return first, repeated, after_change
+
+    first, repeated, after_change = asyncio.run(scenario())
+    assert first == ("answer 1", False)
+    assert repeated == ("answer 1", True)
+    assert after_change == ("answer 2", False)
+
+
+def test_concurrent_identical_questions_share_one_model_call():
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "a door"
+
+    async def scenario():
+        cache = SessionAnswerCache()
+        return await asyncio.gather(*(cache.get_or_compute("s", 1, KEY, compute) for _ in range(4)))
+
+    results = asyncio.run(scenario())
+    assert calls == 1
+    assert [answer for answer, _ in results] == ["a door"] * 4
+
+
+def test_an_answer_for_an_older_version_is_not_cached():
+    async def scenario():
+        cache = SessionAnswerCache()
+
+        async def compute() -> str:
+            # The narrative moves on, and is asked about, while the model is answering.
+            cache.invalidate("s", 2)
+            await cache.get_or_compute("s", 2, ("other", "brief", "m"), lambda: asyncio.sleep(0, "newer"))
+            return "older"
+
+        await cache.get_or_compute("s", 1, KEY, compute)
+        return await cache.get_or_compute("s", 2, KEY, lambda: asyncio.sleep(0, "fresh"))
+
+    answer = asyncio.run(scenario())
+    assert answer == ("fresh", False)
+
+
+def test_question_normalization_folds_case_whitespace_and_punctuation():
+    assert SessionAnswerCache.normalize_question("  What's   in front of me?! ") == "what's in front of me"
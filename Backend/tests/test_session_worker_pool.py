@@ -0,0 +1,123 @@
+import asyncio
+
+from src.application.use_cases.session_worker_pool import SessionWorkerPool, WorkerPoolLimits
+
+
+def make_pool(**limits) -> SessionWorkerPool:
+    defaults = dict(concurrency=2, max_attempts=3, retry_base_seconds=0.01, retry_max_seconds=0.02,
+                    drain_timeout_seconds=1.0)
+    return SessionWorkerPool(WorkerPoolLimits(**{**defaults, **limits}))
+
+
+def test_failed_job_is_retried_then_drained_on_close():
+    attempts = 0
+    finished = []
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("transient")
+        finished.append("flaky")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        finished.append("slow")
+
+    async def scenario():
+        pool = make_pool()
+        pool.start()
+        pool.submit("s", "flaky", flaky)
+        pool.submit("s", "slow", slow)
+        await asyncio.sleep(0.1)
+        await pool.close()
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+    assert attempts == 2
+    assert sorted(finished) == ["flaky", "slow"]
+    assert stats["jobs_retried"] == 1
+    assert stats["jobs_completed"] == 2
+    assert stats["workers"] == 0
+
+
+def test_job_is_given_up_after_max_attempts():
+    given_up = []
+
+    async def broken():
+        raise RuntimeError("permanent")
+
+    async def on_failure():
+        given_up.append("broken")
+
+    async def scenario():
+        pool = make_pool(max_attempts=2)
+        pool.start()
+        pool.submit("s", "broken", broken, on_failure=on_failure)
+        await asyncio.sleep(0.1)
+        await pool.close()
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+    assert given_up == ["broken"]
+    assert stats["jobs_failed"] == 1
+
+
+def test_close_runs_on_failure_for_jobs_waiting_to_retry_or_still_queued():
+    given_up = []
+
+    async def broken():
+        raise RuntimeError("transient")
+
+    async def stuck():
+        await asyncio.sleep(10)
+
+    def on_failure(name: str):
+        async def handler():
+            given_up.append(name)
+        return handler
+
+    async def scenario():
+        pool = make_pool(concurrency=1, retry_base_seconds=60, retry_max_seconds=60, drain_timeout_seconds=0.05)
+        pool.start()
+        pool.submit("s", "retrying", broken, on_failure=on_failure("retrying"))
+        await asyncio.sleep(0.01)
+        pool.submit("s", "running", stuck, on_failure=on_failure("running"))
+        pool.submit("s", "queued", stuck, on_failure=on_failure("queued"))
+        await asyncio.sleep(0.01)
+        await pool.close()
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+    assert sorted(given_up) == ["queued", "retrying", "running"]
+    assert stats["jobs_dropped"] == 3
+    assert stats["pending_retries"] == 0
+
+
+def test_actor_messages_of_a_session_run_one_at_a_time_in_order():
+    handled = []
+    running = 0
+    overlapped = False
+
+    def message(name: str):
+        async def handler() -> bool:
+            nonlocal running, overlapped
+            running += 1
+            overlapped = overlapped or running > 1
+            await asyncio.sleep(0.01)
+            handled.append(name)
+            running -= 1
+            return False
+        return handler
+
+    async def scenario():
+        pool = make_pool(concurrency=4)
+        pool.start()
+        for name in ("a", "b", "c"):
+            pool.post("s", name, message(name))
+        await asyncio.sleep(0.1)
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert handled == ["a", "b", "c"]
+    assert not overlapped
@@ -0,0 +1,63 @@
+import asyncio
+
+from src.domain.entities.live_session import SessionState
+from src.infrastructure.services.sqlite_session_store import SqliteSessionStore
+
+
+def test_compare_and_set_rejects_a_stale_revision(tmp_path):
+    async def scenario():
+        store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+        await store.create(SessionState(session_id="s"))
+        first = await store.get("s")
+        second = await store.get("s")
+
+        first.dropped_frames = 1
+        assert await store.compare_and_set(first, expected_revision=0)
+        second.dropped_frames = 2
+        assert not await store.compare_and_set(second, expected_revision=0)
+        stored = await store.get("s")
+        await store.close()
+        return second, stored
+
+    loser, stored = asyncio.run(scenario())
+    assert loser.revision == 0
+    assert stored.revision == 1
+    assert stored.dropped_frames == 1
+
+
+def test_update_retries_on_a_conflicting_write_from_another_process(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    attempts = 0
+
+    async def scenario():
+        # Two stores on one file stand in for two worker processes.
+        store = SqliteSessionStore(path)
+        other = SqliteSessionStore(path)
+        await store.create(SessionState(session_id="s"))
+        interloper = await other.get("s")
+        interloper.deduplicated_frames = 5
+
+        def mutate(state: SessionState) -> int:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                # The other process writes between this read and its write-back.
+                other._write(
+                    "UPDATE sessions SET state = ?, revision = ? WHERE session_id = ?",
+                    (interloper.model_copy(update={"revision": 1}).model_dump_json(), 1, "s")
+                )
+            state.dropped_frames += 1
+            return state.revision
+
+        await store.update("s", mutate)
+        stored = await store.get("s")
+        await store.close()
+        await other.close()
+        return stored
+
+    stored = asyncio.run(scenario())
+    assert attempts == 2
+    # Both writes survive: the retry re-read the other process's state.
+    assert stored.deduplicated_frames == 5
+    assert stored.dropped_frames == 1
+    assert stored.revision == 2
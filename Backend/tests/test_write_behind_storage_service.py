@@ -0,0 +1,47 @@
+import asyncio
+from pathlib import Path
+
+from src.infrastructure.services.local_storage_service import LocalStorageService
+from src.infrastructure.services.write_behind_storage_service import WriteBehindStorageService
+
+
+def test_queued_writes_are_readable_at_once_and_on_disk_after_close(tmp_path):
+    async def scenario():
+        storage = WriteBehindStorageService(LocalStorageService(str(tmp_path)), max_buffered_files=4, writers=1)
+        storage.start()
+        paths = [await storage.save_file_async(f"frame {i}".encode(), "frame.jpg", "session_frame")
+                 for i in range(3)]
+        readable = [storage.read_file(path) for path in paths]
+        await storage.close()
+        return storage, paths, readable
+
+    storage, paths, readable = asyncio.run(scenario())
+    assert readable == [b"frame 0", b"frame 1", b"frame 2"]
+    assert [Path(path).read_bytes() for path in paths] == readable
+    assert storage.stats()["written"] == 3
+    assert storage.stats()["buffered"] == 0
+
+
+def test_a_save_cancelled_while_the_buffer_is_full_leaves_nothing_behind(tmp_path):
+    async def scenario():
+        storage = WriteBehindStorageService(LocalStorageService(str(tmp_path)), max_buffered_files=1, writers=0)
+        # A writer that never drains, so the buffer stays full.
+        storage._workers.append(asyncio.create_task(asyncio.sleep(10)))
+        await storage.save_file_async(b"first", "a.jpg", "vqa")
+        blocked = asyncio.create_task(storage.save_file_async(b"second", "b.jpg", "vqa"))
+        await asyncio.sleep(0.01)
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+        pending = dict(storage._pending)
+        storage._workers[0].cancel()
+        return pending
+
+    assert list(asyncio.run(scenario()).values()) == [b"first"]
+
+
+def test_without_writers_saves_are_written_through(tmp_path):
+    async def scenario():
+        storage = WriteBehindStorageService(LocalStorageService(str(tmp_path)))
+        return await storage.save_file_async(b"content", "a.jpg", "ocr")
+
+    assert Path(asyncio.run(scenario())).read_bytes() == b"content"
@@ -0,0 +1,59 @@
+"""
+Fills in the object lists of dataset request logs that were stored as pending.
+
+The VQA endpoints no longer extract objects on the request path when the
+combined answer does not provide them; this worker drains that backlog in
+batches, at a controlled rate so it does not compete with live traffic for
+model quota. Several workers can run at once: logs are claimed atomically and
+a claim expires after --lease-seconds if its worker dies.
+
+Run from the Backend directory:
+    python -m workers.object_extraction_worker --batch-size 50 --concurrency 4 --target-per-minute 120
+"""
+import argparse
+import asyncio
+import json
+
+from logging_config import setup_logging
+from src.infrastructure.config import load_env_settings, get_settings
+from src.infrastructure.services.database_service import init_db
+from src.presentation.api.container import ServiceContainer
+from src.presentation.api.dependencies import get_models_config
+
+
+async def run(args):
+    await init_db()
+    container = ServiceContainer(settings=get_settings(), models_config=get_models_config())
+    try:
+        stats = await container.object_extraction_job_use_case.run(
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            target_per_minute=args.target_per_minute,
+            lease_seconds=args.lease_seconds,
+            max_attempts=args.max_attempts,
+            follow=args.follow
+        )
+    finally:
+        await container.aclose()
+    print(json.dumps(stats, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract object lists for pending dataset request logs.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Logs claimed per batch.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Extractions in flight at once.")
+    parser.add_argument("--target-per-minute", type=float, default=120.0,
+                        help="Maximum extractions started per minute (0 = unpaced).")
+    parser.add_argument("--lease-seconds", type=int, default=600,
+                        help="After this long, a claimed but unfinished log can be claimed again.")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a log is marked as failed.")
+    parser.add_argument("--follow", action="store_true", help="Keep polling for new logs instead of exiting.")
+    args = parser.parse_args()
+
+    setup_logging()
+    load_env_settings()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()